@@ -1,112 +1,151 @@
-import pandas as pd
-from faker import Faker
-import random
-import uuid
-from datetime import datetime
-import pyodbc
-
-# Conexão com o SQL Server
-server = 'DESKTOP-G4V6794'
-database = 'TESTE'
-username = 'sa'
-password = 'expresso'
-
-conn_str = f"""
-    DRIVER={{ODBC Driver 17 for SQL Server}};
-    SERVER={server};
-    DATABASE={database};
-    UID={username};
-    PWD={password};
-    TrustServerCertificate=yes;
-"""
-
-# Faker e seed
-fake = Faker('pt_BR')
-Faker.seed(42)
-
-# Usuários
-user_ids = [
-    '8ABD1646-FEC3-4AD3-B130-5D4A961365DB',
-    '13651188-7289-4C4B-A509-1A2AD65B486F'
-]
-
-status_tablet = ['Instalado', 'Retirado', 'S.Tablet']
-situacoes = ['ativa', 'bloqueada', 'em processo de encerramento']
-tendencias = ['queda', 'atencao', 'estavel', 'comecando']
-
-# Lista de colunas na ordem exata
-colunas = [
-    'ID', 'COD_DR', 'DIR_REGIONAL', 'COD_GR', 'GER_REGIONAL', 'LOCALIZACAO', 'CONTATO', 'TELEFONE',
-    'DATA_CERTIFICACAO', 'STATUS_TABLET', 'HABILITADO_CONSIGNADO', 'HABILITADO_LIME', 'HABILITADO_MICROSSEGURO',
-    'COD_AG', 'NOME_AGENCIA', 'CHAVE_PAA', 'NOME_PAA', 'SITUACAO',
-    'ULT_TRX_CONTABIL', 'ULT_TRX_NEGOCIO', 'TENDENCIA', 'CHAVE_LOJA', 'CNPJ', 'NOME_LOJA',
-    'MES_M3', 'MES_M2', 'MES_M1', 'MES_M0',
-    'DATA_BLOQUEIO', 'MOTIVO_BLOQUEIO', 'DATA_INAUGURACAO',
-    'CREATED_AT', 'UPDATED_AT', 'USER_ID',
-    'MULTIPLICADOR_RESPONSAVEL', 'NOME_PDV', 'TIPO_ESTRATEGIA'
-]
-
-# Dados
-dados = []
-
-for _ in range(20):
-    row = {
-        'ID': str(uuid.uuid4()),
-        'COD_DR': str(random.randint(1, 9)).zfill(2),
-        'DIR_REGIONAL': f"Diretoria {fake.estado()}",
-        'COD_GR': f"{random.randint(10,99)}GR",
-        'GER_REGIONAL': fake.name(),
-        'LOCALIZACAO': fake.address().replace("\n", ", "),
-        'CONTATO': fake.first_name(),
-        'TELEFONE': fake.phone_number(),
-        'DATA_CERTIFICACAO': fake.date_between('-2y', 'today'),
-        'STATUS_TABLET': random.choice(status_tablet),
-        'HABILITADO_CONSIGNADO': random.randint(0, 1),
-        'HABILITADO_LIME': random.randint(0, 1),
-        'HABILITADO_MICROSSEGURO': random.randint(0, 1),
-        'COD_AG': str(random.randint(1000, 9999)),
-        'NOME_AGENCIA': f"Agência {fake.city()}",
-        'CHAVE_PAA': f"PAA{random.randint(100,999)}",
-        'NOME_PAA': f"Ponto {fake.bairro()}",
-        'SITUACAO': random.choice(situacoes),
-        'ULT_TRX_CONTABIL': fake.date_between('-6m', 'today'),
-        'ULT_TRX_NEGOCIO': fake.date_between('-3m', 'today'),
-        'TENDENCIA': random.choice(tendencias),
-        'CHAVE_LOJA': f"LOJA{random.randint(100,999)}",
-        'CNPJ': fake.cnpj(),
-        'NOME_LOJA': f"Loja {fake.first_name()}",
-        'MES_M3': random.randint(0, 50),
-        'MES_M2': random.randint(0, 50),
-        'MES_M1': random.randint(0, 50),
-        'MES_M0': random.randint(0, 50),
-        'DATA_BLOQUEIO': None,
-        'MOTIVO_BLOQUEIO': None,
-        'DATA_INAUGURACAO': fake.date_between(start_date='-5y', end_date='-1y'),
-        'CREATED_AT': datetime.now(),
-        'UPDATED_AT': datetime.now(),
-        'USER_ID': random.choice(user_ids),
-        'MULTIPLICADOR_RESPONSAVEL': fake.name(),
-        'NOME_PDV': f"PDV {fake.street_name()}",
-        'TIPO_ESTRATEGIA': 'abertura-conta'
-    }
-    dados.append([row[col] for col in colunas])  # ordenado
-
-# Conectar e inserir
-conn = pyodbc.connect(conn_str)
-cursor = conn.cursor()
-
-sql = f"""
-    INSERT INTO TESTE..OPORTUNIDADES_CONTAS (
-        {', '.join(colunas)}
-    )
-    VALUES ({', '.join(['?' for _ in colunas])})
-"""
-
-for registro in dados:
-    cursor.execute(sql, registro)
-
-conn.commit()
-cursor.close()
-conn.close()
-
-print("✅ Dados gerados e inseridos com sucesso no SQL Server!")
+import numpy as np
+from faker import Faker
+import random
+import uuid
+from datetime import datetime
+import os
+import sys
+
+# Pacotes compartilhados (carga, db) ficam em src/backend/python
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python'))
+import db
+from carga import carregar_em_lotes
+from carga.arquivos import linhas_de_arquivos, pasta_de_arquivos
+from carga.distribuicao import distribuicoes_configuradas
+from carga.escala import chaves_de_contas, ids_usuarios, linhas_padrao, lojas_sorteadas
+from carga.instrumentacao import fase, instrumentado
+from carga.lojas import AGENCIAS
+from carga.usuarios import usuarios_da_carga
+
+# Quantidade padrão de oportunidades (pode ser alterada pelo orquestrador: --rows, ou pela escala: CARGA_ESCALA)
+LINHAS_PADRAO = 20
+
+# python oportunidades_contas.py --de-arquivos PASTA  → carrega o que foi exportado por carga.arquivos
+PASTA_ARQUIVOS = pasta_de_arquivos()
+
+# Faker e random próprios do script (no orquestrador, outros scripts rodam em outras threads)
+SEED = 42
+fake = Faker('pt_BR')
+fake.seed_instance(SEED)
+
+status_tablet = ['Instalado', 'Retirado', 'S.Tablet']
+situacoes = ['ativa', 'bloqueada', 'em processo de encerramento']
+tendencias = ['queda', 'atencao', 'estavel', 'comecando']
+
+# Lista de colunas na ordem exata
+colunas = [
+    'ID', 'COD_DR', 'DIR_REGIONAL', 'COD_GR', 'GER_REGIONAL', 'LOCALIZACAO', 'CONTATO', 'TELEFONE',
+    'DATA_CERTIFICACAO', 'STATUS_TABLET', 'HABILITADO_CONSIGNADO', 'HABILITADO_LIME', 'HABILITADO_MICROSSEGURO',
+    'COD_AG', 'NOME_AGENCIA', 'CHAVE_PAA', 'NOME_PAA', 'SITUACAO',
+    'ULT_TRX_CONTABIL', 'ULT_TRX_NEGOCIO', 'TENDENCIA', 'CHAVE_LOJA', 'CNPJ', 'NOME_LOJA',
+    'MES_M3', 'MES_M2', 'MES_M1', 'MES_M0',
+    'DATA_BLOQUEIO', 'MOTIVO_BLOQUEIO', 'DATA_INAUGURACAO',
+    'CREATED_AT', 'UPDATED_AT', 'USER_ID',
+    'MULTIPLICADOR_RESPONSAVEL', 'NOME_PDV', 'TIPO_ESTRATEGIA'
+]
+
+
+# Dados
+def gerar_linhas(num_registros, chaves_contas=None, usuarios=None, seed=SEED):
+    """Gera as oportunidades sob demanda; o carregador consome em lotes."""
+    aleatorio = random.Random(seed)
+    fake.seed_instance(seed)
+    # Lojas de TB_ESTR_CONTAS (chaves_contas: CHAVE_LOJA e o CNPJ dela), sorteadas de uma vez
+    chaves, cnpjs = lojas_sorteadas(num_registros, seed=aleatorio.getrandbits(32), chaves=chaves_contas)
+    # Linhas por usuário, agência e situação: uniformes, ou enviesadas com CARGA_DISTRIBUICAO
+    # Usuários (os mesmos de HOTLIST e das tratativas)
+    user_ids = usuarios or ids_usuarios()
+    distribuicoes = distribuicoes_configuradas()
+    rng = np.random.default_rng(aleatorio.getrandbits(32))
+    usuarios = distribuicoes['supervisor'].sortear(rng, num_registros, user_ids).tolist()
+    cod_ags = AGENCIAS[distribuicoes['agencia'].sortear(rng, num_registros, AGENCIAS)].tolist()
+    situacoes_sorteadas = distribuicoes['situacao'].sortear(rng, num_registros, situacoes).tolist()
+    for i, (chave_loja, cnpj) in enumerate(zip(chaves.tolist(), cnpjs.tolist())):
+        row = {
+            'ID': str(uuid.uuid4()),
+            'COD_DR': str(aleatorio.randint(1, 9)).zfill(2),
+            'DIR_REGIONAL': f"Diretoria {fake.estado()}",
+            'COD_GR': f"{aleatorio.randint(10,99)}GR",
+            'GER_REGIONAL': fake.name(),
+            'LOCALIZACAO': fake.address().replace("\n", ", "),
+            'CONTATO': fake.first_name(),
+            'TELEFONE': fake.phone_number(),
+            'DATA_CERTIFICACAO': fake.date_between('-2y', 'today'),
+            'STATUS_TABLET': aleatorio.choice(status_tablet),
+            'HABILITADO_CONSIGNADO': aleatorio.randint(0, 1),
+            'HABILITADO_LIME': aleatorio.randint(0, 1),
+            'HABILITADO_MICROSSEGURO': aleatorio.randint(0, 1),
+            'COD_AG': str(cod_ags[i]),
+            'NOME_AGENCIA': f"Agência {fake.city()}",
+            'CHAVE_PAA': f"PAA{aleatorio.randint(100,999)}",
+            'NOME_PAA': f"Ponto {fake.bairro()}",
+            'SITUACAO': situacoes[situacoes_sorteadas[i]],
+            'ULT_TRX_CONTABIL': fake.date_between('-6m', 'today'),
+            'ULT_TRX_NEGOCIO': fake.date_between('-3m', 'today'),
+            'TENDENCIA': aleatorio.choice(tendencias),
+            'CHAVE_LOJA': str(chave_loja),
+            'CNPJ': cnpj,
+            'NOME_LOJA': f"Loja {fake.first_name()}",
+            'MES_M3': aleatorio.randint(0, 50),
+            'MES_M2': aleatorio.randint(0, 50),
+            'MES_M1': aleatorio.randint(0, 50),
+            'MES_M0': aleatorio.randint(0, 50),
+            'DATA_BLOQUEIO': None,
+            'MOTIVO_BLOQUEIO': None,
+            'DATA_INAUGURACAO': fake.date_between(start_date='-5y', end_date='-1y'),
+            'CREATED_AT': datetime.now(),
+            'UPDATED_AT': datetime.now(),
+            'USER_ID': user_ids[usuarios[i]],
+            'MULTIPLICADOR_RESPONSAVEL': fake.name(),
+            'NOME_PDV': f"PDV {fake.street_name()}",
+            'TIPO_ESTRATEGIA': 'abertura-conta'
+        }
+        yield [row[col] for col in colunas]  # ordenado
+
+
+@instrumentado('OPORTUNIDADES_CONTAS')
+def main(linhas=None, arquivos=None):
+    pasta_arquivos = PASTA_ARQUIVOS if arquivos is None else arquivos
+    if not pasta_arquivos:
+        # Lojas sorteadas entre as de TB_ESTR_CONTAS (as da escala se ela não existir)
+        with fase('ler_chaves'):
+            with db.conexao(db.config().banco_dw) as conn_dw:
+                chaves_contas = chaves_de_contas(conn_dw)
+
+    # Conectar e inserir
+    with fase('conectar'):
+        conn = db.conectar(db.config().banco_teste)
+    try:
+        cursor = conn.cursor()
+
+        # USER_ID só de supervisores cadastrados (--criar-usuarios cadastra os gerados)
+        with fase('usuarios'):
+            usuarios = usuarios_da_carga(conn)
+
+        if pasta_arquivos:
+            # Linhas exportadas antes (python -m carga.arquivos exportar), sem gerar de novo
+            dados = linhas_de_arquivos(pasta_arquivos, 'OPORTUNIDADES_CONTAS', colunas)
+        else:
+            dados = gerar_linhas(linhas or linhas_padrao('OPORTUNIDADES_CONTAS', LINHAS_PADRAO), chaves_contas, usuarios)
+
+        sql = f"""
+            INSERT INTO TESTE..OPORTUNIDADES_CONTAS (
+                {', '.join(colunas)}
+            )
+            VALUES ({', '.join(['?' for _ in colunas])})
+        """
+
+        with fase('carga'):
+            resultado = carregar_em_lotes(conn, sql, dados, tabela='OPORTUNIDADES_CONTAS')
+        print(f"⏱️ {resultado.resumo()}")
+
+        print("✅ Dados gerados e inseridos com sucesso no SQL Server!")
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        # Devolve a conexão ao pool mesmo se a geração ou a carga falhar
+        db.liberar(conn)
+
+
+if __name__ == '__main__':
+    main()
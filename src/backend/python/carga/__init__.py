@@ -0,0 +1,10 @@
+"""Utilitários compartilhados pelos scripts de geração e carga de dados fictícios."""
+
+from .bulk import (
+    TAMANHO_LOTE_PADRAO,
+    CarregadorEmLote,
+    ResultadoCarga,
+    carregar_em_lotes,
+    em_lotes,
+    montar_insert,
+)
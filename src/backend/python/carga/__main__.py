@@ -0,0 +1,5 @@
+import sys
+
+from .orquestrador import main
+
+sys.exit(main())
@@ -0,0 +1,347 @@
+"""
+Exportação dos dados gerados para Parquet/Arrow, particionados, para reúso.
+
+Gerar as lojas com o Faker custa bem mais que inserir; exportando uma vez,
+as cargas seguintes só leem os arquivos:
+
+    python -m carga.arquivos exportar --rows 1000000 --formato arrow
+    python -m carga --de-arquivos .cache/dados
+
+Cada tabela vira uma pasta <pasta>/<TABELA>/ no layout hive
+(DIR_REGIONAL=.../parte-0-0.arrow), com o esquema e a quantidade de linhas
+em _esquema.arrow e _carga.json. No formato arrow (IPC sem compressão) os
+arquivos são abertos com mmap e as colunas apontam direto para as páginas
+do arquivo, sem cópia; o Parquet ocupa menos disco mas precisa ser
+descomprimido na leitura.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+from .bulk import tamanho_lote_padrao
+from .orquestrador import PASTA_SCRIPTS, importar_script
+
+PASTA_ARQUIVOS_PADRAO = os.path.join(PASTA_SCRIPTS, '.cache', 'dados')
+
+FORMATOS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+# Coluna de partição de cada tabela; CONTAS, ATIVO e tratativas ficam sem partição
+PARTICOES_PADRAO = {
+    'TB_ESTR_LOJAS': 'DIR_REGIONAL',
+    'MUNICIPIOS_PRIORITARIOS': 'UF',
+    'HOTLIST': 'DIRETORIA_REGIONAL',
+    'OPORTUNIDADES_CONTAS': 'DIR_REGIONAL',
+}
+
+# Na ordem de exportação: as tratativas sorteiam os municípios já exportados
+TABELAS = ['TB_ESTR_CONTAS', 'TB_ESTR_LOJAS', 'TB_ESTR_ATIVO', 'MUNICIPIOS_PRIORITARIOS',
+           'MUNICIPIOS_PRIORITARIOS_TRATATIVAS', 'HOTLIST', 'OPORTUNIDADES_CONTAS']
+
+# Linhas por parte gravada (e em memória) durante a exportação
+TAMANHO_PARTE_PADRAO = 100_000
+
+# Linhas por tabela quando nem --rows nem --escala são informados
+LINHAS_EXPORTACAO_PADRAO = 10_000
+
+ARQUIVO_MANIFESTO = '_carga.json'
+ARQUIVO_ESQUEMA = '_esquema.arrow'
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.fs
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Exportar/ler Parquet e Arrow requer o pacote pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def pasta_de_arquivos(argv=None):
+    """
+    Valor de --de-arquivos na linha de comando (None se ausente). Sem pasta
+    (no fim ou seguido de outra opção, como em `--de-arquivos --colunar`)
+    vale PASTA_ARQUIVOS_PADRAO; `--de-arquivos=PASTA` também é aceito.
+    """
+    argv = sys.argv if argv is None else argv
+    for posicao, argumento in enumerate(argv):
+        if argumento.startswith('--de-arquivos='):
+            return argumento.split('=', 1)[1] or PASTA_ARQUIVOS_PADRAO
+        if argumento == '--de-arquivos':
+            seguinte = argv[posicao + 1] if posicao + 1 < len(argv) else None
+            if seguinte is None or seguinte.startswith('-'):
+                return PASTA_ARQUIVOS_PADRAO
+            return seguinte
+    return None
+
+
+def _tabela_de_linhas(colunas, linhas):
+    """Tabela Arrow a partir de tuplas; o que o Arrow não reconhece (ex.: UUID) vira texto."""
+    pa = _pyarrow()
+    valores = list(zip(*linhas)) or [()] * len(colunas)
+    arrays = []
+    for coluna in valores:
+        try:
+            arrays.append(pa.array(coluna))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else str(v) for v in coluna], pa.string()))
+    return pa.table(arrays, names=colunas)
+
+
+def _tabela_do_dataframe(df):
+    """Tabela Arrow de um DataFrame colunar; datas (datetime64) viram DATE, como no executemany."""
+    pa = _pyarrow()
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    for i, campo in enumerate(tabela.schema):
+        if pa.types.is_timestamp(campo.type):
+            tabela = tabela.set_column(i, campo.name, tabela.column(i).cast(pa.date32()))
+    return tabela
+
+
+def _em_partes(colunas, linhas, tamanho_parte):
+    parte = []
+    for linha in linhas:
+        parte.append(linha)
+        if len(parte) >= tamanho_parte:
+            yield _tabela_de_linhas(colunas, parte)
+            parte = []
+    if parte:
+        yield _tabela_de_linhas(colunas, parte)
+
+
+def partes_da_tabela(tabela, linhas, pasta, tamanho_parte=TAMANHO_PARTE_PADRAO, workers=1):
+    """
+    Tabelas Arrow com as linhas de `tabela`, `tamanho_parte` por vez, geradas
+    pelo mesmo gerador dos scripts.
+
+    CONTAS, LOJAS e ATIVO usam as mesmas CHAVE_LOJA (chaves_loja com a seed
+    padrão), então os arquivos exportados juntos são consistentes entre si.
+    São geradas nos mesmos blocos de TAMANHO_SHARD_PADRAO da carga direta
+    (carga.stream) e só agrupadas em partes: as linhas exportadas são as
+    mesmas que o script inseriria, com qualquer `tamanho_parte`.
+    """
+    if tabela in ('TB_ESTR_CONTAS', 'TB_ESTR_LOJAS', 'TB_ESTR_ATIVO'):
+        import pandas as pd
+        from .chaves import chaves_loja
+        from .shards import SEED_PADRAO, TAMANHO_SHARD_PADRAO, gerar_em_paralelo, geradores_por_tabela
+        if tabela == 'TB_ESTR_LOJAS':
+            from .pools import preaquecer
+            preaquecer(SEED_PADRAO)
+        gerador = geradores_por_tabela(SEED_PADRAO)[tabela]
+        chaves = chaves_loja(linhas, seed=SEED_PADRAO)
+        blocos, acumuladas = [], 0
+        for df in gerar_em_paralelo(gerador, chaves, SEED_PADRAO, TAMANHO_SHARD_PADRAO, workers):
+            blocos.append(df)
+            acumuladas += len(df)
+            if acumuladas >= tamanho_parte:
+                yield _tabela_do_dataframe(pd.concat(blocos, ignore_index=True))
+                blocos, acumuladas = [], 0
+        if blocos:
+            yield _tabela_do_dataframe(pd.concat(blocos, ignore_index=True))
+        return
+
+    if tabela == 'MUNICIPIOS_PRIORITARIOS_TRATATIVAS':
+        if not os.path.isfile(os.path.join(pasta, 'MUNICIPIOS_PRIORITARIOS', ARQUIVO_MANIFESTO)):
+            raise RuntimeError("Exporte MUNICIPIOS_PRIORITARIOS antes das tratativas "
+                               "(elas sorteiam os municípios exportados).")
+        modulo = importar_script('estr_municipios_prioratrios')
+        municipios = linhas_de_arquivos(pasta, 'MUNICIPIOS_PRIORITARIOS', ['CD_MUNIC', 'MUNICIPIO', 'UF'])
+        yield from _em_partes(modulo.COLUNAS_TRATATIVAS, modulo.gerar_tratativas(municipios, linhas), tamanho_parte)
+        return
+
+    from .producao import fonte_de_linhas
+    colunas, gerar = fonte_de_linhas(tabela)
+    yield from _em_partes(colunas, gerar(linhas), tamanho_parte)
+
+
+def _esquema_estavel(esquema):
+    # Categorias (dictionary) diferem de uma parte para outra e colunas só com
+    # nulos não têm tipo: grava tudo com o tipo dos valores e nulos como texto
+    pa = _pyarrow()
+    campos = []
+    for campo in esquema:
+        tipo = campo.type
+        if pa.types.is_dictionary(tipo):
+            tipo = tipo.value_type
+        if pa.types.is_null(tipo):
+            tipo = pa.string()
+        campos.append(pa.field(campo.name, tipo))
+    return pa.schema(campos)
+
+
+def _particionamento(esquema, particao):
+    pa = _pyarrow()
+    if not particao:
+        return None
+    return pa.dataset.partitioning(pa.schema([esquema.field(particao)]), flavor='hive')
+
+
+def _opcoes_de_escrita(formato):
+    pa = _pyarrow()
+    if formato == 'arrow':
+        # Sem compressão: é o que permite ler por mmap sem copiar
+        return pa.dataset.IpcFileFormat().make_write_options(compression=None)
+    return pa.dataset.ParquetFileFormat().make_write_options(compression='snappy')
+
+
+def exportar(tabela, linhas, pasta=PASTA_ARQUIVOS_PADRAO, formato='parquet', particionar=True,
+             tamanho_parte=TAMANHO_PARTE_PADRAO, workers=1):
+    """Gera `linhas` linhas de `tabela` e grava em <pasta>/<tabela>/ (substitui o que houver)."""
+    pa = _pyarrow()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato} (use {', '.join(FORMATOS)})")
+
+    destino = os.path.join(pasta, tabela)
+    shutil.rmtree(destino, ignore_errors=True)
+    os.makedirs(destino)
+    particao = PARTICOES_PADRAO.get(tabela) if particionar else None
+
+    esquema = None
+    total = 0
+    for indice, parte in enumerate(partes_da_tabela(tabela, linhas, pasta, tamanho_parte, workers)):
+        if esquema is None:
+            esquema = _esquema_estavel(parte.schema)
+        pa.dataset.write_dataset(
+            parte.cast(esquema), destino,
+            format=FORMATOS[formato],
+            file_options=_opcoes_de_escrita(formato),
+            partitioning=_particionamento(esquema, particao),
+            basename_template=f"parte-{indice}-{{i}}.{formato}",
+            existing_data_behavior='overwrite_or_ignore',
+        )
+        total += parte.num_rows
+
+    if esquema is not None:
+        with pa.ipc.new_file(os.path.join(destino, ARQUIVO_ESQUEMA), esquema):
+            pass
+    manifesto = {'tabela': tabela, 'formato': formato, 'particao': particao, 'linhas': total,
+                 'colunas': esquema.names if esquema is not None else []}
+    with open(os.path.join(destino, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, indent=2, ensure_ascii=False)
+    return manifesto
+
+
+def manifesto(pasta, tabela):
+    caminho = os.path.join(pasta, tabela, ARQUIVO_MANIFESTO)
+    if not os.path.isfile(caminho):
+        raise FileNotFoundError(f"{tabela} não foi exportada em {pasta} (python -m carga.arquivos exportar)")
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def abrir(pasta, tabela):
+    """
+    Dataset Arrow da tabela exportada. Os arquivos são abertos com mmap: no
+    formato arrow as colunas lidas são fatias do próprio arquivo (zero-copy).
+    """
+    pa = _pyarrow()
+    info = manifesto(pasta, tabela)
+    destino = os.path.join(pasta, tabela)
+    if not info['colunas']:
+        return pa.dataset.dataset(pa.table({}))
+    with pa.ipc.open_file(pa.memory_map(os.path.join(destino, ARQUIVO_ESQUEMA))) as leitor:
+        esquema = leitor.schema
+    return pa.dataset.dataset(
+        destino,
+        schema=esquema,
+        format=FORMATOS[info['formato']],
+        partitioning=_particionamento(esquema, info['particao']),
+        filesystem=pa.fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def ler_tabela(pasta, tabela, colunas=None):
+    """Tabela Arrow inteira (no formato arrow, sem copiar os dados do arquivo)."""
+    return abrir(pasta, tabela).to_table(columns=colunas)
+
+
+def ler_dataframe(pasta, tabela, colunas=None):
+    return ler_tabela(pasta, tabela, colunas).to_pandas()
+
+
+def linhas_de_arquivos(pasta, tabela, colunas=None, tamanho_lote=None, inicio=0):
+    """
+    Tuplas prontas para o executemany, lidas em lotes do tamanho do lote do
+    carregador. Só um lote vira objetos Python por vez; o resto continua
+    mapeado do disco. Com `inicio` (retomada), as linhas anteriores são
+    puladas sem virar objetos Python.
+    """
+    colunas = colunas or manifesto(pasta, tabela)['colunas']
+    lotes = abrir(pasta, tabela).to_batches(columns=colunas, batch_size=tamanho_lote or tamanho_lote_padrao())
+    for lote in lotes:
+        if inicio >= lote.num_rows:
+            inicio -= lote.num_rows
+            continue
+        lote, inicio = lote.slice(inicio), 0
+        yield from zip(*(lote.column(i).to_pylist() for i in range(lote.num_columns)))
+
+
+def ler_exportacao(pasta, tabela, colunas=None, inicio=0):
+    """(linhas a partir de `inicio`, total de linhas exportadas) de `tabela` em `pasta`."""
+    total = manifesto(pasta, tabela)['linhas']
+    return linhas_de_arquivos(pasta, tabela, colunas, inicio=inicio), total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m carga.arquivos',
+                                     description="Exporta os dados fictícios para Parquet/Arrow particionados.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    exportacao = comandos.add_parser('exportar', help="Gera e grava as tabelas")
+    exportacao.add_argument('--pasta', default=PASTA_ARQUIVOS_PADRAO)
+    exportacao.add_argument('--rows', type=int, help=f"Linhas por tabela (padrão: {LINHAS_EXPORTACAO_PADRAO})")
+    exportacao.add_argument('--escala', metavar='SF', help="Fator de escala (SF1, SF10, SF100); --rows tem prioridade")
+    exportacao.add_argument('--distribuicao', action='append', metavar='ESPEC|DIMENSAO=ESPEC',
+                            help="Linhas por supervisor, agência e situação enviesadas (ex.: zipf:1.2); pode repetir")
+    exportacao.add_argument('--tabelas', nargs='+', choices=TABELAS, default=TABELAS)
+    exportacao.add_argument('--formato', choices=sorted(FORMATOS), default='parquet')
+    exportacao.add_argument('--sem-particao', action='store_true', help="Um único nível de arquivos por tabela")
+    exportacao.add_argument('--tamanho-parte', type=int, default=TAMANHO_PARTE_PADRAO)
+    exportacao.add_argument('--workers', type=int, default=1, help="Processos para CONTAS/LOJAS/ATIVO")
+
+    informacoes = comandos.add_parser('info', help="Mostra o que já foi exportado")
+    informacoes.add_argument('--pasta', default=PASTA_ARQUIVOS_PADRAO)
+    args = parser.parse_args(argv)
+
+    if args.comando == 'info':
+        for tabela in TABELAS:
+            try:
+                info = manifesto(args.pasta, tabela)
+            except FileNotFoundError:
+                continue
+            print(f"   📋 {tabela}: {info['linhas']} linhas ({info['formato']}, partição: {info['particao'] or '-'})")
+        return 0
+
+    linhas = {}
+    if args.escala:
+        from .escala import fator, linhas_da_escala
+        fator_escala = fator(args.escala)
+        linhas = linhas_da_escala(fator_escala)
+        os.environ['CARGA_ESCALA'] = str(fator_escala)
+    # Lida por carga.escala.total_de_lojas: HOTLIST/OPORTUNIDADES_CONTAS sorteiam
+    # entre as lojas exportadas em TB_ESTR_CONTAS
+    os.environ['CARGA_TOTAL_LOJAS'] = str(args.rows or linhas.get('TB_ESTR_CONTAS', LINHAS_EXPORTACAO_PADRAO))
+    if args.distribuicao:
+        from .distribuicao import configurar
+        try:
+            configurar(args.distribuicao)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Respeita a ordem de TABELAS mesmo que --tabelas venha em outra ordem
+    for tabela in [t for t in TABELAS if t in args.tabelas]:
+        inicio = time.perf_counter()
+        info = exportar(tabela, args.rows or linhas.get(tabela, LINHAS_EXPORTACAO_PADRAO), args.pasta, args.formato, not args.sem_particao,
+                        args.tamanho_parte, args.workers)
+        segundos = time.perf_counter() - inicio
+        print(f"✅ {tabela}: {info['linhas']} linhas em {segundos:.2f}s → {os.path.join(args.pasta, tabela)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Carregador assíncrono (asyncio): sobrepõe a geração das linhas e as idas e
+voltas ao banco, e carrega várias tabelas ou partições ao mesmo tempo.
+
+O pyodbc é bloqueante, então cada chamada ao driver roda em uma thread
+(asyncio.to_thread) e o event loop só coordena. A interface é a mesma do
+CarregadorEmLote, com carregar() virando corrotina:
+
+    resultado = await CarregadorAssincrono(conn, insert_sql, tabela='HOTLIST').carregar(linhas)
+
+    # Tabelas independentes, no máximo 3 ao mesmo tempo
+    await executar_com_limite([carga_hotlist(), carga_municipios(), carga_oportunidades()], 3)
+
+Back-pressure: no máximo `lotes_em_espera` lotes prontos aguardam o banco.
+Quando a fila enche, o gerador para de ser consumido até um lote sair, então
+a memória fica limitada mesmo com o banco bem mais lento que a geração.
+
+Com CARGA_ASSINCRONO=1, carregar_em_lotes (e portanto os scripts) passa a
+usar este carregador, sem mudar nada nos scripts.
+"""
+
+import asyncio
+import os
+import time
+
+from .bulk import CarregadorEmLote, ResultadoCarga, tamanho_lote_padrao
+from .instrumentacao import fase
+from .ritmo import ritmo_configurado
+
+# Lotes gerados à frente do banco; 2 basta para o banco nunca esperar o gerador
+LOTES_EM_ESPERA_PADRAO = 2
+
+# Conexões simultâneas por tabela particionada (CARGA_CONCORRENCIA)
+CONCORRENCIA_PADRAO = 1
+
+
+def modo_assincrono():
+    """True com CARGA_ASSINCRONO=1."""
+    return os.environ.get('CARGA_ASSINCRONO', '0').lower() in ('1', 'yes', 'true')
+
+
+def concorrencia_padrao():
+    return int(os.environ.get('CARGA_CONCORRENCIA', CONCORRENCIA_PADRAO))
+
+
+def concorrencia_no_pool(concorrencia, pool, log=print):
+    """
+    `concorrencia` limitada às conexões livres de `pool` (db.obter_pool): a
+    conexão do próprio script já está emprestada e, no orquestrador, as outras
+    tabelas seguram as delas. Pedir mais deixaria partições esperando o pool.
+    """
+    livres = pool.livres
+    if concorrencia <= livres:
+        return concorrencia
+    log(f"⚠️ CARGA_CONCORRENCIA={concorrencia}, mas só {livres} das {pool.tamanho_max} conexões do pool "
+        f"estão livres (DB_POOL_TAMANHO); usando {max(1, livres)}")
+    return max(1, livres)
+
+
+def _proximo(lotes):
+    with fase('gerar'):
+        return next(lotes, None)
+
+
+class CarregadorAssincrono(CarregadorEmLote):
+    """
+    CarregadorEmLote com carregar() assíncrono: enquanto um lote está no
+    banco, o próximo já está sendo gerado. Uma conexão DB-API não aceita
+    chamadas simultâneas, então os lotes de uma mesma conexão continuam indo
+    um por vez; o paralelismo entre conexões vem de executar_com_limite.
+    """
+
+    def __init__(self, conn, insert_sql, tabela='', tamanho_lote=None,
+                 fast_executemany=True, log=print, lotes_em_espera=LOTES_EM_ESPERA_PADRAO, ritmo=None):
+        super().__init__(conn, insert_sql, tabela, tamanho_lote, fast_executemany, log, ritmo)
+        if lotes_em_espera < 1:
+            raise ValueError("lotes_em_espera deve ser maior que zero")
+        self.lotes_em_espera = lotes_em_espera
+
+    async def _produzir(self, linhas, fila):
+        # Com ritmo, os lotes já na fila saem com o tamanho anterior ao último ajuste
+        lotes = self._lotes(linhas)
+        try:
+            while True:
+                # Gerar também é bloqueante (Faker, NumPy): roda fora do event loop
+                lote = await asyncio.to_thread(_proximo, lotes)
+                if lote is None:
+                    break
+                await fila.put(lote)
+        except Exception:
+            # O consumidor para no None e a exceção reaparece no `await produtor`
+            await fila.put(None)
+            raise
+        await fila.put(None)
+
+    async def carregar(self, linhas):
+        resultado = ResultadoCarga(tabela=self.tabela)
+        cursor = await asyncio.to_thread(self._abrir_cursor)
+        fila = asyncio.Queue(maxsize=self.lotes_em_espera)
+        produtor = asyncio.create_task(self._produzir(linhas, fila))
+        inicio = time.perf_counter()
+        offset = self.posicao_inicial
+
+        try:
+            while True:
+                lote = await fila.get()
+                if lote is None:
+                    break
+                await asyncio.to_thread(self._inserir_lote, cursor, lote, offset, resultado)
+                offset += len(lote)
+                resultado.segundos = time.perf_counter() - inicio
+                self.log(f"   ✅ {resultado.inseridos} registros inseridos... "
+                         f"({resultado.linhas_por_segundo:,.0f} linhas/s)")
+            # Repassa uma exceção do gerador
+            await produtor
+        finally:
+            if not produtor.done():
+                produtor.cancel()
+                await asyncio.gather(produtor, return_exceptions=True)
+            resultado.segundos = time.perf_counter() - inicio
+            await asyncio.to_thread(cursor.close)
+            self._registrar(resultado)
+
+        return resultado
+
+
+async def carregar_em_lotes_async(conn, insert_sql, linhas, tabela='', tamanho_lote=None, log=print,
+                                  lotes_em_espera=LOTES_EM_ESPERA_PADRAO, ritmo=None):
+    """Atalho para CarregadorAssincrono(...).carregar(linhas)."""
+    carregador = CarregadorAssincrono(conn, insert_sql, tabela=tabela, tamanho_lote=tamanho_lote, log=log,
+                                      lotes_em_espera=lotes_em_espera, ritmo=ritmo)
+    return await carregador.carregar(linhas)
+
+
+async def executar_com_limite(corrotinas, concorrencia=4):
+    """Executa as corrotinas com no máximo `concorrencia` ao mesmo tempo; resultados na ordem dada."""
+    if concorrencia < 1:
+        raise ValueError("concorrencia deve ser maior que zero")
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def limitada(corrotina):
+        async with semaforo:
+            return await corrotina
+
+    return await asyncio.gather(*(limitada(c) for c in corrotinas))
+
+
+def somar_resultados(tabela, resultados):
+    """Junta os resultados das partições em um único ResultadoCarga."""
+    total = ResultadoCarga(tabela=tabela)
+    for r in resultados:
+        total.inseridos += r.inseridos
+        total.falhas += r.falhas
+        total.lotes += r.lotes
+        total.lotes_com_fallback += r.lotes_com_fallback
+        total.segundos = max(total.segundos, r.segundos)
+        total.erros.extend(r.erros)
+    return total
+
+
+async def carregar_particoes(obter_conexao, devolver_conexao, insert_sql, particoes, tabela='',
+                             concorrencia=None, tamanho_lote=None, log=print):
+    """
+    Carrega cada partição (um iterável de linhas) em uma conexão própria, com
+    até `concorrencia` partições ao mesmo tempo (padrão: CARGA_CONCORRENCIA).
+
+    `obter_conexao`/`devolver_conexao` são, por exemplo, db.conectar/db.liberar:
+    as conexões saem do pool e são devolvidas ao fim de cada partição.
+    Com CARGA_MAX_LINHAS_S, cada conexão fica com uma fração do teto.
+    """
+    concorrencia = concorrencia or concorrencia_padrao()
+    inicio = time.perf_counter()
+
+    async def carregar_particao(indice, linhas):
+        conn = await asyncio.to_thread(obter_conexao)
+        try:
+            ritmo = ritmo_configurado(tamanho_lote or tamanho_lote_padrao(), fatia=concorrencia)
+            return await carregar_em_lotes_async(conn, insert_sql, linhas, tabela=f"{tabela}[{indice}]",
+                                                 tamanho_lote=tamanho_lote, log=log, ritmo=ritmo)
+        finally:
+            await asyncio.to_thread(devolver_conexao, conn)
+
+    resultados = await executar_com_limite(
+        [carregar_particao(i, linhas) for i, linhas in enumerate(particoes)], concorrencia)
+    total = somar_resultados(tabela, resultados)
+    total.segundos = time.perf_counter() - inicio
+    return total
@@ -0,0 +1,504 @@
+"""
+Carga pelo caminho nativo de bulk do SQL Server (bcp / BULK INSERT).
+
+As linhas geradas são gravadas em um arquivo de dados compatível com o bcp
+e em um format file (não XML) montados a partir do DDL da tabela, e o
+servidor importa o arquivo inteiro de uma vez:
+
+    CARGA_ESTRATEGIA=bcp python estr_lojas.py          # bcp.exe in ... -f arquivo.fmt
+    CARGA_ESTRATEGIA=bulk_insert python estr_lojas.py  # BULK INSERT ... WITH (FORMATFILE=...)
+
+Dois modos de arquivo:
+    nativo     binário no formato nativo do bcp (-n): sem conversão de texto no servidor
+    caractere  texto UTF-8 separado por tabulação (-c -C 65001); '' e NULL
+               ficam iguais no arquivo, e os dois chegam como NULL
+
+O bcp.exe roda com autenticação integrada (-T); a senha de um login SQL
+nunca vai para a linha de comando (use bulk_insert com login SQL).
+
+A escrita não depende do servidor: `python -m carga.bcp conferir` (e
+tests/test_bcp.py) gera uma amostra fixa e compara byte a byte com os
+arquivos de referência em carga/bcp_referencia.
+"""
+
+import argparse
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from .bulk import ResultadoCarga, carregar_em_lotes, montar_insert, tamanho_lote_padrao
+from .instrumentacao import contar, fase
+
+ESTRATEGIAS = ('executemany', 'bcp', 'bulk_insert')
+ESTRATEGIA_PADRAO = 'executemany'
+
+MODOS = ('nativo', 'caractere')
+
+# Versão do format file não XML (bcp 13+ lê 14.0; a do SQL Server 2012 é 11.0)
+VERSAO_FORMAT_FILE = '14.0'
+
+TERMINADOR_CAMPO = '\t'
+TERMINADOR_LINHA = '\r\n'
+
+# Código de página dos textos no modo nativo (collation Latin1_General) e no modo caractere
+CODEPAGE_NATIVO = 'cp1252'
+CODEPAGE_CARACTERE = '65001'
+
+PASTA_REFERENCIA = os.path.join(os.path.dirname(__file__), 'bcp_referencia')
+
+_DIA_ZERO_DATE = date(1, 1, 1).toordinal()
+_DIA_ZERO_DATETIME = date(1900, 1, 1).toordinal()
+
+_REGEX_COLUNA = re.compile(
+    r"^\s*\[?(\w+)\]?\s+(\w+)\s*(?:\(\s*(\w+)\s*(?:,\s*(\d+)\s*)?\))?(.*?),?\s*$", re.IGNORECASE)
+
+
+def estrategia_de_carga():
+    """Estratégia configurada em CARGA_ESTRATEGIA (executemany, bcp ou bulk_insert)."""
+    estrategia = os.environ.get('CARGA_ESTRATEGIA', ESTRATEGIA_PADRAO).lower()
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"CARGA_ESTRATEGIA inválida: {estrategia} (use {', '.join(ESTRATEGIAS)})")
+    return estrategia
+
+
+@dataclass(frozen=True)
+class Coluna:
+    nome: str
+    tipo: str                   # tipo SQL em maiúsculas (INT, VARCHAR, DECIMAL, ...)
+    tamanho: int = 0            # VARCHAR(n)/CHAR(n); -1 para MAX
+    precisao: int = 0
+    escala: int = 0
+    nula: bool = True
+
+
+def colunas_do_ddl(ddl):
+    """Colunas de um trecho de CREATE TABLE (uma coluna por linha, como DDL_COLUNAS_LOJAS)."""
+    colunas = []
+    for linha in ddl.splitlines():
+        linha = linha.split('--')[0].strip()
+        if not linha or linha.split()[0].upper() in ('CONSTRAINT', 'PRIMARY', 'INDEX', 'UNIQUE'):
+            continue
+        casamento = _REGEX_COLUNA.match(linha)
+        if not casamento:
+            raise ValueError(f"Coluna não reconhecida no DDL: {linha}")
+        nome, tipo, argumento, escala, resto = casamento.groups()
+        tipo = tipo.upper()
+        resto = resto.upper()
+        nula = 'NOT NULL' not in resto and 'PRIMARY KEY' not in resto
+        if tipo in ('DECIMAL', 'NUMERIC'):
+            colunas.append(Coluna(nome, tipo, precisao=int(argumento or 18), escala=int(escala or 0), nula=nula))
+        elif argumento is not None:
+            tamanho = -1 if argumento.upper() == 'MAX' else int(argumento)
+            colunas.append(Coluna(nome, tipo, tamanho=tamanho, nula=nula))
+        else:
+            colunas.append(Coluna(nome, tipo, nula=nula))
+    return colunas
+
+
+# Tipo do host (format file), tamanho e struct dos tipos de tamanho fixo no modo nativo
+_NATIVOS_FIXOS = {
+    'INT': ('SQLINT', 4, struct.Struct('<i')),
+    'BIGINT': ('SQLBIGINT', 8, struct.Struct('<q')),
+    'SMALLINT': ('SQLSMALLINT', 2, struct.Struct('<h')),
+    'TINYINT': ('SQLTINYINT', 1, struct.Struct('<B')),
+    'BIT': ('SQLBIT', 1, struct.Struct('<B')),
+    'FLOAT': ('SQLFLT8', 8, struct.Struct('<d')),
+    'REAL': ('SQLFLT4', 4, struct.Struct('<f')),
+    'DATE': ('SQLDATE', 3, None),
+    'DATETIME': ('SQLDATETIME', 8, struct.Struct('<ii')),
+    'DECIMAL': ('SQLDECIMAL', 19, None),
+    'NUMERIC': ('SQLNUMERIC', 19, None),
+    'UNIQUEIDENTIFIER': ('SQLUNIQUEID', 16, None),
+}
+
+_TEXTOS = ('CHAR', 'VARCHAR', 'NCHAR', 'NVARCHAR')
+
+# Largura máxima de cada tipo como texto (a mesma que o bcp -c usa)
+_LARGURA_CARACTERE = {
+    'INT': 12, 'BIGINT': 21, 'SMALLINT': 7, 'TINYINT': 5, 'BIT': 1, 'FLOAT': 30, 'REAL': 30,
+    'DATE': 11, 'DATETIME': 24, 'UNIQUEIDENTIFIER': 37,
+}
+
+
+def _tipo_host(coluna, modo):
+    """(tipo do host, tamanho do prefixo, tamanho do dado) de uma coluna no format file."""
+    if modo == 'caractere':
+        if coluna.tipo in _TEXTOS:
+            # Em UTF-8 um caractere ocupa até 4 bytes; MAX fica sem limite (0)
+            tamanho = 0 if coluna.tamanho < 0 else min(8000, 4 * coluna.tamanho)
+        elif coluna.tipo in ('DECIMAL', 'NUMERIC'):
+            tamanho = coluna.precisao + 3
+        else:
+            tamanho = _LARGURA_CARACTERE[coluna.tipo]
+        return 'SQLCHAR', 0, tamanho
+
+    if coluna.tipo in _TEXTOS:
+        unicode = coluna.tipo.startswith('N')
+        if coluna.tamanho < 0:
+            return ('SQLNCHAR' if unicode else 'SQLCHAR'), 8, 0
+        return ('SQLNCHAR' if unicode else 'SQLCHAR'), 2, coluna.tamanho * (2 if unicode else 1)
+    if coluna.tipo not in _NATIVOS_FIXOS:
+        raise ValueError(f"Tipo sem formato nativo no bcp: {coluna.tipo} ({coluna.nome})")
+    tipo, tamanho, _ = _NATIVOS_FIXOS[coluna.tipo]
+    return tipo, (1 if coluna.nula else 0), tamanho
+
+
+def format_file(colunas, modo='nativo'):
+    """Texto do format file não XML (com CRLF, como o bcp grava) para as colunas."""
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconhecido: {modo} (use {', '.join(MODOS)})")
+    linhas = [VERSAO_FORMAT_FILE, str(len(colunas))]
+    for ordem, coluna in enumerate(colunas, start=1):
+        tipo, prefixo, tamanho = _tipo_host(coluna, modo)
+        if modo == 'caractere':
+            terminador = TERMINADOR_LINHA if ordem == len(colunas) else TERMINADOR_CAMPO
+            terminador = terminador.replace('\t', '\\t').replace('\r', '\\r').replace('\n', '\\n')
+        else:
+            terminador = ''
+        collation = 'SQL_Latin1_General_CP1_CI_AS' if coluna.tipo in _TEXTOS else ''
+        terminador = f'"{terminador}"'
+        linhas.append(f'{ordem:<8}{tipo:<16}{prefixo:<8}{tamanho:<8}{terminador:<8}'
+                      f'{ordem:<8}{coluna.nome:<32}"{collation}"')
+    return '\r\n'.join(linhas) + '\r\n'
+
+
+# ====== Modo nativo ======
+
+def _escala_decimal(valor, escala):
+    return int(Decimal(str(valor)).scaleb(escala).to_integral_value(ROUND_HALF_EVEN))
+
+
+def _bytes_nativos(coluna):
+    """Função valor → bytes do dado (sem prefixo) no formato nativo da coluna."""
+    tipo = coluna.tipo
+    if tipo in _TEXTOS:
+        codificacao = 'utf-16-le' if tipo.startswith('N') else CODEPAGE_NATIVO
+        return lambda valor: str(valor).encode(codificacao, errors='replace')
+    if tipo == 'DATE':
+        return lambda valor: (valor.toordinal() - _DIA_ZERO_DATE).to_bytes(3, 'little')
+    if tipo == 'DATETIME':
+        empacotar = _NATIVOS_FIXOS['DATETIME'][2].pack
+
+        def datetime_nativo(valor):
+            if not isinstance(valor, datetime):
+                valor = datetime(valor.year, valor.month, valor.day)
+            segundos = valor.hour * 3600 + valor.minute * 60 + valor.second + valor.microsecond / 1e6
+            # DATETIME guarda dias desde 1900-01-01 e a hora em tiques de 1/300 s
+            return empacotar(valor.toordinal() - _DIA_ZERO_DATETIME, round(segundos * 300))
+        return datetime_nativo
+    if tipo in ('DECIMAL', 'NUMERIC'):
+        cabecalho = bytes([coluna.precisao, coluna.escala])
+
+        def decimal_nativo(valor):
+            inteiro = _escala_decimal(valor, coluna.escala)
+            # precisão, escala, sinal (1 = positivo) e a magnitude em 16 bytes little-endian
+            return cabecalho + bytes([0 if inteiro < 0 else 1]) + abs(inteiro).to_bytes(16, 'little')
+        return decimal_nativo
+    if tipo == 'UNIQUEIDENTIFIER':
+        return lambda valor: (valor if isinstance(valor, uuid.UUID) else uuid.UUID(str(valor))).bytes_le
+    if tipo == 'BIT':
+        return lambda valor: b'\x01' if valor else b'\x00'
+    empacotar = _NATIVOS_FIXOS[tipo][2].pack
+    if tipo in ('FLOAT', 'REAL'):
+        return lambda valor: empacotar(float(valor))
+    return lambda valor: empacotar(int(valor))
+
+
+def _campo_nativo(coluna):
+    """Função valor → bytes do campo (prefixo de tamanho + dado) no modo nativo."""
+    _, prefixo, _ = _tipo_host(coluna, 'nativo')
+    dado = _bytes_nativos(coluna)
+    if prefixo == 0:
+        def campo(valor):
+            if valor is None:
+                raise ValueError(f"{coluna.nome} é NOT NULL e veio nulo")
+            return dado(valor)
+        return campo
+
+    nulo = b'\xff' * prefixo
+    fixo = _NATIVOS_FIXOS.get(coluna.tipo)
+    if fixo and fixo[2] and coluna.tipo not in ('DATETIME', 'BIT'):
+        # Prefixo e dado em um único pack (caminho quente dos INT nuláveis)
+        _, tamanho_dado, formato = fixo
+        empacotar = struct.Struct('<B' + formato.format[1:]).pack
+        converter = float if coluna.tipo in ('FLOAT', 'REAL') else int
+        return lambda valor: nulo if valor is None else empacotar(tamanho_dado, converter(valor))
+
+    tamanho = struct.Struct({1: '<B', 2: '<H', 8: '<Q'}[prefixo]).pack
+
+    def campo(valor):
+        if valor is None:
+            return nulo
+        bytes_valor = dado(valor)
+        return tamanho(len(bytes_valor)) + bytes_valor
+    return campo
+
+
+# ====== Modo caractere ======
+
+_SEM_TERMINADORES = str.maketrans({'\t': ' ', '\r': ' ', '\n': ' '})
+
+
+def _texto_caractere(coluna):
+    tipo = coluna.tipo
+    if tipo == 'DATE':
+        return lambda valor: valor.isoformat()[:10]
+    if tipo == 'DATETIME':
+        return lambda valor: valor.isoformat(sep=' ', timespec='milliseconds') if isinstance(valor, datetime) \
+            else f"{valor.isoformat()} 00:00:00.000"
+    if tipo in ('DECIMAL', 'NUMERIC'):
+        return lambda valor: format(Decimal(_escala_decimal(valor, coluna.escala)).scaleb(-coluna.escala), 'f')
+    if tipo == 'BIT':
+        return lambda valor: '1' if valor else '0'
+    if tipo in ('INT', 'BIGINT', 'SMALLINT', 'TINYINT'):
+        return lambda valor: str(int(valor))
+    # O bcp não tem escape: tabulação e quebra de linha dentro do texto viram espaço
+    return lambda valor: str(valor).translate(_SEM_TERMINADORES)
+
+
+def _campo_caractere(coluna):
+    texto = _texto_caractere(coluna)
+    # Campo vazio é carregado como NULL (bcp -k / KEEPNULLS). O formato caractere
+    # não tem como distinguir '' de NULL, então texto vazio também chega NULL; o
+    # modo nativo (prefixo 0 × prefixo de nulo) preserva a string vazia
+    return lambda valor: '' if valor is None else texto(valor)
+
+
+def escrever_dados(arquivo, colunas, linhas, modo='nativo'):
+    """Grava as linhas (tuplas na ordem de `colunas`) no arquivo binário aberto; devolve quantas."""
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconhecido: {modo} (use {', '.join(MODOS)})")
+    total = 0
+    if modo == 'nativo':
+        campos = [_campo_nativo(coluna) for coluna in colunas]
+        for linha in linhas:
+            arquivo.write(b''.join([campo(valor) for campo, valor in zip(campos, linha)]))
+            total += 1
+    else:
+        campos = [_campo_caractere(coluna) for coluna in colunas]
+        for linha in linhas:
+            texto = TERMINADOR_CAMPO.join([campo(valor) for campo, valor in zip(campos, linha)])
+            arquivo.write((texto + TERMINADOR_LINHA).encode('utf-8'))
+            total += 1
+    return total
+
+
+def gravar_arquivos(pasta, nome, colunas, linhas, modo='nativo'):
+    """Grava <nome>.dat e <nome>.fmt em `pasta`; devolve (dados, format file, linhas)."""
+    os.makedirs(pasta, exist_ok=True)
+    caminho_dados = os.path.join(pasta, f"{nome}.dat")
+    caminho_formato = os.path.join(pasta, f"{nome}.fmt")
+    with open(caminho_formato, 'wb') as arquivo:
+        arquivo.write(format_file(colunas, modo).encode('ascii'))
+    with open(caminho_dados, 'wb', buffering=1024 * 1024) as arquivo:
+        total = escrever_dados(arquivo, colunas, linhas, modo)
+    return caminho_dados, caminho_formato, total
+
+
+# ====== Carga no servidor ======
+
+def comando_bcp(tabela, caminho_dados, caminho_formato, database, config, modo='nativo', tamanho_lote=None,
+                executavel=None):
+    """
+    Linha de comando do bcp.exe para importar o arquivo em `database`..`tabela`.
+
+    Só com autenticação integrada (-T, DB_TRUSTED_CONNECTION=yes): com login SQL
+    a senha iria no -P, visível na lista de processos para qualquer usuário da
+    máquina. Nesse caso use CARGA_ESTRATEGIA=bulk_insert, que importa o mesmo
+    arquivo pela conexão já autenticada.
+    """
+    if not config.trusted_connection:
+        raise ValueError("CARGA_ESTRATEGIA=bcp exige autenticação integrada (DB_TRUSTED_CONNECTION=yes): "
+                         "com login SQL a senha iria na linha de comando do bcp. Use CARGA_ESTRATEGIA=bulk_insert.")
+    comando = [
+        executavel or os.environ.get('CARGA_BCP', 'bcp'),
+        f"{database}.dbo.{tabela}", 'in', caminho_dados,
+        '-f', caminho_formato,
+        '-S', config.server, '-T',
+        '-b', str(tamanho_lote or tamanho_lote_padrao()),
+        '-h', 'TABLOCK', '-k',
+    ]
+    if modo == 'caractere':
+        comando += ['-C', CODEPAGE_CARACTERE]
+    if config.trust_server_certificate and '18' in config.driver:
+        # Só o bcp do ODBC Driver 18 conhece -u (confiar no certificado do servidor)
+        comando.append('-u')
+    return comando
+
+
+def sql_bulk_insert(tabela, caminho_dados, caminho_formato, modo='nativo', tamanho_lote=None):
+    """BULK INSERT equivalente; o caminho precisa ser visível para o serviço do SQL Server."""
+    opcoes = [f"FORMATFILE = '{caminho_formato}'", 'TABLOCK', 'KEEPNULLS',
+              f"BATCHSIZE = {tamanho_lote or tamanho_lote_padrao()}"]
+    if modo == 'caractere':
+        opcoes.append(f"CODEPAGE = '{CODEPAGE_CARACTERE}'")
+    return f"BULK INSERT {tabela} FROM '{caminho_dados}' WITH ({', '.join(opcoes)});"
+
+
+def _linhas_copiadas(saida):
+    casamento = re.search(r'(\d+) rows copied', saida)
+    return int(casamento.group(1)) if casamento else None
+
+
+def carregar_com_bcp(conn, destino, ddl_colunas, linhas, tabela='', estrategia='bcp', modo=None,
+                     database=None, pasta=None, tamanho_lote=None, log=print):
+    """
+    Grava as linhas em arquivo bcp e importa em `destino` pelo bcp.exe ou por
+    BULK INSERT. Os arquivos ficam em CARGA_BCP_PASTA (ou em uma pasta
+    temporária, apagada no fim) e o modo vem de CARGA_BCP_MODO (padrão: nativo).
+    """
+    import db
+
+    modo = modo or os.environ.get('CARGA_BCP_MODO', 'nativo')
+    pasta_configurada = pasta or os.environ.get('CARGA_BCP_PASTA')
+    pasta = pasta_configurada or tempfile.mkdtemp(prefix='carga_bcp_')
+    colunas = colunas_do_ddl(ddl_colunas)
+    resultado = ResultadoCarga(tabela=tabela or destino, lotes=1)
+    inicio = time.perf_counter()
+
+    try:
+        with fase('arquivo'):
+            caminho_dados, caminho_formato, total = gravar_arquivos(pasta, destino, colunas, linhas, modo)
+        log(f"   📝 {total} linhas gravadas em {caminho_dados} ({modo})")
+
+        with fase('bulk'):
+            if estrategia == 'bcp':
+                comando = comando_bcp(destino, caminho_dados, caminho_formato,
+                                      database or db.config().banco_dw, db.config(), modo, tamanho_lote)
+                processo = subprocess.run(comando, capture_output=True, text=True)
+                if processo.returncode != 0:
+                    raise RuntimeError(f"bcp terminou com código {processo.returncode}: "
+                                       f"{(processo.stdout + processo.stderr).strip()[-500:]}")
+                copiadas = _linhas_copiadas(processo.stdout)
+            else:
+                cursor = conn.cursor()
+                cursor.execute(sql_bulk_insert(destino, caminho_dados, caminho_formato, modo, tamanho_lote))
+                copiadas = cursor.rowcount if cursor.rowcount >= 0 else None
+                conn.commit()
+                cursor.close()
+
+        resultado.inseridos = total if copiadas is None else copiadas
+        resultado.falhas = total - resultado.inseridos
+    finally:
+        resultado.segundos = time.perf_counter() - inicio
+        contar('linhas_inseridas', resultado.inseridos)
+        contar('linhas_com_falha', resultado.falhas)
+        if not pasta_configurada:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+    log(f"   ✅ {resultado.inseridos} registros inseridos via {estrategia} "
+        f"({resultado.linhas_por_segundo:,.0f} linhas/s)")
+    return resultado
+
+
+def carregar_tabela(conn, destino, colunas, ddl_colunas, linhas, tabela='', estrategia=None, database=None,
+                    log=print):
+    """Carrega pela estratégia escolhida (CARGA_ESTRATEGIA): executemany em lotes, bcp ou BULK INSERT."""
+    estrategia = estrategia or estrategia_de_carga()
+    if estrategia == 'executemany':
+        return carregar_em_lotes(conn, montar_insert(destino, colunas), linhas, tabela=tabela or destino, log=log)
+    return carregar_com_bcp(conn, destino, ddl_colunas, linhas, tabela=tabela, estrategia=estrategia,
+                            database=database, log=log)
+
+
+# ====== Amostra de referência (conferência offline) ======
+
+DDL_AMOSTRA = """
+    CHAVE_LOJA INT NOT NULL,
+    CNPJ VARCHAR(18),
+    NOME_LOJA VARCHAR(255),
+    UF CHAR(2),
+    COD_MULT INT,
+    DT_INAUGURACAO DATE,
+    BE_AVANCADO BIT,
+    SALDO_CX DECIMAL(15,2),
+    DATA_TRATATIVA DATETIME,
+    USER_ID UNIQUEIDENTIFIER,
+    OBSERVACAO NVARCHAR(MAX)
+"""
+
+LINHAS_AMOSTRA = [
+    (10000, '11.222.333/0001-81', 'Mercearia São José', 'SP', 42, date(2023, 1, 31), 1, 1234.56,
+     datetime(2024, 5, 17, 14, 30, 15, 500000), uuid.UUID('8ABD1646-FEC3-4AD3-B130-5D4A961365DB'),
+     'Visita produtiva.\tRetornar em 60 dias'),
+    (99999999, None, 'Padaria Pão Quente', 'RJ', None, date(1, 1, 1), 0, -0.05,
+     datetime(1900, 1, 1), None, None),
+    (12345, '00.000.000/0001-91', '', 'MG', 0, None, None, None, None, None, 'Ação — MEI'),
+]
+
+
+def conferir(pasta=PASTA_REFERENCIA, atualizar=False):
+    """Gera a amostra nos dois modos e compara com os arquivos de referência; devolve as divergências."""
+    colunas = colunas_do_ddl(DDL_AMOSTRA)
+    divergencias = []
+    with tempfile.TemporaryDirectory() as temporaria:
+        for modo in MODOS:
+            for gerado in gravar_arquivos(temporaria, f"amostra_{modo}", colunas, LINHAS_AMOSTRA, modo)[:2]:
+                referencia = os.path.join(pasta, os.path.basename(gerado))
+                if atualizar:
+                    os.makedirs(pasta, exist_ok=True)
+                    shutil.copyfile(gerado, referencia)
+                    continue
+                with open(gerado, 'rb') as a:
+                    conteudo = a.read()
+                if not os.path.isfile(referencia):
+                    divergencias.append(f"{os.path.basename(referencia)}: referência ausente")
+                    continue
+                with open(referencia, 'rb') as b:
+                    esperado = b.read()
+                if conteudo != esperado:
+                    posicao = next((i for i, (x, y) in enumerate(zip(conteudo, esperado)) if x != y),
+                                   min(len(conteudo), len(esperado)))
+                    divergencias.append(f"{os.path.basename(referencia)}: difere a partir do byte {posicao}")
+    return divergencias
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m carga.bcp',
+                                     description="Arquivos bcp (nativo/caractere) e format files das tabelas.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    conferencia = comandos.add_parser('conferir', help="Compara a amostra com os arquivos de referência")
+    conferencia.add_argument('--atualizar', action='store_true', help="Regrava os arquivos de referência")
+
+    geracao = comandos.add_parser('gerar', help="Gera a tabela e grava os arquivos bcp (mede a vazão)")
+    geracao.add_argument('tabela', choices=['TB_ESTR_LOJAS', 'TB_ESTR_CONTAS', 'TB_ESTR_ATIVO'])
+    geracao.add_argument('--rows', type=int, default=100_000)
+    geracao.add_argument('--modo', choices=MODOS, default='nativo')
+    geracao.add_argument('--pasta', default='.')
+    args = parser.parse_args(argv)
+
+    if args.comando == 'conferir':
+        divergencias = conferir(atualizar=args.atualizar)
+        if args.atualizar:
+            print(f"💾 Referências regravadas em {PASTA_REFERENCIA}")
+            return 0
+        for divergencia in divergencias:
+            print(f"   ❌ {divergencia}")
+        print("✅ Arquivos idênticos às referências" if not divergencias else "❌ Arquivos divergem das referências")
+        return 1 if divergencias else 0
+
+    from .lojas import DDL_COLUNAS_LOJAS
+    from .producao import DDL_COLUNAS_ATIVO, DDL_COLUNAS_CONTAS, fonte_de_linhas
+    ddl = {'TB_ESTR_LOJAS': DDL_COLUNAS_LOJAS, 'TB_ESTR_CONTAS': DDL_COLUNAS_CONTAS,
+           'TB_ESTR_ATIVO': DDL_COLUNAS_ATIVO}[args.tabela]
+    _, gerar = fonte_de_linhas(args.tabela)
+    inicio = time.perf_counter()
+    dados, formato, total = gravar_arquivos(args.pasta, args.tabela, colunas_do_ddl(ddl), gerar(args.rows), args.modo)
+    segundos = time.perf_counter() - inicio
+    print(f"✅ {total} linhas em {segundos:.2f}s — {total / segundos:,.0f} linhas/s "
+          f"({os.path.getsize(dados) / 1024 ** 2:.1f} MB) → {dados}, {formato}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
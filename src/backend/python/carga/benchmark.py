@@ -0,0 +1,287 @@
+"""
+Benchmark de geração e carga por tabela, com baseline de vazão e memória em JSON.
+
+Uso (a partir de src/backend/python):
+    python -m carga.benchmark --tamanhos 10000 100000 --salvar   # grava a baseline
+    python -m carga.benchmark --tamanhos 10000 100000            # compara; sai com 1 se regrediu
+
+A carga roda contra SQLite em memória (--driver sqlite) ou contra uma conexão
+que descarta as linhas (--driver nulo, só o custo do lado Python). Cada caso
+roda em um processo novo, para que o pico de RSS seja só dele.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from .bulk import CarregadorEmLote, montar_insert, tamanho_lote_padrao
+from .orquestrador import PASTA_SCRIPTS
+from .producao import fonte_de_linhas
+
+# Os da baseline versionada; 1M (--tamanhos 1000000) leva minutos nas tabelas geradas com Faker
+TAMANHOS_PADRAO = (10_000, 100_000)
+LIMITE_REGRESSAO_PADRAO = 0.20
+ARQUIVO_BASELINE = os.path.join(PASTA_SCRIPTS, 'benchmark_baseline.json')
+
+# Linhas geradas antes da medição: pools do Faker, imports e caches já prontos
+LINHAS_AQUECIMENTO = 1000
+
+# Rodadas por caso; casos pequenos (10k) variam bastante de uma rodada para outra
+REPETICOES_PADRAO = 3
+
+# Medições mais curtas que isso (em segundos) são ruído demais para acusar
+# regressão de vazão; casos pequenos só entram na comparação de memória
+TEMPO_MINIMO_COMPARACAO = 0.5
+
+
+# TB_ESTR_LOJAS é o modo padrão do script (linha a linha); TB_ESTR_LOJAS_COLUNAR, o --colunar
+TABELAS = ['TB_ESTR_LOJAS', 'TB_ESTR_LOJAS_COLUNAR', 'TB_ESTR_CONTAS', 'TB_ESTR_ATIVO',
+           'HOTLIST', 'OPORTUNIDADES_CONTAS', 'MUNICIPIOS_PRIORITARIOS']
+
+
+class ConexaoNula:
+    """Conexão DB-API que aceita e descarta tudo: mede só geração + montagem dos lotes."""
+
+    def cursor(self):
+        return self
+
+    def executemany(self, sql, linhas):
+        for _ in linhas:
+            pass
+
+    def execute(self, sql, parametros=()):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def conectar(driver, tabela, colunas):
+    if driver == 'nulo':
+        return ConexaoNula()
+    conn = sqlite3.connect(':memory:')
+    # Colunas sem tipo: o SQLite guarda o que vier, como no executemany real
+    conn.execute(f"CREATE TABLE {tabela} ({', '.join(colunas)})")
+    return conn
+
+
+class ConexaoCronometrada:
+    """Envolve uma conexão DB-API e soma o tempo gasto dentro do driver (execute*, commit)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.segundos = 0.0
+
+    def _cronometrar(self, funcao, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            self.segundos += time.perf_counter() - inicio
+
+    def cursor(self):
+        return _CursorCronometrado(self, self.conn.cursor())
+
+    def commit(self):
+        self._cronometrar(self.conn.commit)
+
+    def rollback(self):
+        self._cronometrar(self.conn.rollback)
+
+    def close(self):
+        self.conn.close()
+
+
+class _CursorCronometrado:
+    def __init__(self, conexao, cursor):
+        self._conexao = conexao
+        self._cursor = cursor
+
+    def executemany(self, sql, linhas):
+        return self._conexao._cronometrar(self._cursor.executemany, sql, linhas)
+
+    def execute(self, sql, parametros=()):
+        return self._conexao._cronometrar(self._cursor.execute, sql, parametros)
+
+    def close(self):
+        self._cursor.close()
+
+
+def pico_rss_bytes():
+    """Pico de RSS do processo atual (None se a plataforma não informa)."""
+    try:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB; macOS, em bytes
+        return pico if sys.platform == 'darwin' else pico * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset  # Windows
+    except (ImportError, AttributeError):
+        return None
+
+
+def medir_caso(tabela, linhas, driver='sqlite', tamanho_lote=None, repeticoes=REPETICOES_PADRAO):
+    """
+    Mede um caso. A geração é cronometrada consumindo as linhas sem gravar; a
+    carga é o tempo passado dentro do driver (executemany/commit) durante o
+    pipeline completo, sem nunca materializar a tabela inteira em memória.
+    Vale o melhor tempo de `repeticoes` rodadas (o menos afetado por ruído).
+    """
+    inicio = time.perf_counter()
+    colunas, gerar = fonte_de_linhas(tabela)
+    for _ in gerar(min(linhas, LINHAS_AQUECIMENTO)):
+        pass
+    preparo = time.perf_counter() - inicio
+
+    geracao = carga = total = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in gerar(linhas):
+            pass
+        geracao = min(geracao, time.perf_counter() - inicio)
+
+        conn = ConexaoCronometrada(conectar(driver, tabela, colunas))
+        carregador = CarregadorEmLote(conn, montar_insert(tabela, colunas), tabela=tabela,
+                                      tamanho_lote=tamanho_lote, log=lambda *_: None)
+        inicio = time.perf_counter()
+        resultado = carregador.carregar(gerar(linhas))
+        total = min(total, time.perf_counter() - inicio)
+        conn.close()
+        carga = min(carga, conn.segundos)
+
+    carga = max(carga, 1e-9)
+    rss = pico_rss_bytes()
+    return {
+        'linhas': linhas,
+        'repeticoes': repeticoes,
+        'inseridos': resultado.inseridos,
+        'falhas': resultado.falhas,
+        'preparo_s': round(preparo, 3),
+        'geracao_s': round(geracao, 3),
+        'carga_s': round(carga, 3),
+        'pipeline_s': round(total, 3),
+        'geracao_linhas_s': round(linhas / geracao, 1) if geracao else None,
+        'carga_linhas_s': round(linhas / carga, 1),
+        'pico_rss_mb': round(rss / 1024 ** 2, 1) if rss else None,
+    }
+
+
+def chave_do_caso(tabela, linhas, driver):
+    return f"{tabela}/{linhas}/{driver}"
+
+
+def executar(tabelas, tamanhos, driver='sqlite', tamanho_lote=None, repeticoes=REPETICOES_PADRAO, log=print):
+    """Roda cada caso em um processo novo e devolve {caso: medidas}."""
+    resultados = {}
+    for tabela in tabelas:
+        for linhas in tamanhos:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                medidas = executor.submit(medir_caso, tabela, linhas, driver, tamanho_lote, repeticoes).result()
+            caso = chave_do_caso(tabela, linhas, driver)
+            resultados[caso] = medidas
+            log(f"   ⏱️ {caso}: geração {medidas['geracao_linhas_s']:,.0f} linhas/s, "
+                f"carga {medidas['carga_linhas_s']:,.0f} linhas/s, pico RSS {medidas['pico_rss_mb']} MB")
+    return resultados
+
+
+def comparar(atual, baseline, limite=LIMITE_REGRESSAO_PADRAO):
+    """
+    Lista de regressões: vazão (geração ou carga) abaixo de (1 - limite) × baseline
+    ou pico de RSS acima de (1 + limite) × baseline. Casos sem baseline são ignorados,
+    e a vazão só é comparada quando a medição da baseline durou TEMPO_MINIMO_COMPARACAO.
+    """
+    regressoes = []
+    for caso, medidas in atual.items():
+        base = baseline.get(caso)
+        if not base:
+            continue
+        for metrica, duracao in (('geracao_linhas_s', 'geracao_s'), ('carga_linhas_s', 'carga_s')):
+            if base.get(duracao, 0) < TEMPO_MINIMO_COMPARACAO:
+                continue
+            if base.get(metrica) and medidas.get(metrica) is not None \
+                    and medidas[metrica] < base[metrica] * (1 - limite):
+                regressoes.append(f"{caso} {metrica}: {medidas[metrica]:,.0f} < {base[metrica]:,.0f}")
+        if base.get('pico_rss_mb') and medidas.get('pico_rss_mb') \
+                and medidas['pico_rss_mb'] > base['pico_rss_mb'] * (1 + limite):
+            regressoes.append(f"{caso} pico_rss_mb: {medidas['pico_rss_mb']} > {base['pico_rss_mb']}")
+    return regressoes
+
+
+def ler_baseline(caminho):
+    if not os.path.isfile(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo).get('casos', {})
+
+
+def salvar_baseline(caminho, resultados, tamanho_lote):
+    casos = ler_baseline(caminho)
+    casos.update(resultados)
+    conteudo = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'tamanho_lote': tamanho_lote,
+        'casos': dict(sorted(casos.items())),
+    }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(conteudo, arquivo, indent=2, ensure_ascii=False)
+        arquivo.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m carga.benchmark',
+                                     description="Mede geração e carga por tabela e compara com a baseline.")
+    parser.add_argument('--tabelas', nargs='+', choices=TABELAS, default=TABELAS)
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=list(TAMANHOS_PADRAO))
+    parser.add_argument('--driver', choices=['sqlite', 'nulo'], default='sqlite')
+    parser.add_argument('--tamanho-lote', type=int, default=None)
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO,
+                        help="Rodadas por caso (vale a melhor)")
+    parser.add_argument('--baseline', default=ARQUIVO_BASELINE)
+    parser.add_argument('--limite', type=float, default=LIMITE_REGRESSAO_PADRAO,
+                        help="Regressão tolerada (0.20 = 20%%)")
+    parser.add_argument('--salvar', action='store_true', help="Grava os resultados como nova baseline")
+    args = parser.parse_args(argv)
+
+    tamanho_lote = args.tamanho_lote or tamanho_lote_padrao()
+    print(f"🏁 Benchmark ({args.driver}, lote de {tamanho_lote}): {', '.join(args.tabelas)}")
+    # Máquina só no log: a baseline versionada não muda de uma máquina para outra por causa dela
+    print(f"   🖥️ Python {platform.python_version()}, {platform.platform()}")
+    resultados = executar(args.tabelas, args.tamanhos, args.driver, tamanho_lote, args.repeticoes)
+
+    if args.salvar:
+        salvar_baseline(args.baseline, resultados, tamanho_lote)
+        print(f"💾 Baseline gravada em {args.baseline}")
+        return 0
+
+    baseline = ler_baseline(args.baseline)
+    if not baseline:
+        print(f"⚠️ Sem baseline em {args.baseline}; rode com --salvar para criar.")
+        return 0
+
+    regressoes = comparar(resultados, baseline, args.limite)
+    if regressoes:
+        print(f"❌ {len(regressoes)} regressão(ões) acima de {args.limite:.0%}:")
+        for regressao in regressoes:
+            print(f"   {regressao}")
+        return 1
+    print(f"✅ Nenhuma regressão acima de {args.limite:.0%} em relação à baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+
+from .instrumentacao import contar, fase
+
+# Tamanho de lote padrão para o executemany. Lotes maiores reduzem idas e
+# voltas ao SQL Server, mas um lote com erro cai para o modo linha a linha,
+# então não vale a pena exagerar.
+TAMANHO_LOTE_PADRAO = 5000
+
+
+def tamanho_lote_padrao():
+    """Tamanho de lote configurado em CARGA_TAMANHO_LOTE (ou o padrão)."""
+    return int(os.environ.get('CARGA_TAMANHO_LOTE', TAMANHO_LOTE_PADRAO))
+
+
+def montar_insert(tabela, colunas):
+    """Monta o INSERT parametrizado (placeholders '?') para as colunas informadas."""
+    return (
+        f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+        f"VALUES ({', '.join(['?' for _ in colunas])})"
+    )
+
+
+def em_lotes(linhas, tamanho):
+    """
+    Agrupa qualquer iterável de linhas em listas de até `tamanho` itens.
+    `tamanho` também pode ser uma função, consultada a cada lote (ritmo adaptativo).
+    """
+    limite = tamanho() if callable(tamanho) else tamanho
+    lote = []
+    for linha in linhas:
+        lote.append(linha)
+        if len(lote) >= limite:
+            yield lote
+            lote = []
+            if callable(tamanho):
+                limite = tamanho()
+    if lote:
+        yield lote
+
+
+@dataclass
+class ResultadoCarga:
+    tabela: str
+    inseridos: int = 0
+    falhas: int = 0
+    lotes: int = 0
+    lotes_com_fallback: int = 0
+    segundos: float = 0.0
+    erros: list = field(default_factory=list)
+
+    @property
+    def linhas_por_segundo(self):
+        return self.inseridos / self.segundos if self.segundos > 0 else 0.0
+
+    def resumo(self):
+        return (
+            f"{self.tabela}: {self.inseridos} inseridos, {self.falhas} falhas, "
+            f"{self.lotes} lotes ({self.lotes_com_fallback} com fallback) "
+            f"em {self.segundos:.2f}s — {self.linhas_por_segundo:,.0f} linhas/s"
+        )
+
+
+class CarregadorEmLote:
+    """
+    Insere linhas em lotes com executemany (fast_executemany no pyodbc).
+
+    Funciona com qualquer conexão DB-API que use o paramstyle '?' (pyodbc,
+    sqlite3), o que permite exercitar a carga localmente sem SQL Server.
+    Se um lote falhar, ele é desfeito e reinserido linha a linha; só as
+    linhas com erro ficam de fora e são registradas no resultado.
+
+    Com um ControleDeRitmo (carga.ritmo, ou CARGA_LATENCIA_ALVO /
+    CARGA_MAX_LINHAS_S), o tamanho de cada lote e a pausa depois dele seguem
+    a latência dos lotes anteriores.
+    """
+
+    def __init__(self, conn, insert_sql, tabela='', tamanho_lote=None,
+                 fast_executemany=True, log=print, ritmo=None):
+        if tamanho_lote is None:
+            tamanho_lote = tamanho_lote_padrao()
+        if tamanho_lote < 1:
+            raise ValueError("tamanho_lote deve ser maior que zero")
+        self.conn = conn
+        self.insert_sql = insert_sql
+        self.tabela = tabela
+        self.tamanho_lote = tamanho_lote
+        self.fast_executemany = fast_executemany
+        self.log = log or (lambda *_: None)
+        # Posição da primeira linha recebida (o retomável começa depois do checkpoint)
+        self.posicao_inicial = 0
+        # Import tardio: carga.ritmo também roda como script (python -m carga.ritmo)
+        from .ritmo import SondaDeBloqueios, ritmo_configurado
+        self.ritmo = ritmo or ritmo_configurado(tamanho_lote)
+        self._sonda = SondaDeBloqueios(conn, self.log) if self.ritmo and self.ritmo.latencia_alvo else None
+
+    def _abrir_cursor(self):
+        cursor = self.conn.cursor()
+        if self.fast_executemany:
+            try:
+                cursor.fast_executemany = True
+            except AttributeError:
+                # Drivers que não são pyodbc (ex.: sqlite3) não têm o atributo
+                pass
+        return cursor
+
+    def _rejeitar(self, posicao, linha, erro, resultado):
+        """Linha que falhou mesmo sozinha: fica de fora e vai para o resultado."""
+        resultado.falhas += 1
+        resultado.erros.append((posicao, str(erro)))
+
+    def _confirmar(self, fim, inseridos):
+        """Commit do lote que termina na posição `fim`, com `inseridos` linhas na tabela até ele."""
+        with fase('commit'):
+            self.conn.commit()
+
+    def _inserir_linha_a_linha(self, cursor, lote, offset, resultado):
+        inseridos = 0
+        for i, linha in enumerate(lote):
+            try:
+                cursor.execute(self.insert_sql, linha)
+                inseridos += 1
+            except Exception as e:
+                self._rejeitar(offset + i, linha, e, resultado)
+        self._confirmar(offset + len(lote), resultado.inseridos + inseridos)
+        return inseridos
+
+    def _lotes(self, linhas):
+        """Lotes de tamanho fixo, ou do tamanho que o ritmo pedir a cada um."""
+        if self.ritmo:
+            return em_lotes(linhas, lambda: self.ritmo.tamanho)
+        return em_lotes(linhas, self.tamanho_lote)
+
+    def _seguir_ritmo(self, linhas, segundos):
+        """Passa a latência do lote ao ritmo e espera a pausa que ele pedir."""
+        tamanho, pausa = self.ritmo.tamanho, self.ritmo.pausa
+        bloqueio = self._sonda.medir() if self._sonda else 0.0
+        espera = self.ritmo.registrar(linhas, segundos, bloqueio)
+        # Só ajustes de 10% ou mais no lote, para o log não virar um por lote
+        if abs(self.ritmo.tamanho - tamanho) * 10 >= tamanho or self.ritmo.pausa != pausa:
+            self.log(f"   🎚️ Lote {tamanho} → {self.ritmo.tamanho}, pausa {self.ritmo.pausa:.2f}s "
+                     f"(lote em {segundos * 1000:.0f}ms, {bloqueio * 1000:.0f}ms em bloqueios)")
+        with fase('pausa'):
+            self.ritmo.esperar(espera)
+
+    def _inserir_lote(self, cursor, lote, offset, resultado):
+        """executemany + commit de um lote; se falhar, desfaz e reinsere linha a linha."""
+        if self.ritmo:
+            inicio = self.ritmo.relogio()
+        try:
+            with fase('inserir'):
+                cursor.executemany(self.insert_sql, lote)
+            self._confirmar(offset + len(lote), resultado.inseridos + len(lote))
+            resultado.inseridos += len(lote)
+        except Exception as e:
+            self.conn.rollback()
+            resultado.lotes_com_fallback += 1
+            self.log(f"   ⚠️ Lote {resultado.lotes + 1} falhou ({e}); reinserindo linha a linha...")
+            with fase('linha_a_linha'):
+                resultado.inseridos += self._inserir_linha_a_linha(cursor, lote, offset, resultado)
+        resultado.lotes += 1
+        if self.ritmo:
+            self._seguir_ritmo(len(lote), self.ritmo.relogio() - inicio)
+
+    def _registrar(self, resultado):
+        contar('linhas_inseridas', resultado.inseridos)
+        contar('linhas_com_falha', resultado.falhas)
+        contar('lotes', resultado.lotes)
+        contar('lotes_com_fallback', resultado.lotes_com_fallback)
+
+    def carregar(self, linhas):
+        resultado = ResultadoCarga(tabela=self.tabela)
+        cursor = self._abrir_cursor()
+        inicio = time.perf_counter()
+        offset = self.posicao_inicial
+        lotes = self._lotes(linhas)
+
+        try:
+            while True:
+                # Montar o lote consome o gerador: aqui fica o tempo de Faker/tuplas
+                with fase('gerar'):
+                    lote = next(lotes, None)
+                if lote is None:
+                    break
+                self._inserir_lote(cursor, lote, offset, resultado)
+                offset += len(lote)
+                resultado.segundos = time.perf_counter() - inicio
+                self.log(f"   ✅ {resultado.inseridos} registros inseridos... "
+                         f"({resultado.linhas_por_segundo:,.0f} linhas/s)")
+        finally:
+            resultado.segundos = time.perf_counter() - inicio
+            cursor.close()
+            self._registrar(resultado)
+
+        return resultado
+
+
+def carregar_em_lotes(conn, insert_sql, linhas, tabela='', tamanho_lote=None, log=print):
+    """
+    Atalho para CarregadorEmLote(...).carregar(linhas). Com CARGA_ASSINCRONO=1
+    usa o CarregadorAssincrono (carga.assincrono), que gera o próximo lote
+    enquanto o anterior está no banco.
+    """
+    from .assincrono import carregar_em_lotes_async, modo_assincrono
+    if modo_assincrono():
+        return asyncio.run(carregar_em_lotes_async(conn, insert_sql, linhas, tabela=tabela,
+                                                   tamanho_lote=tamanho_lote, log=log))
+    carregador = CarregadorEmLote(conn, insert_sql, tabela=tabela, tamanho_lote=tamanho_lote, log=log)
+    return carregador.carregar(linhas)
@@ -0,0 +1,122 @@
+"""
+Alocação de chaves sem colisão (CHAVE_LOJA, CD_MUNIC) em O(n), com NumPy.
+
+Em vez de sortear e conferir em um set, cada chave é a imagem de um índice
+0, 1, 2, ... por uma permutação pseudoaleatória do espaço de chaves (rede de
+Feistel com cycle-walking). Índices distintos dão chaves distintas, então:
+
+    chaves_loja(1_000_000, seed=42)                      # tudo de uma vez
+    chaves_loja(100_000, seed=42, deslocamento=200_000)  # só o shard 3
+
+devolve exatamente as mesmas chaves, sem coordenação entre os processos.
+"""
+
+import numpy as np
+
+# Espaço de CHAVE_LOJA: abaixo de 10^8 o CNPJ por chave (carga.cnpj) não colide. As
+# chaves se espalham pelo espaço todo (até 8 dígitos, 99.999.999) em qualquer escala
+CHAVE_LOJA_INICIO = 10000
+CHAVE_LOJA_FIM = 100_000_000
+
+# Prefixos oficiais do IBGE por UF (2 primeiros dígitos do código de município)
+PREFIXOS_IBGE = {
+    'RO': 11, 'AC': 12, 'AM': 13, 'RR': 14, 'PA': 15, 'AP': 16, 'TO': 17,
+    'MA': 21, 'PI': 22, 'CE': 23, 'RN': 24, 'PB': 25, 'PE': 26, 'AL': 27, 'SE': 28, 'BA': 29,
+    'MG': 31, 'ES': 32, 'RJ': 33, 'SP': 35,
+    'PR': 41, 'SC': 42, 'RS': 43,
+    'MS': 50, 'MT': 51, 'GO': 52, 'DF': 53
+}
+
+# Últimos 5 dígitos do código IBGE: 00001..89999 (evita 00000)
+SUFIXO_MUNICIPIO_MIN = 1
+SUFIXO_MUNICIPIO_MAX = 89999
+
+RODADAS_FEISTEL = 4
+
+_MULTIPLICADOR = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _misturar(valores, chave):
+    # Função de rodada: mistura de bits estilo splitmix64 (aritmética uint64 com overflow)
+    v = (valores ^ chave) * _MULTIPLICADOR
+    v ^= v >> np.uint64(31)
+    v *= _MULTIPLICADOR
+    return v ^ (v >> np.uint64(29))
+
+
+def _chaves_rodada(seed):
+    rng = np.random.default_rng(seed)
+    return [np.uint64(k) for k in rng.integers(0, 2 ** 63, RODADAS_FEISTEL, dtype=np.uint64)]
+
+
+def _feistel(x, bits_metade, chaves_rodada):
+    mascara = np.uint64((1 << bits_metade) - 1)
+    deslocamento = np.uint64(bits_metade)
+    esquerda, direita = x >> deslocamento, x & mascara
+    for chave in chaves_rodada:
+        esquerda, direita = direita, esquerda ^ (_misturar(direita, chave) & mascara)
+    return (esquerda << deslocamento) | direita
+
+
+def permutar(indices, tamanho, seed=42):
+    """
+    Imagem de `indices` (0..tamanho-1) por uma permutação pseudoaleatória de
+    range(tamanho), determinada pela seed. Índices distintos → valores distintos.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    if tamanho < 1:
+        raise ValueError("tamanho do espaço de chaves deve ser maior que zero")
+    if indices.size and (indices.min() < 0 or indices.max() >= tamanho):
+        raise ValueError(f"índices devem estar entre 0 e {tamanho - 1}")
+
+    bits_metade = max(1, (int(tamanho - 1).bit_length() + 1) // 2)
+    chaves_rodada = _chaves_rodada(seed)
+    valores = _feistel(indices.astype(np.uint64), bits_metade, chaves_rodada)
+
+    # Cycle-walking: o domínio da Feistel é potência de 4 (< 4 × tamanho); quem
+    # cair fora de range(tamanho) é permutado de novo até voltar para dentro
+    fora = valores >= np.uint64(tamanho)
+    while fora.any():
+        valores[fora] = _feistel(valores[fora], bits_metade, chaves_rodada)
+        fora = valores >= np.uint64(tamanho)
+    return valores.astype(np.int64)
+
+
+def alocar(n, inicio, fim, seed=42, deslocamento=0):
+    """
+    `n` chaves distintas em [inicio, fim): as de índice deslocamento..deslocamento+n-1
+    da permutação. Shards com deslocamentos que não se sobrepõem nunca colidem.
+    """
+    tamanho = fim - inicio
+    if deslocamento + n > tamanho:
+        raise ValueError(f"espaço de chaves [{inicio}, {fim}) comporta só {tamanho} chaves")
+    return inicio + permutar(np.arange(deslocamento, deslocamento + n), tamanho, seed)
+
+
+def chaves_loja(n, seed=42, deslocamento=0):
+    """CHAVE_LOJA distintas para `n` lojas (até ~100 milhões)."""
+    return alocar(n, CHAVE_LOJA_INICIO, CHAVE_LOJA_FIM, seed, deslocamento)
+
+
+def chaves_loja_por_indice(indices, seed=42):
+    """CHAVE_LOJA da loja de cada índice: a mesma que chaves_loja(n) dá na posição i (i < n)."""
+    return CHAVE_LOJA_INICIO + permutar(indices, CHAVE_LOJA_FIM - CHAVE_LOJA_INICIO, seed)
+
+
+def codigos_municipio(ufs, seed=42, deslocamento=None):
+    """
+    Código IBGE de 7 dígitos para cada UF de `ufs` (prefixo da UF + sufixo
+    00001..89999), sem repetição dentro da UF. `deslocamento` ({uf: códigos já
+    alocados}) continua a alocação de um shard anterior.
+    """
+    ufs = np.asarray(ufs, dtype=object)
+    codigos = np.empty(len(ufs), dtype=np.int64)
+    deslocamento = deslocamento or {}
+
+    for uf in np.unique(ufs):
+        posicoes = np.flatnonzero(ufs == uf)
+        prefixo = PREFIXOS_IBGE[uf]
+        sufixos = alocar(len(posicoes), SUFIXO_MUNICIPIO_MIN, SUFIXO_MUNICIPIO_MAX + 1,
+                         seed=[seed, prefixo], deslocamento=deslocamento.get(uf, 0))
+        codigos[posicoes] = prefixo * 100000 + sufixos
+    return codigos
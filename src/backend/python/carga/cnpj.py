@@ -0,0 +1,137 @@
+"""
+CNPJs fictícios com dígitos verificadores corretos, gerados e validados com NumPy.
+
+Um CNPJ é raiz (8 dígitos) + filial (4 dígitos, 0001 na matriz) + 2 DVs
+(módulo 11). Todas as funções trabalham com o lote inteiro de uma vez:
+
+    gerar_cnpjs(1_000_000, seed=42)            # raízes distintas sorteadas
+    cnpjs_por_chave(df['CHAVE_LOJA'])          # um CNPJ fixo por chave
+    validar_cnpjs(df['CNPJ'])                  # array de bool
+
+Unicidade: gerar_cnpjs sorteia raízes sem reposição; cnpjs_por_chave usa uma
+bijeção de 0..10^8-1 sobre a chave, então chaves distintas sempre dão CNPJs
+distintos, em qualquer shard e em qualquer ordem de geração.
+"""
+
+import numpy as np
+
+PESOS_DV1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int64)
+PESOS_DV2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int64)
+
+MAXIMO_RAIZES = 10 ** 8
+FILIAL_MATRIZ = 1
+
+# Posições dos separadores em 00.000.000/0000-00
+_MASCARA = [(2, ord('.')), (6, ord('.')), (10, ord('/')), (15, ord('-'))]
+_POSICOES_DIGITOS = [i for i in range(18) if i not in dict(_MASCARA)]
+_POTENCIAS = 10 ** np.arange(11, -1, -1, dtype=np.int64)
+
+
+def _dv(digitos, pesos):
+    resto = (digitos @ pesos) % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def digitos_verificadores(digitos):
+    """DVs de uma matriz (n, 12) de dígitos; devolve uma matriz (n, 2)."""
+    digitos = np.asarray(digitos, dtype=np.int64)
+    dv1 = _dv(digitos, PESOS_DV1)
+    dv2 = _dv(np.column_stack([digitos, dv1]), PESOS_DV2)
+    return np.column_stack([dv1, dv2])
+
+
+def digitos_cnpj(raizes, filiais=FILIAL_MATRIZ):
+    """Matriz (n, 14) de dígitos a partir das raízes (0..10^8-1) e filiais."""
+    raizes = np.asarray(raizes, dtype=np.int64)
+    if raizes.size and (raizes.min() < 0 or raizes.max() >= MAXIMO_RAIZES):
+        raise ValueError("raízes de CNPJ devem estar entre 0 e 99999999")
+    base = raizes * 10_000 + np.asarray(filiais, dtype=np.int64)
+    digitos = (base[:, None] // _POTENCIAS) % 10
+    return np.column_stack([digitos, digitos_verificadores(digitos)])
+
+
+def formatar(digitos, mascarado=False):
+    """Matriz (n, 14) de dígitos → array de texto ('00000000000000' ou '00.000.000/0000-00')."""
+    # Monta os code points direto (UTF-32), sem passar por str de Python
+    digitos = np.asarray(digitos, dtype='<u4') + ord('0')
+    if mascarado:
+        letras = np.empty((len(digitos), 18), dtype='<u4')
+        letras[:, _POSICOES_DIGITOS] = digitos
+        for posicao, separador in _MASCARA:
+            letras[:, posicao] = separador
+    else:
+        letras = np.ascontiguousarray(digitos)
+    largura = letras.shape[1]
+    return letras.view(f'<U{largura}').ravel()
+
+
+def gerar_cnpjs(n, seed=None, rng=None, mascarado=False, filial=FILIAL_MATRIZ):
+    """`n` CNPJs válidos e distintos (raízes sorteadas sem reposição)."""
+    if n > MAXIMO_RAIZES:
+        raise ValueError(f"no máximo {MAXIMO_RAIZES} CNPJs distintos por filial")
+    rng = rng or np.random.default_rng(seed)
+    raizes = rng.choice(MAXIMO_RAIZES, n, replace=False)
+    return formatar(digitos_cnpj(raizes, filial), mascarado)
+
+
+def _embaralhamento(seed):
+    # a ímpar e não múltiplo de 5 é inversível módulo 10^8: x → a·x + b é uma bijeção
+    rng = np.random.default_rng(seed)
+    a = int(rng.integers(1, MAXIMO_RAIZES // 10)) * 10 + int(rng.choice([1, 3, 7, 9]))
+    b = int(rng.integers(0, MAXIMO_RAIZES))
+    return a % MAXIMO_RAIZES, b
+
+
+def cnpjs_por_chave(chaves, seed=42, mascarado=False, filial=FILIAL_MATRIZ):
+    """
+    CNPJ determinístico por chave inteira (ex.: CHAVE_LOJA). A mesma chave
+    sempre recebe o mesmo CNPJ e chaves distintas (módulo 10^8) nunca colidem.
+    """
+    chaves = np.asarray(chaves, dtype=np.int64) % MAXIMO_RAIZES
+    a, b = _embaralhamento(seed)
+    # a·x cabe em int64: a < 10^8 e x < 10^8
+    raizes = (chaves * a + b) % MAXIMO_RAIZES
+    return formatar(digitos_cnpj(raizes, filial), mascarado)
+
+
+def validar_cnpjs(valores):
+    """
+    Array de bool: True para CNPJs só com os 14 dígitos ou exatamente na máscara
+    00.000.000/0000-00, com DVs corretos e dígitos não todos iguais. Nulos,
+    separadores fora do lugar e textos fora do formato dão False.
+    """
+    valores = np.asarray(valores)
+    validos = np.zeros(len(valores), dtype=bool)
+    if valores.dtype.kind != 'U':
+        # Coluna object (ex.: com nulos): o que não é texto vira '' e é inválido
+        valores = np.array([v if isinstance(v, str) else '' for v in valores], dtype=str)
+    largura = valores.dtype.itemsize // 4
+    if not len(valores) or not largura:
+        return validos
+
+    # Cada texto vira uma linha de code points; posições vazias são 0. Só as 18
+    # primeiras interessam: um texto mais longo já é inválido pelo comprimento
+    letras = np.ascontiguousarray(valores).view('<u4').reshape(len(valores), largura)
+    comprimento = (letras != 0).sum(axis=1)
+    letras = np.pad(letras[:, :18], ((0, 0), (0, max(0, 18 - largura))))
+    eh_digito = (letras >= ord('0')) & (letras <= ord('9'))
+
+    sem_mascara = (comprimento == 14) & eh_digito[:, :14].all(axis=1)
+    com_mascara = (comprimento == 18) & eh_digito[:, _POSICOES_DIGITOS].all(axis=1)
+    for posicao, separador in _MASCARA:
+        com_mascara &= letras[:, posicao] == separador
+    candidatos = sem_mascara | com_mascara
+    if not candidatos.any():
+        return validos
+
+    letras = letras[candidatos]
+    digitos = np.where(com_mascara[candidatos, None], letras[:, _POSICOES_DIGITOS], letras[:, :14])
+    digitos = (digitos - ord('0')).astype(np.int64)
+    corretos = (digitos_verificadores(digitos[:, :12]) == digitos[:, 12:]).all(axis=1)
+    repetidos = (digitos == digitos[:, :1]).all(axis=1)
+    validos[candidatos] = corretos & ~repetidos
+    return validos
+
+
+def cnpj_valido(valor):
+    return bool(validar_cnpjs([valor])[0])
@@ -0,0 +1,72 @@
+"""Sorteio de colunas completas com NumPy, compartilhado pelos geradores colunares."""
+
+import numpy as np
+import pandas as pd
+
+# Janelas de datas equivalentes às usadas em fake.date_between (o Faker conta
+# 'M' como 30 dias e 'y' como 365 dias)
+DIAS_3_ANOS = 3 * 365
+DIAS_1_ANO = 365
+DIAS_6_MESES = 6 * 30
+DIAS_3_MESES = 3 * 30
+DIAS_2_MESES = 2 * 30
+
+
+def categorico(categorias, codigos, mascara=None):
+    """Coluna Categorical a partir de códigos; posições fora da máscara ficam nulas."""
+    if mascara is not None:
+        codigos = np.where(mascara, codigos, -1)
+    return pd.Categorical.from_codes(codigos, categories=categorias)
+
+
+def escolha(rng, opcoes, n):
+    return categorico(opcoes, rng.integers(0, len(opcoes), n))
+
+
+def inteiros(rng, n, minimo, maximo, prob=1.0):
+    """Inteiros uniformes em [minimo, maximo]; com prob < 1 os demais ficam nulos (Int64)."""
+    valores = pd.array(rng.integers(minimo, maximo + 1, n), dtype='Int64')
+    if prob < 1.0:
+        valores[rng.random(n) >= prob] = pd.NA
+    return valores
+
+
+def bits(rng, n, prob):
+    return (rng.random(n) < prob).astype(np.uint8)
+
+
+def datas(rng, n, dias, hoje, mascara=None):
+    """Datas uniformes entre hoje - dias e hoje; posições fora da máscara viram NaT."""
+    base = np.datetime64(hoje, 'D')
+    valores = base - rng.integers(0, dias + 1, n).astype('timedelta64[D]')
+    if mascara is not None:
+        valores = np.where(mascara, valores, np.datetime64('NaT', 'D'))
+    return valores
+
+
+def coluna_por_indice(valores, indices):
+    """Expande uma lista pequena de valores para n linhas a partir dos índices sorteados."""
+    if isinstance(valores[0], str):
+        categorias = pd.Categorical(valores)
+        return categorico(categorias.categories, categorias.codes[indices])
+    return np.asarray(valores, dtype=np.int64)[indices]
+
+
+def linhas_do_dataframe(df):
+    """
+    Converte o DataFrame em tuplas prontas para o executemany.
+
+    NaN/NaT/NA viram None e datas viram datetime.date, que é o que o pyodbc
+    espera para colunas DATE.
+    """
+    colunas = []
+    for nome in df.columns:
+        serie = df[nome]
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            # datetime64[D] -> object produz datetime.date (e None para NaT)
+            valores = serie.to_numpy().astype('datetime64[D]').astype(object)
+        else:
+            valores = np.array(serie.astype(object), dtype=object)
+            valores[pd.isna(serie).to_numpy()] = None
+        colunas.append(valores)
+    return zip(*colunas)
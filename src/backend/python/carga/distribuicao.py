@@ -0,0 +1,205 @@
+"""
+Distribuições enviesadas das linhas por supervisor, por agência e por situação.
+
+Por padrão os geradores espalham as linhas por igual. Em produção poucos
+supervisores concentram milhares de linhas, e são eles que deixam lentas
+rotas como /hotlist/:userId e /:userId/summary. Com uma distribuição
+enviesada dá para reproduzir esse pior caso e medi-lo:
+
+    CARGA_DISTRIBUICAO=zipf:1.2 python -m carga                 # as três dimensões
+    CARGA_DISTRIBUICAO_SITUACAO=contagens.csv python hotlist.py  # só uma
+    python -m carga --distribuicao zipf:1.2 --distribuicao situacao=pesos:70,20,10
+
+Especificações:
+
+- uniforme: o padrão, sem viés;
+- zipf:S: a categoria de posição k (1, 2, ...) recebe peso 1/k^S;
+- pesos:5,3,1: pesos explícitos por posição (as demais categorias ficam com zero);
+- ARQUIVO.csv/.json: pesos empíricos, por exemplo as contagens de produção.
+  O CSV tem uma coluna `peso` (ou `contagem`) e, opcionalmente, `valor`. Com
+  `valor`, o peso vai para a categoria de mesmo valor; sem ela, segue a
+  posição. O JSON é {valor: peso} ou uma lista de pesos.
+
+Na Zipf e nos pesos por posição, a primeira categoria é a mais pesada: a
+primeira supervisão da hierarquia, o primeiro de ids_usuarios() (um usuário
+de teste, que dá para usar no login), a primeira agência. Assim o pior caso é sempre o mesmo tenant. Para ajustar o expoente
+às contagens de produção:
+
+    python -m carga.distribuicao ajustar contagens.csv     # → zipf:1.07
+    python -m carga.distribuicao info zipf:1.07 50
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DIMENSOES = ('supervisor', 'agencia', 'situacao')
+
+
+class Distribuicao:
+    """Pesos relativos das categorias de uma dimensão; `uniforme` sem viés."""
+
+    def __init__(self, especificacao='uniforme', expoente=None, pesos=None, valores=None):
+        self.especificacao = especificacao
+        self.expoente = expoente
+        self.pesos = None if pesos is None else np.asarray(pesos, dtype=np.float64)
+        self.valores = valores
+
+    @property
+    def uniforme(self):
+        return self.expoente is None and self.pesos is None
+
+    def probabilidades(self, categorias):
+        """Probabilidade de cada uma das `categorias`, na ordem dada."""
+        k = len(categorias)
+        if self.uniforme:
+            return np.full(k, 1.0 / k)
+        if self.expoente is not None:
+            pesos = 1.0 / np.arange(1, k + 1, dtype=np.float64) ** self.expoente
+        elif self.valores is not None:
+            por_valor = dict(zip(self.valores, self.pesos.tolist()))
+            pesos = np.array([por_valor.get(str(c), 0.0) for c in categorias])
+        else:
+            pesos = np.zeros(k)
+            pesos[:min(k, len(self.pesos))] = self.pesos[:k]
+        if pesos.sum() <= 0:
+            raise ValueError(f"Distribuição {self.especificacao}: nenhuma das {k} categorias tem peso")
+        return pesos / pesos.sum()
+
+    def sortear(self, rng, n, categorias):
+        """Índice em `categorias` para n linhas (uniforme: rng.integers, como antes)."""
+        k = len(categorias)
+        if self.uniforme:
+            return rng.integers(0, k, n)
+        return rng.choice(k, size=n, p=self.probabilidades(categorias))
+
+    def __repr__(self):
+        return self.especificacao
+
+
+def _pesos_de_arquivo(caminho):
+    """(pesos, valores ou None) de um CSV/JSON com contagens ou pesos."""
+    if Path(caminho).suffix.lower() == '.json':
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        if isinstance(dados, dict):
+            return list(dados.values()), [str(v) for v in dados]
+        return dados, None
+
+    # Separador detectado: o Excel em pt-BR grava com ';'
+    df = pd.read_csv(caminho, sep=None, engine='python', encoding='utf-8-sig')
+    df.columns = [c.strip().lower() for c in df.columns]
+    coluna = next((c for c in ('peso', 'contagem') if c in df.columns), None)
+    if coluna is None:
+        raise ValueError(f"{caminho}: falta a coluna 'peso' (ou 'contagem')")
+    valores = df['valor'].astype(str).str.strip().tolist() if 'valor' in df.columns else None
+    return df[coluna].tolist(), valores
+
+
+def interpretar(especificacao):
+    """'uniforme', 'zipf:1.2', 'pesos:5,3,1' ou caminho de CSV/JSON → Distribuicao."""
+    texto = (especificacao or 'uniforme').strip()
+    tipo, _, argumento = texto.partition(':')
+    tipo = tipo.lower()
+    try:
+        if tipo == 'uniforme':
+            return Distribuicao()
+        if tipo == 'zipf':
+            expoente = float(argumento or 1.0)
+            if expoente < 0:
+                raise ValueError("o expoente não pode ser negativo")
+            return Distribuicao(texto, expoente=expoente)
+        if tipo == 'pesos':
+            pesos = [float(p) for p in argumento.split(',') if p.strip()]
+            if not pesos or min(pesos) < 0:
+                raise ValueError("informe pesos não negativos")
+            return Distribuicao(texto, pesos=pesos)
+    except ValueError as e:
+        raise ValueError(f"Distribuição inválida: {texto} ({e})") from None
+
+    if not Path(texto).exists():
+        raise ValueError(f"Distribuição inválida: {texto} (use uniforme, zipf:S, pesos:A,B,... ou um CSV/JSON)")
+    pesos, valores = _pesos_de_arquivo(texto)
+    if min(pesos, default=-1) < 0:
+        raise ValueError(f"Distribuição inválida: {texto} (pesos negativos ou ausentes)")
+    return Distribuicao(texto, pesos=pesos, valores=valores)
+
+
+def variavel(dimensao):
+    return f"CARGA_DISTRIBUICAO_{dimensao.upper()}"
+
+
+def distribuicao_configurada(dimensao):
+    """A distribuição de `dimensao`: CARGA_DISTRIBUICAO_<DIMENSAO>, CARGA_DISTRIBUICAO ou uniforme."""
+    if dimensao not in DIMENSOES:
+        raise ValueError(f"Dimensão desconhecida: {dimensao} (use {', '.join(DIMENSOES)})")
+    return interpretar(os.environ.get(variavel(dimensao)) or os.environ.get('CARGA_DISTRIBUICAO'))
+
+
+def distribuicoes_configuradas():
+    """Dimensão → Distribuicao, para todas as DIMENSOES."""
+    return {dimensao: distribuicao_configurada(dimensao) for dimensao in DIMENSOES}
+
+
+def configurar(valores):
+    """
+    Aplica --distribuicao ESPEC (todas as dimensões) ou DIMENSAO=ESPEC (uma só)
+    às variáveis de ambiente lidas pelos scripts; ValueError se inválida.
+    """
+    for valor in valores or []:
+        dimensao, _, especificacao = valor.rpartition('=')
+        dimensao = dimensao.strip().lower()
+        if dimensao and dimensao not in DIMENSOES:
+            raise ValueError(f"--distribuicao: dimensão desconhecida {dimensao} (use {', '.join(DIMENSOES)})")
+        interpretar(especificacao)
+        os.environ[variavel(dimensao) if dimensao else 'CARGA_DISTRIBUICAO'] = especificacao.strip()
+
+
+def maior_fatia(categorias, indices):
+    """(categoria mais sorteada, fração das linhas que ficaram com ela)."""
+    contagens = np.bincount(np.asarray(indices), minlength=len(categorias))
+    maior = int(contagens.argmax())
+    return categorias[maior], contagens[maior] / max(1, contagens.sum())
+
+
+def ajustar_zipf(contagens):
+    """Expoente da Zipf que melhor aproxima as contagens (regressão em log-log)."""
+    contagens = np.sort(np.asarray(contagens, dtype=np.float64))[::-1]
+    contagens = contagens[contagens > 0]
+    if len(contagens) < 2:
+        raise ValueError("São necessárias ao menos duas contagens positivas")
+    posicoes = np.log(np.arange(1, len(contagens) + 1))
+    inclinacao = np.polyfit(posicoes, np.log(contagens), 1)[0]
+    return max(0.0, -inclinacao)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        if len(argv) == 2 and argv[0] == 'ajustar':
+            expoente = ajustar_zipf(_pesos_de_arquivo(argv[1])[0])
+            print(f"📈 {argv[1]}: zipf:{expoente:.2f}")
+            return 0
+        if len(argv) in (2, 3) and argv[0] == 'info':
+            distribuicao = interpretar(argv[1])
+            k = int(argv[2]) if len(argv) == 3 else 10
+            probabilidades = distribuicao.probabilidades(range(k))
+            acumulada = np.cumsum(np.sort(probabilidades)[::-1])
+            print(f"📈 {distribuicao} em {k} categorias:")
+            for i, p in enumerate(probabilidades[:10]):
+                print(f"   #{i + 1}: {p:.1%}")
+            print(f"   Top 10% das categorias: {acumulada[max(1, k // 10) - 1]:.1%} das linhas")
+            return 0
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print("Uso: python -m carga.distribuicao ajustar ARQUIVO | info ESPECIFICACAO [CATEGORIAS]")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
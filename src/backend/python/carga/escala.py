@@ -0,0 +1,187 @@
+"""
+Fator de escala (no estilo TPC): uma única opção dimensiona todas as tabelas.
+
+    python -m carga --escala SF10
+    CARGA_ESCALA=SF100 python estr_contas.py
+    python -m carga.arquivos exportar --escala SF10
+
+No SF1 são 2.500 lojas (TB_ESTR_CONTAS, TB_ESTR_LOJAS e TB_ESTR_ATIVO têm uma
+linha por CHAVE_LOJA) e as demais tabelas na proporção de LINHAS_SF1; o SF10
+e o SF100 multiplicam tudo por 10 e por 100. --rows continua valendo e tem
+prioridade sobre a escala.
+
+As chaves que cruzam tabelas saem da mesma fonte, então os joins do backend
+têm seletividade e cardinalidade realistas:
+
+- CHAVE_LOJA: chaves_loja(n, SEED_PADRAO), a mesma em CONTAS, LOJAS e ATIVO;
+- CNPJ de HOTLIST e OPORTUNIDADES_CONTAS: o CNPJ de uma loja existente
+  (cnpjs_por_chave), sorteada entre as CHAVE_LOJA lidas de TB_ESTR_CONTAS
+  (chaves_de_contas; as da escala só quando a tabela não existe ou quando as
+  linhas vão para arquivos);
+- CHAVE_SUP/CHAVE_COORD/CHAVE_GERENTE de MUNICIPIOS_PRIORITARIOS: uma
+  supervisão da hierarquia das lojas, com a coordenação e a gerência dela;
+- CD_MUNIC das tratativas: municípios lidos de MUNICIPIOS_PRIORITARIOS;
+- supervisor_id/USER_ID: os supervisores de ids_usuarios() (os dois usuários
+  de teste mais SUPERVISORES_SF1 por SF) que existem em TESTE..users; com
+  --criar-usuarios, carga.usuarios cadastra os que faltam.
+"""
+
+import os
+import uuid
+
+import numpy as np
+
+from .chaves import chaves_loja_por_indice
+from .cnpj import cnpjs_por_chave
+from .distribuicao import distribuicao_configurada
+from .hierarquia import hierarquia_configurada
+from .lojas import HIERARQUIA_ORGANIZACIONAL
+from .shards import SEED_PADRAO
+
+ESCALAS = {'SF1': 1, 'SF10': 10, 'SF100': 100}
+
+# Linhas de cada tabela no SF1
+LINHAS_SF1 = {
+    'TB_ESTR_CONTAS': 2500,
+    'MUNICIPIOS_PRIORITARIOS': 50,
+    'MUNICIPIOS_PRIORITARIOS_TRATATIVAS': 20,
+    'HOTLIST': 250,
+    'OPORTUNIDADES_CONTAS': 125,
+}
+
+# Uma linha por CHAVE_LOJA de TB_ESTR_CONTAS
+POR_LOJA = ('TB_ESTR_LOJAS', 'TB_ESTR_ATIVO')
+
+# Usuários de teste (TESTE..users) donos das linhas de HOTLIST, OPORTUNIDADES_CONTAS e tratativas
+IDS_USUARIOS = [
+    '8ABD1646-FEC3-4AD3-B130-5D4A961365DB',
+    '13651188-7289-4C4B-A509-1A2AD65B486F',
+]
+
+# Supervisores no SF1, contando os de IDS_USUARIOS; os demais são gerados
+SUPERVISORES_SF1 = 20
+
+# Namespace do uuid5 dos supervisores gerados (o i-ésimo tem sempre o mesmo id)
+NAMESPACE_SUPERVISORES = uuid.UUID('5B0E2C7A-96D1-4F3B-8A52-3C9E1D7F4A60')
+
+
+def fator(valor):
+    """'SF10', '10' ou 10 → 10."""
+    texto = str(valor).strip().upper()
+    if texto in ESCALAS:
+        return ESCALAS[texto]
+    try:
+        numero = float(texto[2:] if texto.startswith('SF') else texto)
+    except ValueError:
+        raise ValueError(f"Escala inválida: {valor} (use {', '.join(ESCALAS)} ou um número)") from None
+    if numero <= 0:
+        raise ValueError(f"Escala inválida: {valor} (deve ser maior que zero)")
+    return int(numero) if numero.is_integer() else numero
+
+
+def fator_configurado():
+    """Fator de CARGA_ESCALA (None se ausente)."""
+    valor = os.environ.get('CARGA_ESCALA')
+    return fator(valor) if valor else None
+
+
+def linhas_da_escala(fator_escala):
+    """Quantidade de linhas de cada tabela no fator dado."""
+    linhas = {tabela: max(1, round(n * fator_escala)) for tabela, n in LINHAS_SF1.items()}
+    for tabela in POR_LOJA:
+        linhas[tabela] = linhas['TB_ESTR_CONTAS']
+    return linhas
+
+
+def linhas_padrao(tabela, padrao):
+    """Linhas de `tabela` na escala de CARGA_ESCALA, ou `padrao` sem escala."""
+    fator_escala = fator_configurado()
+    return linhas_da_escala(fator_escala)[tabela] if fator_escala else padrao
+
+
+def total_de_lojas():
+    """
+    Lojas de TB_ESTR_CONTAS quando ela não pode ser lida: as da carga atual
+    (CARGA_TOTAL_LOJAS, definida pelo orquestrador e pela exportação quando
+    --rows ou --escala dimensionam a tabela) ou as da escala (SF1 sem CARGA_ESCALA).
+    """
+    valor = os.environ.get('CARGA_TOTAL_LOJAS')
+    if valor:
+        return int(valor)
+    return linhas_da_escala(fator_configurado() or 1)['TB_ESTR_CONTAS']
+
+
+def ids_usuarios(fator_escala=None):
+    """
+    IDS_USUARIOS mais supervisores gerados até SUPERVISORES_SF1 × fator
+    (CARGA_ESCALA, SF1 sem ela): com poucos supervisores, uma distribuição
+    enviesada não tem a quem concentrar as linhas.
+    """
+    fator_escala = fator_escala or fator_configurado() or 1
+    total = max(len(IDS_USUARIOS), round(SUPERVISORES_SF1 * fator_escala))
+    gerados = [str(uuid.uuid5(NAMESPACE_SUPERVISORES, str(i))).upper() for i in range(total - len(IDS_USUARIOS))]
+    return IDS_USUARIOS + gerados
+
+
+def chaves_de_contas(conn):
+    """
+    CHAVE_LOJA de TB_ESTR_CONTAS (`conn` no banco DW), lidas como estr_lojas e
+    estr_ativo leem; None se a tabela não existe ou está vazia.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT CHAVE_LOJA FROM TB_ESTR_CONTAS")
+        chaves = [row[0] for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"⚠️ Erro ao buscar dados da TB_ESTR_CONTAS: {e}")
+        chaves = []
+    finally:
+        cursor.close()
+
+    if not chaves:
+        print(f"⚠️ Nenhuma CHAVE_LOJA encontrada na TB_ESTR_CONTAS. Usando as {total_de_lojas():,} lojas da escala.")
+        return None
+    return np.asarray(chaves, dtype=np.int64)
+
+
+def lojas_sorteadas(n, seed=None, total=None, chaves=None):
+    """
+    CHAVE_LOJA e CNPJ (com máscara) de `n` lojas sorteadas, sem repetição
+    enquanto houver lojas para todas as linhas.
+
+    Com `chaves` (chaves_de_contas), sorteia entre as lojas carregadas em
+    TB_ESTR_CONTAS. Sem elas (tabela ausente, ou exportação para arquivos),
+    entre as `total` primeiras (total_de_lojas() por padrão): chaves_loja é
+    estável por prefixo (a loja i é a mesma com 2.500 ou 250.000 lojas), então
+    as chaves existem em TB_ESTR_CONTAS/TB_ESTR_LOJAS sempre que elas forem
+    carregadas com pelo menos `total` lojas.
+    """
+    rng = np.random.default_rng(seed)
+    if chaves is not None and len(chaves):
+        chaves = np.asarray(chaves, dtype=np.int64)
+        chaves = rng.choice(chaves, size=n, replace=n > len(chaves))
+        return chaves, cnpjs_por_chave(chaves, mascarado=True)
+
+    total = total or total_de_lojas()
+    indices = rng.choice(total, size=n, replace=n > total)
+    chaves = chaves_loja_por_indice(indices, seed=SEED_PADRAO)
+    return chaves, cnpjs_por_chave(chaves, mascarado=True)
+
+
+def supervisoes_sorteadas(n, seed=None, hierarquia=None, distribuicao=None):
+    """
+    (CHAVE_SUPERVISAO, CHAVE_COORDENACAO, CHAVE_GERENCIA_AREA) de `n` supervisões
+    sorteadas da hierarquia das lojas (CARGA_HIERARQUIA ou a padrão), com os
+    pesos da distribuição do supervisor (CARGA_DISTRIBUICAO ou uniforme).
+    """
+    arvore = hierarquia if hierarquia is not None else hierarquia_configurada(HIERARQUIA_ORGANIZACIONAL)
+    distribuicao = distribuicao or distribuicao_configurada('supervisor')
+    supervisoes = arvore.chaves['supervisao']
+    colunas = arvore.colunas(distribuicao.sortear(np.random.default_rng(seed), n, supervisoes))
+    return colunas['CHAVE_SUPERVISAO'], colunas['CHAVE_COORDENACAO'], colunas['CHAVE_GERENCIA_AREA']
+
+
+def resumo(fator_escala):
+    linhas = linhas_da_escala(fator_escala)
+    return ', '.join([f"{tabela} {n:,}" for tabela, n in linhas.items()] +
+                     [f"{len(ids_usuarios(fator_escala)):,} supervisores"])
@@ -0,0 +1,127 @@
+"""
+Desenho físico (chaves, índices e columnstore) das tabelas criadas pelos scripts.
+
+Os índices seguem as consultas de routes/estrategiaComercial.js: filtro por
+CHAVE_GERENCIA_AREA / CHAVE_COORDENACAO / CHAVE_SUPERVISAO (getHierarchyFilter),
+SITUACAO = 'BLOQUEADO', ordenação por NOME_LOJA/DT_ULT_TRANSACAO/DT_BLOQUEIO e
+JOIN de TB_ESTR_CONTAS/TB_ESTR_ATIVO por CHAVE_LOJA.
+
+Cada mudança aqui sobe VERSAO_ESQUEMA; a versão aplicada em cada tabela fica
+registrada em ESQUEMA_VERSAO.
+"""
+
+import os
+from dataclasses import dataclass
+
+from .instrumentacao import fase
+from .troca import criar_indices
+
+VERSAO_ESQUEMA = 1
+
+# Colunas incluídas nos índices de hierarquia. Com CHAVE_LOJA (chave do índice
+# clusterizado, presente em todo índice não clusterizado) elas cobrem as
+# métricas e o JOIN com CONTAS/ATIVO sem key lookup; as listagens largas fazem
+# seek no índice e key lookup só nas lojas da hierarquia do usuário.
+INCLUSAS_HIERARQUIA = ('NOME_LOJA', 'DT_ULT_TRANSACAO', 'DT_BLOQUEIO')
+
+
+@dataclass(frozen=True)
+class Indice:
+    nome: str
+    ddl: str                    # {tabela} é substituído pelo nome real (ou pela sombra)
+    columnstore: bool = False   # só criado com CARGA_COLUMNSTORE=1
+
+
+def _hierarquia(nome, chave):
+    return Indice(nome, f"CREATE NONCLUSTERED INDEX {nome} ON {{tabela}} ({chave}, SITUACAO) "
+                        f"INCLUDE ({', '.join(INCLUSAS_HIERARQUIA)})")
+
+
+def _columnstore(nome):
+    return Indice(nome, f"CREATE NONCLUSTERED COLUMNSTORE INDEX {nome} ON {{tabela}} "
+                        f"(CHAVE_LOJA, MES_M3, MES_M2, MES_M1, MES_M0)", columnstore=True)
+
+
+INDICES = {
+    'TB_ESTR_LOJAS': [
+        Indice('PK', "ALTER TABLE {tabela} ADD PRIMARY KEY CLUSTERED (CHAVE_LOJA)"),
+        _hierarquia('IX_LOJAS_SUPERVISAO', 'CHAVE_SUPERVISAO'),
+        _hierarquia('IX_LOJAS_COORDENACAO', 'CHAVE_COORDENACAO'),
+        _hierarquia('IX_LOJAS_GERENCIA_AREA', 'CHAVE_GERENCIA_AREA'),
+        Indice('IX_LOJAS_DIR_REGIONAL', "CREATE NONCLUSTERED INDEX IX_LOJAS_DIR_REGIONAL ON {tabela} "
+                                        "(DIR_REGIONAL, SITUACAO)"),
+        # Admin vê todas as lojas: pontos bloqueados filtram só por SITUACAO
+        Indice('IX_LOJAS_SITUACAO', "CREATE NONCLUSTERED INDEX IX_LOJAS_SITUACAO ON {tabela} "
+                                    "(SITUACAO, DT_BLOQUEIO DESC)"),
+    ],
+    # Agregações MES_M3..MES_M0 das métricas (SUM/CASE sobre a tabela inteira)
+    'TB_ESTR_CONTAS': [_columnstore('CS_CONTAS_MESES')],
+    'TB_ESTR_ATIVO': [_columnstore('CS_ATIVO_MESES')],
+}
+
+
+def columnstore_habilitado():
+    """Columnstore é opcional (CARGA_COLUMNSTORE=1): exige SQL Server 2016+ ou edição compatível."""
+    return os.environ.get('CARGA_COLUMNSTORE', '0').lower() in ('1', 'yes', 'true')
+
+
+def _idempotente(indice):
+    if indice.nome == 'PK':
+        condicao = "OBJECTPROPERTY(OBJECT_ID('{tabela}'), 'TableHasPrimaryKey') = 0"
+    else:
+        condicao = (f"NOT EXISTS (SELECT 1 FROM sys.indexes "
+                    f"WHERE name = '{indice.nome}' AND object_id = OBJECT_ID('{{tabela}}'))")
+    return f"IF {condicao}\n    {indice.ddl};"
+
+
+def ddl_indices(tabela, columnstore=None):
+    """
+    DDLs idempotentes dos índices de `tabela`, na ordem de criação, com {tabela}
+    no lugar do nome (criar_indices preenche com a tabela real ou a sombra; os
+    nomes dos índices são por tabela e continuam válidos depois do sp_rename).
+    """
+    columnstore = columnstore_habilitado() if columnstore is None else columnstore
+    return [_idempotente(indice) for indice in INDICES.get(tabela, [])
+            if columnstore or not indice.columnstore]
+
+
+def registrar_versao(conn, tabela):
+    cursor = conn.cursor()
+    cursor.execute("""
+    IF OBJECT_ID('ESQUEMA_VERSAO', 'U') IS NULL
+        CREATE TABLE ESQUEMA_VERSAO (
+            TABELA VARCHAR(128) NOT NULL PRIMARY KEY,
+            VERSAO INT NOT NULL,
+            APLICADO_EM DATETIME2 NOT NULL DEFAULT SYSDATETIME()
+        );
+    """)
+    cursor.execute("""
+    MERGE ESQUEMA_VERSAO AS alvo
+    USING (SELECT ? AS TABELA, ? AS VERSAO) AS origem ON alvo.TABELA = origem.TABELA
+    WHEN MATCHED THEN UPDATE SET VERSAO = origem.VERSAO, APLICADO_EM = SYSDATETIME()
+    WHEN NOT MATCHED THEN INSERT (TABELA, VERSAO) VALUES (origem.TABELA, origem.VERSAO);
+    """, (tabela, VERSAO_ESQUEMA))
+    conn.commit()
+    cursor.close()
+
+
+def aplicar_esquema(conn, tabela, columnstore=None, log=print):
+    """Cria os índices que faltam em uma tabela já existente e registra a versão."""
+    with fase('indices'):
+        criar_indices(conn, tabela, ddl_indices(tabela, columnstore=columnstore), log=log)
+        registrar_versao(conn, tabela)
+
+
+def script_sql(columnstore=True):
+    """Pacote completo de índices em T-SQL, para revisão ou execução manual."""
+    blocos = [f"-- Índices das tabelas da Estratégia Comercial (versão {VERSAO_ESQUEMA})",
+              "USE DATAWAREHOUSE;", "GO"]
+    for tabela in INDICES:
+        blocos.append(f"\n-- {tabela}")
+        for ddl in ddl_indices(tabela, columnstore=columnstore):
+            blocos.extend([ddl.format(tabela=tabela), "GO"])
+    return '\n'.join(blocos) + '\n'
+
+
+if __name__ == '__main__':
+    print(script_sql(), end='')
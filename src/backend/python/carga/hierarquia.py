@@ -0,0 +1,217 @@
+"""
+Hierarquia organizacional (diretoria → gerência → coordenação → supervisão)
+compilada em arrays de inteiros.
+
+Cada nível vira três arrays: as chaves dos nós, as descrições e a posição do
+pai no nível de cima. Cada supervisão (folha) guarda o código do seu nó em
+todos os níveis. Então distribuir as lojas é sortear um índice de supervisão
+por loja, e as oito colunas de hierarquia da TB_ESTR_LOJAS saem por indexação
+(NumPy), sem copiar dicts por linha.
+
+    arvore = Hierarquia.de_dict(HIERARQUIA_ORGANIZACIONAL)
+    arvore = Hierarquia.carregar('hierarquia.csv')   # ou .json
+    indices = arvore.sortear(rng, n)                 # uma supervisão por loja
+    colunas = arvore.colunas(indices)                # {'DIRE_REG': ..., 'DESC_SUPERVISAO': ...}
+    arvore.pai('supervisao', 40001)                  # 30001, em O(1)
+
+O CSV (ou JSON em lista) tem uma linha por supervisão, com as colunas da
+TB_ESTR_LOJAS: DIRE_REG, DIR_REGIONAL, CHAVE_GERENCIA_AREA, ... O JSON
+também pode vir no formato aninhado de HIERARQUIA_ORGANIZACIONAL. Com
+CARGA_HIERARQUIA=arquivo, estr_lojas.py usa a hierarquia do arquivo.
+
+    python -m carga.hierarquia info hierarquia.csv
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .colunas import categorico
+
+# (nível, coluna da chave, coluna da descrição) em TB_ESTR_LOJAS, do mais alto para o mais baixo
+NIVEIS = [
+    ('diretoria', 'DIRE_REG', 'DIR_REGIONAL'),
+    ('gerencia', 'CHAVE_GERENCIA_AREA', 'DESC_GERENCIA_AREA'),
+    ('coordenacao', 'CHAVE_COORDENACAO', 'DESC_COORDENACAO'),
+    ('supervisao', 'CHAVE_SUPERVISAO', 'DESC_SUPERVISAO'),
+]
+
+COLUNAS_HIERARQUIA = [coluna for _, chave, desc in NIVEIS for coluna in (chave, desc)]
+
+
+class Hierarquia:
+    """Árvore compilada; uma linha por supervisão, na ordem em que apareceram."""
+
+    def __init__(self, registros):
+        df = pd.DataFrame(registros)
+        faltando = [c for c in COLUNAS_HIERARQUIA if c not in df.columns]
+        if faltando:
+            raise ValueError(f"Colunas ausentes na hierarquia: {', '.join(faltando)}")
+        df = df[COLUNAS_HIERARQUIA].drop_duplicates().reset_index(drop=True)
+        if df.empty:
+            raise ValueError("Hierarquia sem supervisões")
+        if df.isna().any().any():
+            raise ValueError("Hierarquia com chaves ou descrições vazias")
+        _conferir(df)
+
+        self.chaves = {}
+        self.descricoes = {}
+        self.pais = {}
+        self.codigos = {}
+        self._posicao = {}
+        anterior = None
+        for nivel, coluna_chave, coluna_desc in NIVEIS:
+            codigos, chaves = pd.factorize(df[coluna_chave].astype(np.int64))
+            # Primeira supervisão de cada nó: de onde saem a descrição e o pai
+            primeira = np.unique(codigos, return_index=True)[1]
+            self.codigos[nivel] = codigos.astype(np.int32)
+            self.chaves[nivel] = np.asarray(chaves, dtype=np.int64)
+            self.descricoes[nivel] = df[coluna_desc].astype(str).to_numpy(dtype=object)[primeira]
+            self.pais[nivel] = (self.codigos[anterior][primeira] if anterior
+                               else np.full(len(chaves), -1, dtype=np.int32))
+            self._posicao[nivel] = dict(zip(self.chaves[nivel].tolist(), range(len(chaves))))
+            anterior = nivel
+
+        # As oito colunas de cada supervisão, para o gerador linha a linha
+        self.linhas = list(zip(*(
+            (self.chaves if i % 2 == 0 else self.descricoes)[nivel][self.codigos[nivel]].tolist()
+            for nivel, _, _ in NIVEIS for i in range(2)
+        )))
+
+    def __len__(self):
+        return len(self.chaves['supervisao'])
+
+    @classmethod
+    def de_dict(cls, hierarquia):
+        """A partir do formato aninhado de HIERARQUIA_ORGANIZACIONAL."""
+        registros = []
+        for chave_dir, dados_dir in hierarquia.items():
+            for chave_ger, dados_ger in dados_dir['gerencias'].items():
+                for chave_coord, dados_coord in dados_ger['coordenacoes'].items():
+                    for chave_sup, desc_sup in dados_coord['supervisoes']:
+                        registros.append((int(chave_dir), dados_dir['diretoria'], int(chave_ger), dados_ger['desc'],
+                                          int(chave_coord), dados_coord['desc'], int(chave_sup), desc_sup))
+        return cls(pd.DataFrame(registros, columns=COLUNAS_HIERARQUIA))
+
+    @classmethod
+    def de_csv(cls, caminho):
+        # Separador detectado: o Excel em pt-BR grava com ';'
+        return cls(pd.read_csv(caminho, sep=None, engine='python', encoding='utf-8-sig'))
+
+    @classmethod
+    def de_json(cls, caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        return cls.de_dict(dados) if isinstance(dados, dict) else cls(dados)
+
+    @classmethod
+    def carregar(cls, caminho):
+        """CSV ou JSON, pela extensão."""
+        if Path(caminho).suffix.lower() == '.json':
+            return cls.de_json(caminho)
+        return cls.de_csv(caminho)
+
+    def _nivel(self, nivel):
+        if nivel not in self.chaves:
+            raise ValueError(f"Nível desconhecido: {nivel} (use {', '.join(n for n, _, _ in NIVEIS)})")
+        return [n for n, _, _ in NIVEIS].index(nivel)
+
+    def pai(self, nivel, chave):
+        """Chave do nó pai (None para diretoria)."""
+        i = self._nivel(nivel)
+        if i == 0:
+            return None
+        posicao = self.pais[nivel][self._posicao[nivel][chave]]
+        return int(self.chaves[NIVEIS[i - 1][0]][posicao])
+
+    def descricao(self, nivel, chave):
+        self._nivel(nivel)
+        return self.descricoes[nivel][self._posicao[nivel][chave]]
+
+    def ancestrais(self, chave_supervisao):
+        """Chave de cada nível acima da supervisão, de diretoria a supervisão."""
+        folha = self._posicao['supervisao'][chave_supervisao]
+        return {nivel: int(self.chaves[nivel][self.codigos[nivel][folha]]) for nivel, _, _ in NIVEIS}
+
+    def sortear(self, rng, n, distribuicao=None):
+        """
+        Índice de supervisão para n lojas: a mesma quantidade por supervisão,
+        as sobras sorteadas e tudo embaralhado. Com uma carga.distribuicao
+        enviesada (ex.: Zipf), cada loja é sorteada com os pesos dela.
+        """
+        if distribuicao is not None and not distribuicao.uniforme:
+            return distribuicao.sortear(rng, n, self.chaves['supervisao'])
+        k = len(self)
+        por_supervisao = n // k
+        indices = np.concatenate([
+            np.repeat(np.arange(k), por_supervisao),
+            rng.integers(0, k, n - por_supervisao * k)
+        ])
+        return rng.permutation(indices)
+
+    def colunas(self, indices):
+        """As colunas de hierarquia da TB_ESTR_LOJAS para os índices sorteados."""
+        colunas = {}
+        for nivel, coluna_chave, coluna_desc in NIVEIS:
+            codigos = self.codigos[nivel][indices]
+            descricoes = pd.Categorical(self.descricoes[nivel])
+            colunas[coluna_chave] = self.chaves[nivel][codigos]
+            colunas[coluna_desc] = categorico(descricoes.categories, descricoes.codes[codigos])
+        return colunas
+
+    def combinacoes(self):
+        """Uma entrada por supervisão no formato de carga.lojas.combinacoes_hierarquicas."""
+        campos = [f"{nivel}_{sufixo}" for nivel, _, _ in NIVEIS for sufixo in ('chave', 'desc')]
+        return [dict(zip(campos, linha)) for linha in self.linhas]
+
+    def resumo(self):
+        return ' → '.join(f"{len(self.chaves[nivel])} {nivel}" for nivel, _, _ in NIVEIS)
+
+
+def _conferir(df):
+    """Cada nó tem uma única descrição e um único pai."""
+    for i, (nivel, coluna_chave, coluna_desc) in enumerate(NIVEIS):
+        grupos = df.groupby(coluna_chave)
+        descricoes = grupos[coluna_desc].nunique()
+        if (descricoes > 1).any():
+            chave = descricoes[descricoes > 1].index[0]
+            raise ValueError(f"{nivel} {chave} aparece com mais de uma descrição")
+        if i > 0:
+            coluna_pai = NIVEIS[i - 1][1]
+            pais = grupos[coluna_pai].nunique()
+            if (pais > 1).any():
+                chave = pais[pais > 1].index[0]
+                raise ValueError(f"{nivel} {chave} pertence a mais de um(a) {NIVEIS[i - 1][0]}")
+
+
+def compilar(hierarquia):
+    """Aceita a Hierarquia já compilada ou o dict aninhado."""
+    return hierarquia if isinstance(hierarquia, Hierarquia) else Hierarquia.de_dict(hierarquia)
+
+
+def hierarquia_configurada(padrao):
+    """A hierarquia de CARGA_HIERARQUIA (CSV/JSON), ou `padrao` compilada."""
+    caminho = os.environ.get('CARGA_HIERARQUIA')
+    return Hierarquia.carregar(caminho) if caminho else compilar(padrao)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] != 'info':
+        print("Uso: python -m carga.hierarquia info ARQUIVO")
+        return 1
+    try:
+        arvore = Hierarquia.carregar(argv[1])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"🏢 {argv[1]}: {arvore.resumo()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Virada mensal incremental de TB_ESTR_CONTAS e TB_ESTR_ATIVO.
+
+Em vez de DROP/CREATE, a janela MES_M3..MES_M0 é deslocada em memória, só as
+lojas que mudaram (ou que ainda não existem) vão para uma tabela de staging e
+um único MERGE aplica o delta. A tabela continua online durante toda a carga.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .bulk import carregar_em_lotes, montar_insert
+from .colunas import datas, linhas_do_dataframe
+from .instrumentacao import contar, fase
+from .producao import MESES
+
+# Última movimentação sorteada dentro do mês que acabou de fechar
+DIAS_MES = 30
+
+
+def tabela_existe(conn, tabela):
+    cursor = conn.cursor()
+    cursor.execute("SELECT OBJECT_ID(?, 'U')", (tabela,))
+    existe = cursor.fetchone()[0] is not None
+    cursor.close()
+    return existe
+
+
+def ler_tabela(conn, tabela, colunas):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(colunas)} FROM {tabela}")
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=colunas)
+    cursor.close()
+    return df
+
+
+def _normalizar(df, coluna_data):
+    df = df.copy()
+    df[coluna_data] = pd.to_datetime(df[coluna_data]).to_numpy().astype('datetime64[D]')
+    for mes in MESES:
+        df[mes] = df[mes].astype(np.int64)
+    return df
+
+
+def virar_mes(atual, chaves, coluna_data, maximo_mes, seed=None, hoje=None):
+    """
+    Próximo mês da tabela: MES_M3 ← MES_M2 ← MES_M1 ← MES_M0 e um MES_M0 novo.
+
+    `chaves` é o conjunto de lojas do mês (ex.: TB_ESTR_CONTAS para o ATIVO).
+    Lojas que não estavam em `atual` entram com o histórico zerado. A data da
+    última movimentação só muda para as lojas com produção no novo MES_M0.
+    """
+    rng = np.random.default_rng(seed)
+    hoje = hoje or date.today()
+    atual = _normalizar(atual, coluna_data).set_index('CHAVE_LOJA')
+
+    chaves = pd.Index(np.asarray(chaves, dtype=np.int64), name='CHAVE_LOJA')
+    novo = atual.reindex(chaves)
+    for mes in MESES:
+        novo[mes] = novo[mes].fillna(0).astype(np.int64)
+
+    n = len(novo)
+    for anterior, seguinte in zip(MESES, MESES[1:]):
+        novo[anterior] = novo[seguinte]
+    novo['MES_M0'] = rng.integers(0, maximo_mes + 1, n)
+
+    movimentou = novo['MES_M0'].to_numpy() > 0
+    novas_datas = datas(rng, n, DIAS_MES, hoje)
+    novo[coluna_data] = np.where(movimentou, novas_datas, novo[coluna_data].to_numpy().astype('datetime64[D]'))
+
+    return novo.reset_index()[['CHAVE_LOJA', coluna_data] + MESES]
+
+
+def linhas_alteradas(antes, depois, coluna_data):
+    """Linhas de `depois` que não existem em `antes` ou que têm algum valor diferente."""
+    colunas = list(depois.columns)
+    antes = _normalizar(antes, coluna_data).set_index('CHAVE_LOJA')
+    depois = _normalizar(depois, coluna_data).set_index('CHAVE_LOJA')
+
+    anteriores = antes.reindex(depois.index)
+    mudou = ~depois.index.isin(antes.index)  # loja nova
+    for coluna in depois.columns:
+        diferente = anteriores[coluna].to_numpy() != depois[coluna].to_numpy()
+        # NaT != NaT é True: trata nulo dos dois lados como igual
+        ambos_nulos = pd.isna(anteriores[coluna]).to_numpy() & pd.isna(depois[coluna]).to_numpy()
+        mudou |= diferente & ~ambos_nulos
+
+    return depois[mudou].reset_index()[colunas]
+
+
+def sql_merge(tabela, staging, colunas, chave='CHAVE_LOJA'):
+    atualizacoes = ',\n        '.join(f"alvo.{c} = origem.{c}" for c in colunas if c != chave)
+    lista = ', '.join(colunas)
+    valores = ', '.join(f"origem.{c}" for c in colunas)
+    return f"""
+    MERGE {tabela} WITH (HOLDLOCK) AS alvo
+    USING {staging} AS origem
+        ON alvo.{chave} = origem.{chave}
+    WHEN MATCHED THEN UPDATE SET
+        {atualizacoes}
+    WHEN NOT MATCHED BY TARGET THEN
+        INSERT ({lista}) VALUES ({valores});
+    """
+
+
+def aplicar_upsert(conn, tabela, delta, chave='CHAVE_LOJA', log=print):
+    """
+    Grava `delta` em uma tabela temporária (#STG_<tabela>, mesma estrutura da
+    tabela final) e aplica tudo com um MERGE em uma única transação. Leitores
+    da tabela final só veem o estado anterior ou o novo, nunca o meio da carga.
+    """
+    colunas = list(delta.columns)
+    staging = f"#STG_{tabela}"
+    cursor = conn.cursor()
+
+    cursor.execute(f"IF OBJECT_ID('tempdb..{staging}') IS NOT NULL DROP TABLE {staging};")
+    cursor.execute(f"SELECT TOP 0 {', '.join(colunas)} INTO {staging} FROM {tabela};")
+    conn.commit()
+
+    try:
+        with fase('staging'):
+            resultado = carregar_em_lotes(conn, montar_insert(staging, colunas), linhas_do_dataframe(delta),
+                                          tabela=staging, log=log)
+        with fase('merge'):
+            cursor.execute(sql_merge(tabela, staging, colunas, chave))
+            afetadas = cursor.rowcount
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.execute(f"DROP TABLE {staging};")
+        conn.commit()
+        cursor.close()
+
+    log(f"🔁 MERGE em {tabela}: {afetadas} lojas atualizadas/inseridas a partir de {resultado.inseridos} linhas de staging")
+    return afetadas
+
+
+def virada_incremental(conn, tabela, colunas, chaves, maximo_mes, seed=None, hoje=None, log=print):
+    """
+    Virada mensal completa: lê a tabela, desloca a janela, calcula o delta e
+    aplica via staging + MERGE. Devolve a quantidade de lojas alteradas.
+    """
+    coluna_data = colunas[1]
+    with fase('ler'):
+        atual = ler_tabela(conn, tabela, colunas)
+    with fase('virar_mes'):
+        novo = virar_mes(atual, chaves, coluna_data, maximo_mes, seed=seed, hoje=hoje)
+        delta = linhas_alteradas(atual, novo, coluna_data)
+    contar('lojas_alteradas', len(delta))
+    log(f"📆 {tabela}: janela MES_M3..MES_M0 deslocada; {len(delta)} de {len(novo)} lojas mudaram")
+
+    if delta.empty:
+        return 0
+    return aplicar_upsert(conn, tabela, delta, log=log)
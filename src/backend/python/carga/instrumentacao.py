@@ -0,0 +1,185 @@
+"""
+Instrumentação das cargas: fases cronometradas e contadores por execução.
+
+    @instrumentado('TB_ESTR_CONTAS')
+    def main(...):
+        with fase('conectar'):
+            conn = db.conectar(...)
+        contar('linhas_geradas', 2500)
+
+Fases aninhadas viram caminhos ('carga/inserir') e fases com o mesmo nome são
+somadas: o carregador abre 'gerar', 'inserir' e 'commit' a cada lote. Fora de
+uma carga instrumentada fase() e contar() não fazem nada, então as funções do
+pacote podem ser instrumentadas sem receber parâmetros novos.
+
+No fim da carga o resumo vai para o log e, com CARGA_METRICAS=<arquivo>, uma
+linha JSON é acrescentada ao arquivo. CARGA_PERFIL=cprofile (ou pyinstrument)
+perfila a carga inteira e grava o resultado em CARGA_PERFIL_DIR (padrão: perfis).
+"""
+
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Carga em andamento na thread atual (o orquestrador roda uma carga por thread)
+_atual = contextvars.ContextVar('carga_instrumentada', default=None)
+
+# Fases abertas no contexto atual. Fica fora de Metricas para que lotes
+# processados em outras threads (asyncio.to_thread copia o contexto) herdem o
+# caminho ('carga/inserir') sem embaralhar a pilha uns dos outros.
+_pilha = contextvars.ContextVar('fases_abertas', default=())
+
+# Várias cargas em paralelo acrescentam linhas no mesmo CARGA_METRICAS
+_trava_arquivo = threading.Lock()
+
+
+class Metricas:
+    """Fases e contadores de uma execução de carga."""
+
+    def __init__(self, carga):
+        self.carga = carga
+        self.inicio = datetime.now()
+        self.segundos = 0.0
+        self.fases = {}
+        self.contadores = {}
+        self.erro = None
+        self._trava = threading.Lock()
+
+    @contextmanager
+    def fase(self, nome):
+        pilha = _pilha.get() + (nome,)
+        token = _pilha.set(pilha)
+        caminho = '/'.join(pilha)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            decorrido = time.perf_counter() - inicio
+            _pilha.reset(token)
+            with self._trava:
+                registro = self.fases.setdefault(caminho, {'segundos': 0.0, 'vezes': 0})
+                registro['segundos'] += decorrido
+                registro['vezes'] += 1
+
+    def contar(self, nome, quantidade=1):
+        with self._trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def como_dict(self):
+        return {
+            'carga': self.carga,
+            'inicio': self.inicio.isoformat(timespec='seconds'),
+            'segundos': round(self.segundos, 4),
+            'status': 'falhou' if self.erro else 'ok',
+            'erro': self.erro,
+            'fases': {nome: {'segundos': round(f['segundos'], 4), 'vezes': f['vezes']}
+                      for nome, f in self.fases.items()},
+            'contadores': dict(self.contadores),
+        }
+
+    def resumo(self):
+        fases = ', '.join(f"{nome} {f['segundos']:.2f}s" for nome, f in self.fases.items())
+        return f"{self.carga} em {self.segundos:.2f}s — {fases or 'sem fases'}"
+
+
+def atual():
+    """Métricas da carga em andamento na thread atual (ou None)."""
+    return _atual.get()
+
+
+def fase(nome):
+    """Cronometra um trecho na carga atual; sem carga instrumentada, não faz nada."""
+    metricas = _atual.get()
+    return metricas.fase(nome) if metricas else nullcontext()
+
+
+def contar(nome, quantidade=1):
+    metricas = _atual.get()
+    if metricas:
+        metricas.contar(nome, quantidade)
+
+
+def _iniciar_perfil(log):
+    tipo = os.environ.get('CARGA_PERFIL', '').lower()
+    if not tipo:
+        return None
+    if tipo == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+            perfilador = Profiler()
+            perfilador.start()
+            return perfilador
+        except ImportError:
+            log("⚠️ pyinstrument não está instalado; perfilando com cProfile")
+    perfilador = cProfile.Profile()
+    perfilador.enable()
+    return perfilador
+
+
+def _gravar_perfil(perfilador, carga, log):
+    pasta = os.environ.get('CARGA_PERFIL_DIR', 'perfis')
+    os.makedirs(pasta, exist_ok=True)
+    base = os.path.join(pasta, f"{carga}_{datetime.now():%Y%m%d_%H%M%S}")
+    if isinstance(perfilador, cProfile.Profile):
+        perfilador.disable()
+        caminho = base + '.prof'
+        perfilador.dump_stats(caminho)
+    else:
+        perfilador.stop()
+        caminho = base + '.html'
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(perfilador.output_html())
+    log(f"🔬 Perfil de {carga} gravado em {caminho}")
+
+
+def emitir(metricas, log=print):
+    """Resumo no log e, com CARGA_METRICAS, uma linha JSON no arquivo."""
+    log(f"📊 {metricas.resumo()}")
+    caminho = os.environ.get('CARGA_METRICAS')
+    if not caminho:
+        return
+    linha = json.dumps(metricas.como_dict(), ensure_ascii=False)
+    with _trava_arquivo, open(caminho, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(linha + '\n')
+
+
+@contextmanager
+def medir_carga(carga, log=print):
+    """
+    Ativa a coleta de fases/contadores para `carga` na thread atual e emite as
+    métricas no fim, inclusive quando a carga falha.
+    """
+    metricas = Metricas(carga)
+    token = _atual.set(metricas)
+    token_pilha = _pilha.set(())
+    perfilador = _iniciar_perfil(log)
+    inicio = time.perf_counter()
+    try:
+        yield metricas
+    except Exception as e:
+        metricas.erro = str(e)
+        raise
+    finally:
+        metricas.segundos = time.perf_counter() - inicio
+        if perfilador is not None:
+            _gravar_perfil(perfilador, carga, log)
+        _pilha.reset(token_pilha)
+        _atual.reset(token)
+        emitir(metricas, log)
+
+
+def instrumentado(carga):
+    """Decorador: executa a função dentro de medir_carga(carga)."""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with medir_carga(carga):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
@@ -0,0 +1,310 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .colunas import (
+    DIAS_1_ANO,
+    DIAS_2_MESES,
+    DIAS_3_ANOS,
+    DIAS_3_MESES,
+    DIAS_6_MESES,
+    bits,
+    categorico,
+    coluna_por_indice,
+    datas,
+    escolha,
+    inteiros,
+)
+from .cnpj import cnpjs_por_chave
+from .distribuicao import distribuicoes_configuradas
+from .hierarquia import compilar
+from .pools import TAMANHO_POOL_PADRAO, pools_compartilhados
+from .registro import Esquema
+
+SEGMENTOS = ['Mercado', 'Farmácia', 'Vestuário', 'Padaria', 'Posto']
+STATUS_TABLET_OPCOES = ['RETIRADO', 'S/ TABLET', 'INSTALADO']
+QUADRANTES = ['PRESENÇA', 'PA', 'AGÊNCIA']
+SITUACOES = ['ATIVA', 'BLOQUEADO', 'EM PROCESSO DE ENCERRAMENTO']
+# Códigos de agência de relacionamento (COD_AG_RELACIONAMENTO)
+AGENCIAS = np.arange(1000, 10000)
+
+# Municípios e UFs para diversificar os dados
+MUNICIPIOS_UF = [
+    # São Paulo
+    ('São Paulo', 'SP'), ('Campinas', 'SP'), ('Santos', 'SP'), ('Sorocaba', 'SP'),
+    ('Ribeirão Preto', 'SP'), ('Osasco', 'SP'), ('Santo André', 'SP'), ('São Bernardo do Campo', 'SP'),
+    ('Guarulhos', 'SP'), ('Piracicaba', 'SP'), ('Jundiaí', 'SP'), ('Bauru', 'SP'),
+
+    # Rio de Janeiro
+    ('Rio de Janeiro', 'RJ'), ('Niterói', 'RJ'), ('Nova Iguaçu', 'RJ'), ('Duque de Caxias', 'RJ'),
+    ('Petrópolis', 'RJ'), ('Volta Redonda', 'RJ'), ('Campos dos Goytacazes', 'RJ'), ('Belford Roxo', 'RJ'),
+
+    # Minas Gerais
+    ('Belo Horizonte', 'MG'), ('Uberlândia', 'MG'), ('Contagem', 'MG'), ('Juiz de Fora', 'MG'),
+    ('Betim', 'MG'), ('Montes Claros', 'MG'), ('Uberaba', 'MG'), ('Governador Valadares', 'MG'),
+
+    # Bahia
+    ('Salvador', 'BA'), ('Feira de Santana', 'BA'), ('Vitória da Conquista', 'BA'), ('Camaçari', 'BA'),
+    ('Juazeiro', 'BA'), ('Lauro de Freitas', 'BA'), ('Ilhéus', 'BA'), ('Itabuna', 'BA'),
+
+    # Paraná
+    ('Curitiba', 'PR'), ('Londrina', 'PR'), ('Maringá', 'PR'), ('Ponta Grossa', 'PR'),
+    ('Cascavel', 'PR'), ('São José dos Pinhais', 'PR'), ('Foz do Iguaçu', 'PR'), ('Colombo', 'PR'),
+
+    # Rio Grande do Sul
+    ('Porto Alegre', 'RS'), ('Caxias do Sul', 'RS'), ('Pelotas', 'RS'), ('Canoas', 'RS'),
+    ('Santa Maria', 'RS'), ('Gravataí', 'RS'), ('Viamão', 'RS'), ('Novo Hamburgo', 'RS'),
+
+    # Ceará
+    ('Fortaleza', 'CE'), ('Caucaia', 'CE'), ('Juazeiro do Norte', 'CE'), ('Maracanaú', 'CE'),
+    ('Sobral', 'CE'), ('Crato', 'CE'), ('Itapipoca', 'CE'), ('Maranguape', 'CE'),
+
+    # Pernambuco
+    ('Recife', 'PE'), ('Jaboatão dos Guararapes', 'PE'), ('Olinda', 'PE'), ('Caruaru', 'PE'),
+    ('Petrolina', 'PE'), ('Paulista', 'PE'), ('Cabo de Santo Agostinho', 'PE'), ('Garanhuns', 'PE')
+]
+
+# Estrutura hierárquica organizacional consistente
+HIERARQUIA_ORGANIZACIONAL = {
+    # Diretoria SP INTERIOR
+    10001: {
+        'diretoria': 'SP INTERIOR',
+        'gerencias': {
+            20001: {
+                'desc': 'SAO PAULO',
+                'coordenacoes': {
+                    30001: {
+                        'desc': 'COORD LESTE',
+                        'supervisoes': [
+                            (40001, 'SUP LESTE'),
+                            (40002, 'SUP OESTE')
+                        ]
+                    },
+                    30002: {
+                        'desc': 'COORD OESTE',
+                        'supervisoes': [
+                            (40003, 'SUP SUL')
+                        ]
+                    }
+                }
+            }
+        }
+    },
+    # Diretoria SUL
+    10002: {
+        'diretoria': 'SUL',
+        'gerencias': {
+            20002: {
+                'desc': 'SUL',
+                'coordenacoes': {
+                    30003: {
+                        'desc': 'COORD SUL',
+                        'supervisoes': [
+                            (40004, 'SUP SUL REGIAO')
+                        ]
+                    }
+                }
+            }
+        }
+    },
+    # Diretoria NORDESTE 1
+    10003: {
+        'diretoria': 'NORDESTE 1',
+        'gerencias': {
+            20003: {
+                'desc': 'NORDESTE 1',
+                'coordenacoes': {
+                    30004: {
+                        'desc': 'COORD NORDESTE',
+                        'supervisoes': [
+                            (40005, 'SUP NORDESTE A'),
+                            (40006, 'SUP NORDESTE B')
+                        ]
+                    }
+                }
+            }
+        }
+    }
+}
+
+# Colunas de TB_ESTR_LOJAS, na ordem do CREATE TABLE/INSERT. Daqui saem o DDL,
+# o INSERT, a lista de colunas e o registro usado pelo gerador linha a linha.
+# A chave primária não fica aqui: ela é criada depois da carga, junto com os
+# índices (carga.esquema).
+ESQUEMA_LOJAS = Esquema('TB_ESTR_LOJAS', [
+    ('CHAVE_LOJA', 'INT NOT NULL'),
+    ('CNPJ', 'VARCHAR(18)'),
+    ('NOME_LOJA', 'VARCHAR(255)'),
+    ('DESC_SEGTO', 'VARCHAR(50)'),
+    ('COD_AG_RELACIONAMENTO', 'INT'),
+    ('NR_PACB', 'INT'),
+    ('AG_RELACIONAMENTO', 'VARCHAR(255)'),
+    ('CHAVE_PAA', 'INT'),
+    ('NOME_PAA', 'VARCHAR(255)'),
+    ('DT_ENVIO_VAN', 'DATE'),
+    ('DT_INAUGURACAO', 'DATE'),
+    ('DT_INAUGURACAO_BACEN', 'DATE'),
+    ('DT_ENCERRAMENTO_BACEN', 'DATE'),
+    ('MOTIVO_ENCERRAMENTO', 'VARCHAR(255)'),
+    ('DT_RETIRADA_EQTO', 'DATE'),
+    ('STATUS_TABLET', 'VARCHAR(50)'),
+    ('DT_IMPLANTACAO_TABLET', 'DATE'),
+    ('DT_RETIRADA_TABLET', 'DATE'),
+    ('GTE_RESP_LOJA', 'VARCHAR(255)'),
+    ('TELEFONE_PADRAO', 'VARCHAR(20)'),
+    ('DT_BLOQUEIO', 'DATE'),
+    ('MOTIVO_BLOQUEIO', 'VARCHAR(255)'),
+    ('TIPO_POSTO', 'VARCHAR(50)'),
+    ('BE_AVANCADO', 'BIT'),
+    ('BE_ORG_PAGADOR', 'BIT'),
+    ('BE_PLATAFORMA', 'BIT'),
+    ('ENDERECO', 'VARCHAR(500)'),
+    ('COD_IBGE', 'INT'),
+    ('MUNICIPIO', 'VARCHAR(255)'),
+    ('UF', 'CHAR(2)'),
+    ('QUADRANTE', 'VARCHAR(50)'),
+    ('COD_MULT', 'INT'),
+    ('MULTIPLICADOR', 'VARCHAR(255)'),
+    ('DIRE_REG', 'INT'),
+    ('DIR_REGIONAL', 'VARCHAR(255)'),
+    ('COD_GER_REG', 'INT'),
+    ('GER_REGIONAL', 'VARCHAR(255)'),
+    ('CHAVE_GERENCIA_AREA', 'INT'),
+    ('DESC_GERENCIA_AREA', 'VARCHAR(255)'),
+    ('CHAVE_COORDENACAO', 'INT'),
+    ('DESC_COORDENACAO', 'VARCHAR(255)'),
+    ('CHAVE_SUPERVISAO', 'INT'),
+    ('DESC_SUPERVISAO', 'VARCHAR(255)'),
+    ('COD_ILHA', 'INT'),
+    ('DESC_ILHA', 'VARCHAR(255)'),
+    ('NOME_ILHA', 'VARCHAR(255)'),
+    ('CHAVE_GERENCIA_NEGOCIO', 'INT'),
+    ('DESC_GERENCIA_NEGOCIO', 'VARCHAR(255)'),
+    ('SITUACAO', 'VARCHAR(50)'),
+    ('DT_ULT_TRANSACAO', 'DATE'),
+    ('HABILITADO_CONTA', 'BIT'),
+    ('HABILITADO_MICRO', 'BIT'),
+    ('HABILITADO_LIME', 'BIT'),
+    ('HABILITADO_CONSIG', 'BIT'),
+    ('SALDO_CX', 'DECIMAL(15,2)'),
+    ('LIMITE', 'DECIMAL(15,2)'),
+])
+
+COLUNAS_LOJAS = ESQUEMA_LOJAS.colunas
+DDL_COLUNAS_LOJAS = ESQUEMA_LOJAS.ddl_colunas()
+RegistroLoja = ESQUEMA_LOJAS.registro
+
+
+def combinacoes_hierarquicas(hierarquia=None):
+    """Achata a hierarquia (diretoria → gerência → coordenação → supervisão) em uma lista de dicts."""
+    return compilar(hierarquia or HIERARQUIA_ORGANIZACIONAL).combinacoes()
+
+
+def gerar_lojas_colunar(chaves_loja, seed=42, hierarquia=None, pools=None, hoje=None,
+                        locale='pt_BR', tamanho_pool=TAMANHO_POOL_PADRAO, seed_pools=None,
+                        distribuicoes=None):
+    """
+    Gera o conteúdo de TB_ESTR_LOJAS coluna a coluna, com NumPy.
+
+    Mesmas distribuições do laço original de estr_lojas.py (nulos em 10%,
+    40%, 60%, 80%... das linhas), mas cada coluna é sorteada de uma vez e os
+    textos do Faker vêm de pools pré-gerados (colunas Categorical, que
+    guardam só um código por linha). Retorna um DataFrame com as colunas na
+    ordem de COLUNAS_LOJAS. `hierarquia` é o dict aninhado ou uma
+    carga.hierarquia.Hierarquia já compilada (ex.: lida de um CSV).
+    `distribuicoes` (dimensão → carga.distribuicao.Distribuicao) enviesa
+    supervisão, agência e situação; ausente, vem de CARGA_DISTRIBUICAO.
+    """
+    chaves = np.asarray(chaves_loja, dtype=np.int64)
+    n = len(chaves)
+    rng = np.random.default_rng(seed)
+    hoje = hoje or date.today()
+
+    if pools is None:
+        pools = pools_compartilhados(seed if seed_pools is None else seed_pools, locale, tamanho_pool)
+
+    def texto(nome, mascara=None):
+        return pools.sortear(rng, nome, n, mascara)
+
+    distribuicoes = distribuicoes or distribuicoes_configuradas()
+
+    # Hierarquia: mesma quantidade de lojas por supervisão, sobras sorteadas, tudo embaralhado
+    # (ou pelos pesos da distribuição do supervisor, se enviesada)
+    arvore = compilar(hierarquia or HIERARQUIA_ORGANIZACIONAL)
+    hier = arvore.colunas(arvore.sortear(rng, n, distribuicoes['supervisor']))
+
+    indices_municipio = rng.integers(0, len(MUNICIPIOS_UF), n)
+
+    tem_encerramento = rng.random(n) < 0.1
+    tem_bloqueio = rng.random(n) < 0.1
+    chave_paa = inteiros(rng, n, 1000, 9999, prob=0.6)
+    cod_mult = inteiros(rng, n, 1, 999, prob=0.6)
+    tem_ilha = rng.random(n) < 0.4
+    chave_ger_neg = inteiros(rng, n, 10000, 99999, prob=0.4)
+    tem_ult_transacao = rng.random(n) < 0.8
+
+    saldo = np.round(rng.uniform(-1000, 10000, n), 2)
+    limite = np.round(rng.uniform(-5000, 20000, n), 2)
+
+    colunas = {
+        'CHAVE_LOJA': chaves,
+        # Um CNPJ válido e distinto por CHAVE_LOJA, igual em qualquer shard
+        'CNPJ': cnpjs_por_chave(chaves, mascarado=True),
+        'NOME_LOJA': texto('company'),
+        'DESC_SEGTO': escolha(rng, SEGMENTOS, n),
+        'COD_AG_RELACIONAMENTO': AGENCIAS[distribuicoes['agencia'].sortear(rng, n, AGENCIAS)],
+        'NR_PACB': inteiros(rng, n, 1, 999, prob=0.7),
+        'AG_RELACIONAMENTO': texto('city'),
+        'CHAVE_PAA': chave_paa,
+        'NOME_PAA': texto('name', ~chave_paa.isna()),
+        'DT_ENVIO_VAN': datas(rng, n, DIAS_3_ANOS, hoje),
+        'DT_INAUGURACAO': datas(rng, n, DIAS_3_ANOS, hoje),
+        'DT_INAUGURACAO_BACEN': datas(rng, n, DIAS_3_ANOS, hoje, tem_encerramento),
+        'DT_ENCERRAMENTO_BACEN': datas(rng, n, DIAS_6_MESES, hoje, tem_encerramento),
+        'MOTIVO_ENCERRAMENTO': texto('sentence4', tem_encerramento),
+        'DT_RETIRADA_EQTO': datas(rng, n, DIAS_1_ANO, hoje),
+        'STATUS_TABLET': escolha(rng, STATUS_TABLET_OPCOES, n),
+        'DT_IMPLANTACAO_TABLET': datas(rng, n, DIAS_3_ANOS, hoje),
+        'DT_RETIRADA_TABLET': datas(rng, n, DIAS_1_ANO, hoje),
+        'GTE_RESP_LOJA': texto('name'),
+        'TELEFONE_PADRAO': texto('phone_number'),
+        'DT_BLOQUEIO': datas(rng, n, DIAS_3_MESES, hoje, tem_bloqueio),
+        'MOTIVO_BLOQUEIO': texto('sentence5', tem_bloqueio),
+        'TIPO_POSTO': categorico(['TRADICIONAL'], np.zeros(n, dtype=np.int8)),
+        'BE_AVANCADO': bits(rng, n, 0.5),
+        'BE_ORG_PAGADOR': bits(rng, n, 0.5),
+        'BE_PLATAFORMA': bits(rng, n, 0.5),
+        'ENDERECO': texto('address'),
+        'COD_IBGE': np.full(n, 4100707, dtype=np.int64),
+        'MUNICIPIO': coluna_por_indice([m for m, _ in MUNICIPIOS_UF], indices_municipio),
+        'UF': coluna_por_indice([uf for _, uf in MUNICIPIOS_UF], indices_municipio),
+        'QUADRANTE': escolha(rng, QUADRANTES, n),
+        'COD_MULT': cod_mult,
+        'MULTIPLICADOR': texto('name'),
+        'DIRE_REG': hier['DIRE_REG'],
+        'DIR_REGIONAL': hier['DIR_REGIONAL'],
+        'COD_GER_REG': rng.integers(1000, 10000, n),
+        'GER_REGIONAL': texto('city'),
+        'CHAVE_GERENCIA_AREA': hier['CHAVE_GERENCIA_AREA'],
+        'DESC_GERENCIA_AREA': hier['DESC_GERENCIA_AREA'],
+        'CHAVE_COORDENACAO': hier['CHAVE_COORDENACAO'],
+        'DESC_COORDENACAO': hier['DESC_COORDENACAO'],
+        'CHAVE_SUPERVISAO': hier['CHAVE_SUPERVISAO'],
+        'DESC_SUPERVISAO': hier['DESC_SUPERVISAO'],
+        'COD_ILHA': inteiros(rng, n, 10000, 99999, prob=0.6),
+        'DESC_ILHA': texto('word', tem_ilha),
+        'NOME_ILHA': texto('name', tem_ilha),
+        'CHAVE_GERENCIA_NEGOCIO': chave_ger_neg,
+        'DESC_GERENCIA_NEGOCIO': texto('name', ~chave_ger_neg.isna()),
+        'SITUACAO': categorico(SITUACOES, distribuicoes['situacao'].sortear(rng, n, SITUACOES)),
+        'DT_ULT_TRANSACAO': datas(rng, n, DIAS_2_MESES, hoje, tem_ult_transacao),
+        'HABILITADO_CONTA': bits(rng, n, 0.8),
+        'HABILITADO_MICRO': bits(rng, n, 0.6),
+        'HABILITADO_LIME': bits(rng, n, 0.7),
+        'HABILITADO_CONSIG': bits(rng, n, 0.5),
+        'SALDO_CX': np.where(rng.random(n) < 0.9, saldo, np.nan),
+        'LIMITE': np.where(rng.random(n) < 0.9, limite, np.nan),
+    }
+
+    return pd.DataFrame(colunas, columns=COLUNAS_LOJAS)
@@ -0,0 +1,399 @@
+"""
+Orquestrador das cargas: modela as tabelas como um DAG e executa em paralelo.
+
+Uso (a partir de src/backend/python):
+    python -m carga                                  # ambiente completo
+    python -m carga --only TB_ESTR_ATIVO --com-dependencias
+    python -m carga --rows 100000 --rows HOTLIST=500 --workers 4
+    python -m carga --processos 8                    # cada tabela gerada em 8 processos (carga.shards)
+    python -m carga --de-arquivos .cache/dados       # dados exportados por carga.arquivos
+    python -m carga --escala SF10                    # todas as tabelas no fator de escala 10
+    python -m carga --distribuicao zipf:1.2          # linhas por supervisor/agência/situação enviesadas
+    python -m carga --only TB_ESTR_LOJAS --retomar   # continua uma carga interrompida do último checkpoint
+    python -m carga --latencia-alvo 250 --max-linhas-s 20000   # lotes no ritmo do banco em horário comercial
+"""
+
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from .assincrono import concorrencia_padrao
+
+# src/backend/python (scripts estr_*) e os scripts que ficam fora dela
+PASTA_SCRIPTS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PASTA_BACKEND = os.path.dirname(PASTA_SCRIPTS)
+PASTA_HOTLIST = os.path.abspath(os.path.join(PASTA_BACKEND, '..', 'sql', 'hotlist'))
+
+# Tabelas em paralelo, uma thread cada; o pool de cada banco é dimensionado para
+# elas (mais as partições de CARGA_CONCORRENCIA) em dimensionar_pool
+WORKERS_PADRAO = 4
+
+
+@dataclass
+class Etapa:
+    nome: str
+    executar: object                # executar(linhas, opcoes) → carrega a tabela
+    depende_de: tuple = ()
+    usa_linhas: bool = True         # False: a quantidade vem da tabela de origem
+
+
+@dataclass
+class ResultadoEtapa:
+    nome: str
+    status: str                     # 'ok', 'falhou' ou 'pulada'
+    segundos: float = 0.0
+    erro: str = ''
+
+
+@dataclass
+class ResultadoOrquestracao:
+    etapas: dict = field(default_factory=dict)
+    segundos: float = 0.0
+
+    @property
+    def sucesso(self):
+        return all(r.status == 'ok' for r in self.etapas.values())
+
+
+# Scripts que ficam fora de src/backend/python
+SCRIPTS_EXTERNOS = {
+    'hotlist': os.path.join(PASTA_HOTLIST, 'hotlist.py'),
+    'oportunidades_contas': os.path.join(PASTA_BACKEND, 'oportunidades_contas.py'),
+}
+
+
+def importar_script(nome):
+    """Importa um script de carga pelo nome do arquivo (sem .py), esteja onde estiver."""
+    if nome in sys.modules:
+        return sys.modules[nome]
+    if nome not in SCRIPTS_EXTERNOS:
+        if PASTA_SCRIPTS not in sys.path:
+            sys.path.insert(0, PASTA_SCRIPTS)
+        return importlib.import_module(nome)
+
+    spec = importlib.util.spec_from_file_location(nome, SCRIPTS_EXTERNOS[nome])
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def _contas(linhas, opcoes):
+    importar_script('estr_contas').main(linhas, incremental=opcoes.get('incremental'), arquivos=opcoes.get('arquivos'))
+
+
+def _lojas(linhas, opcoes):
+    importar_script('estr_lojas').main(colunar=opcoes.get('colunar'), arquivos=opcoes.get('arquivos'))
+
+
+def _ativo(linhas, opcoes):
+    importar_script('estr_ativo').main(incremental=opcoes.get('incremental'), arquivos=opcoes.get('arquivos'))
+
+
+def _municipios(linhas, opcoes):
+    importar_script('estr_municipios_prioratrios').carregar_municipios(linhas, arquivos=opcoes.get('arquivos'))
+
+
+def _tratativas(linhas, opcoes):
+    importar_script('estr_municipios_prioratrios').carregar_tratativas(linhas, arquivos=opcoes.get('arquivos'))
+
+
+def _hotlist(linhas, opcoes):
+    importar_script('hotlist').main(linhas, arquivos=opcoes.get('arquivos'))
+
+
+def _oportunidades(linhas, opcoes):
+    importar_script('oportunidades_contas').main(linhas, arquivos=opcoes.get('arquivos'))
+
+
+# TB_ESTR_LOJAS e TB_ESTR_ATIVO leem CHAVE_LOJA de TB_ESTR_CONTAS; as tratativas
+# sorteiam municípios já gravados em MUNICIPIOS_PRIORITARIOS.
+ETAPAS = [
+    Etapa('TB_ESTR_CONTAS', _contas),
+    Etapa('TB_ESTR_LOJAS', _lojas, depende_de=('TB_ESTR_CONTAS',), usa_linhas=False),
+    Etapa('TB_ESTR_ATIVO', _ativo, depende_de=('TB_ESTR_CONTAS',), usa_linhas=False),
+    Etapa('MUNICIPIOS_PRIORITARIOS', _municipios),
+    Etapa('MUNICIPIOS_PRIORITARIOS_TRATATIVAS', _tratativas, depende_de=('MUNICIPIOS_PRIORITARIOS',)),
+    Etapa('HOTLIST', _hotlist),
+    Etapa('OPORTUNIDADES_CONTAS', _oportunidades),
+]
+
+
+def etapas_por_nome(etapas=None):
+    return {etapa.nome: etapa for etapa in (etapas or ETAPAS)}
+
+
+def selecionar(etapas, somente=None, com_dependencias=False):
+    """
+    Filtra o DAG para `somente`. Com `com_dependencias`, inclui também tudo de que
+    essas tabelas dependem; sem ele, as dependências já devem estar no banco.
+    """
+    if not somente:
+        return list(etapas)
+
+    por_nome = etapas_por_nome(etapas)
+    desconhecidas = [nome for nome in somente if nome not in por_nome]
+    if desconhecidas:
+        raise ValueError(f"Tabelas desconhecidas: {', '.join(desconhecidas)}")
+
+    escolhidas = set(somente)
+    if com_dependencias:
+        pendentes = list(somente)
+        while pendentes:
+            for dependencia in por_nome[pendentes.pop()].depende_de:
+                if dependencia not in escolhidas:
+                    escolhidas.add(dependencia)
+                    pendentes.append(dependencia)
+
+    selecionadas = []
+    for etapa in etapas:
+        if etapa.nome in escolhidas:
+            # Dependências fora da seleção são consideradas prontas
+            selecionadas.append(Etapa(etapa.nome, etapa.executar,
+                                      tuple(d for d in etapa.depende_de if d in escolhidas),
+                                      etapa.usa_linhas))
+    return selecionadas
+
+
+def _validar_dag(etapas):
+    por_nome = etapas_por_nome(etapas)
+    visitando, visitadas = set(), set()
+
+    def visitar(nome):
+        if nome in visitadas:
+            return
+        if nome in visitando:
+            raise ValueError(f"Ciclo de dependências envolvendo {nome}")
+        visitando.add(nome)
+        for dependencia in por_nome[nome].depende_de:
+            if dependencia not in por_nome:
+                raise ValueError(f"{nome} depende de {dependencia}, que não está no DAG")
+            visitar(dependencia)
+        visitando.discard(nome)
+        visitadas.add(nome)
+
+    for nome in por_nome:
+        visitar(nome)
+
+
+def executar_dag(etapas, workers=WORKERS_PADRAO, linhas=None, opcoes=None, log=print):
+    """
+    Executa as etapas em um ThreadPoolExecutor: cada etapa começa assim que todas
+    as suas dependências terminam. Se uma etapa falha, as que dependem dela são
+    puladas e as independentes continuam.
+
+    `linhas` é um dict tabela → quantidade (ausente: padrão do script).
+    """
+    _validar_dag(etapas)
+    linhas = linhas or {}
+    opcoes = opcoes or {}
+    por_nome = etapas_por_nome(etapas)
+    resultado = ResultadoOrquestracao()
+    inicio_total = time.perf_counter()
+
+    def rodar(etapa):
+        inicio = time.perf_counter()
+        etapa.executar(linhas.get(etapa.nome), opcoes)
+        return time.perf_counter() - inicio
+
+    pendentes = {etapa.nome for etapa in etapas}
+    em_execucao = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pendentes or em_execucao:
+            for nome in sorted(pendentes):
+                dependencias = por_nome[nome].depende_de
+                falhas = [d for d in dependencias
+                          if d in resultado.etapas and resultado.etapas[d].status != 'ok']
+                if falhas:
+                    pendentes.discard(nome)
+                    resultado.etapas[nome] = ResultadoEtapa(nome, 'pulada', erro=f"dependência {falhas[0]} não concluída")
+                    log(f"⏭️ {nome} pulada: {falhas[0]} não foi concluída")
+                elif all(d in resultado.etapas for d in dependencias):
+                    pendentes.discard(nome)
+                    log(f"🚀 Iniciando {nome}")
+                    em_execucao[executor.submit(rodar, por_nome[nome])] = nome
+
+            if not em_execucao:
+                continue
+
+            prontas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in prontas:
+                nome = em_execucao.pop(futuro)
+                try:
+                    segundos = futuro.result()
+                    resultado.etapas[nome] = ResultadoEtapa(nome, 'ok', segundos)
+                    log(f"🏁 {nome} concluída em {segundos:.1f}s")
+                except Exception as e:
+                    resultado.etapas[nome] = ResultadoEtapa(nome, 'falhou', erro=str(e))
+                    log(f"❌ {nome} falhou: {e}")
+
+    resultado.segundos = time.perf_counter() - inicio_total
+    return resultado
+
+
+def _interpretar_linhas(valores, etapas):
+    """--rows 1000 vale para todas as tabelas; --rows TABELA=1000 só para uma."""
+    por_nome = etapas_por_nome(etapas)
+    geral, especificas = None, {}
+    for valor in valores or []:
+        if '=' in valor:
+            tabela, quantidade = valor.split('=', 1)
+            tabela = tabela.strip().upper()
+            if tabela not in por_nome:
+                raise ValueError(f"--rows: tabela desconhecida {tabela}")
+            especificas[tabela] = int(quantidade)
+        else:
+            geral = int(valor)
+
+    linhas = {}
+    for etapa in etapas:
+        if not etapa.usa_linhas:
+            continue
+        if etapa.nome in especificas:
+            linhas[etapa.nome] = especificas[etapa.nome]
+        elif geral is not None:
+            linhas[etapa.nome] = geral
+    return linhas
+
+
+def dimensionar_pool(workers):
+    """
+    Conexões por banco para `workers` tabelas em paralelo: uma por tabela, mais
+    uma por partição da carga particionada de TB_ESTR_LOJAS (CARGA_CONCORRENCIA),
+    que roda ao lado das outras. Sem isso, 4 workers e CARGA_CONCORRENCIA=4 com o
+    DB_POOL_TAMANHO padrão (4) esgotam o pool do DW (PoolEsgotado).
+    """
+    # O pacote db fica ao lado dos scripts, como os que o usam
+    db = importar_script('db')
+    concorrencia = concorrencia_padrao()
+    db.dimensionar_pools(workers + (concorrencia if concorrencia > 1 else 0))
+    return db.config().pool_tamanho
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m carga',
+                                     description="Recria as tabelas fictícias respeitando as dependências entre elas.")
+    parser.add_argument('--only', nargs='+', metavar='TABELA',
+                        help="Só estas tabelas (aceita também lista separada por vírgula)")
+    parser.add_argument('--com-dependencias', action='store_true',
+                        help="Com --only, recria também as tabelas de que elas dependem")
+    parser.add_argument('--rows', action='append', metavar='N|TABELA=N',
+                        help="Quantidade de linhas (geral ou por tabela; pode repetir)")
+    parser.add_argument('--escala', metavar='SF',
+                        help="Fator de escala (SF1, SF10, SF100) que dimensiona todas as tabelas; --rows tem prioridade")
+    parser.add_argument('--distribuicao', action='append', metavar='ESPEC|DIMENSAO=ESPEC',
+                        help="Distribuição das linhas por supervisor, agência e situação (uniforme, zipf:S, "
+                             "pesos:A,B,... ou CSV/JSON); pode repetir")
+    parser.add_argument('--workers', type=int, default=WORKERS_PADRAO,
+                        help=f"Tabelas carregadas ao mesmo tempo (padrão: {WORKERS_PADRAO})")
+    parser.add_argument('--processos', type=int, metavar='N',
+                        help="Processos que geram as linhas de cada tabela, em blocos entregues ao carregador "
+                             "(CARGA_PROCESSOS; a saída é a mesma com qualquer N)")
+    parser.add_argument('--colunar', action='store_true', help="Gera TB_ESTR_LOJAS em modo vetorizado")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Vira o mês de TB_ESTR_CONTAS/TB_ESTR_ATIVO via staging + MERGE, sem DROP")
+    parser.add_argument('--de-arquivos', metavar='PASTA',
+                        help="Carrega os Parquet/Arrow exportados por carga.arquivos em vez de gerar")
+    parser.add_argument('--estrategia', choices=['executemany', 'bcp', 'bulk_insert'],
+                        help="Como TB_ESTR_LOJAS/CONTAS/ATIVO são carregadas (padrão: CARGA_ESTRATEGIA ou executemany)")
+    parser.add_argument('--assincrono', action='store_true',
+                        help="Gera o próximo lote enquanto o anterior está no banco (CARGA_ASSINCRONO=1)")
+    parser.add_argument('--hierarquia', metavar='ARQUIVO',
+                        help="CSV/JSON com a hierarquia (uma linha por supervisão) usada em TB_ESTR_LOJAS")
+    parser.add_argument('--conferir-servidor', action='store_true',
+                        help="Além da validação em memória, confere TB_ESTR_LOJAS no servidor (GROUPING SETS)")
+    parser.add_argument('--retomar', action='store_true',
+                        help="Continua a carga interrompida de TB_ESTR_LOJAS do último lote confirmado (CARGA_RETOMAR=1)")
+    parser.add_argument('--criar-usuarios', action='store_true',
+                        help="Cadastra em TESTE..users os supervisores gerados pela escala, sem senha utilizável (CARGA_CRIAR_USUARIOS=1)")
+    parser.add_argument('--latencia-alvo', type=float, metavar='MS',
+                        help="Ajusta lote e pausas para cada lote levar até MS milissegundos (CARGA_LATENCIA_ALVO)")
+    parser.add_argument('--max-linhas-s', type=float, metavar='N',
+                        help="Teto de linhas por segundo de cada carga (CARGA_MAX_LINHAS_S)")
+    parser.add_argument('--listar', action='store_true', help="Mostra o DAG e sai")
+    args = parser.parse_args(argv)
+
+    somente = None
+    if args.only:
+        somente = [nome.strip().upper() for valor in args.only for nome in valor.split(',') if nome.strip()]
+
+    try:
+        for opcao, valor in (('--latencia-alvo', args.latencia_alvo), ('--max-linhas-s', args.max_linhas_s),
+                             ('--processos', args.processos)):
+            if valor is not None and valor <= 0:
+                raise ValueError(f"{opcao} deve ser maior que zero")
+        etapas = selecionar(ETAPAS, somente, args.com_dependencias)
+        linhas = _interpretar_linhas(args.rows, etapas)
+        fator_escala = None
+        if args.escala:
+            # Importado só aqui: carga.escala traz NumPy/pandas
+            from .escala import fator, resumo
+            fator_escala = fator(args.escala)
+        if args.distribuicao:
+            # Lida por carga.distribuicao.distribuicao_configurada nos geradores
+            from .distribuicao import configurar
+            configurar(args.distribuicao)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.listar:
+        for etapa in etapas:
+            dependencias = ', '.join(etapa.depende_de) or '-'
+            print(f"   📋 {etapa.nome} ← {dependencias}")
+        return 0
+
+    if args.processos:
+        # Lida por carga.shards.processos_de_geracao nos scripts
+        os.environ['CARGA_PROCESSOS'] = str(args.processos)
+    if args.estrategia:
+        # Lida por carga.bcp.estrategia_de_carga em cada script
+        os.environ['CARGA_ESTRATEGIA'] = args.estrategia
+    if args.assincrono:
+        # Lida por carga.bulk.carregar_em_lotes
+        os.environ['CARGA_ASSINCRONO'] = '1'
+    if fator_escala:
+        # Lida por carga.escala.linhas_padrao em cada script (quando --rows não define a tabela)
+        os.environ['CARGA_ESCALA'] = str(fator_escala)
+        print(f"📐 Escala SF{fator_escala}: {resumo(fator_escala)}")
+    if 'TB_ESTR_CONTAS' in linhas:
+        # Lida por carga.escala.total_de_lojas: se TB_ESTR_CONTAS não puder ser lida,
+        # HOTLIST/OPORTUNIDADES_CONTAS sorteiam entre as lojas desta carga, não as da escala
+        os.environ['CARGA_TOTAL_LOJAS'] = str(linhas['TB_ESTR_CONTAS'])
+    if args.hierarquia:
+        # Lida por carga.hierarquia.hierarquia_configurada no estr_lojas.py
+        os.environ['CARGA_HIERARQUIA'] = args.hierarquia
+    if args.retomar:
+        # Lida por carga.retomada.modo_retomada no estr_lojas.py
+        os.environ['CARGA_RETOMAR'] = '1'
+    if args.criar_usuarios:
+        # Lida por carga.usuarios.usuarios_da_carga em HOTLIST, OPORTUNIDADES_CONTAS e nas tratativas
+        os.environ['CARGA_CRIAR_USUARIOS'] = '1'
+    if args.latencia_alvo:
+        # Lidas por carga.ritmo.ritmo_configurado no CarregadorEmLote
+        os.environ['CARGA_LATENCIA_ALVO'] = str(args.latencia_alvo)
+    if args.max_linhas_s:
+        os.environ['CARGA_MAX_LINHAS_S'] = str(args.max_linhas_s)
+    if args.conferir_servidor:
+        # Lida por carga.validacao.conferencia_no_servidor no estr_lojas.py
+        os.environ['CARGA_CONFERIR_SERVIDOR'] = '1'
+
+    conexoes = dimensionar_pool(args.workers)
+
+    print(f"🗂️ {len(etapas)} tabelas, até {args.workers} em paralelo ({conexoes} conexões por banco)")
+    opcoes = {'colunar': args.colunar, 'incremental': args.incremental, 'arquivos': args.de_arquivos}
+    resultado = executar_dag(etapas, workers=args.workers, linhas=linhas, opcoes=opcoes)
+
+    print("\n📊 Resumo da orquestração:")
+    for etapa in etapas:
+        r = resultado.etapas[etapa.nome]
+        icone = {'ok': '✅', 'falhou': '❌', 'pulada': '⏭️'}[r.status]
+        detalhe = f"{r.segundos:.1f}s" if r.status == 'ok' else r.erro
+        print(f"   {icone} {etapa.nome}: {detalhe}")
+    print(f"⏱️ Total: {resultado.segundos:.1f}s")
+    return 0 if resultado.sucesso else 1
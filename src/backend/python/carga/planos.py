@@ -0,0 +1,194 @@
+"""
+Compara plano e tempo das consultas de /estrategia-comercial com e sem os
+índices de carga.esquema, no banco configurado em DB_DATABASE_DW.
+
+Uso (a partir de src/backend/python):
+    python -m carga.planos                         # perfil supervisor
+    python -m carga.planos --perfil admin --repeticoes 10
+
+"Sem índice" é a mesma consulta com TB_ESTR_LOJAS lida pelo índice
+clusterizado (WITH (INDEX(0))) e sem columnstore
+(IGNORE_NONCLUSTERED_COLUMNSTORE_INDEX), então nada precisa ser dropado.
+"""
+
+import argparse
+import re
+import statistics
+import time
+
+import db
+
+# Colunas lidas pela listagem de lojas (router.post('/lojas'))
+_COLUNAS_LISTAGEM = """
+    l.CHAVE_LOJA, l.NOME_LOJA, l.CNPJ, l.SITUACAO, l.ENDERECO, l.TELEFONE_PADRAO, l.GTE_RESP_LOJA,
+    l.DT_INAUGURACAO, l.STATUS_TABLET, l.HABILITADO_CONTA, l.HABILITADO_MICRO, l.HABILITADO_LIME,
+    l.HABILITADO_CONSIG, l.DT_ULT_TRANSACAO, l.CHAVE_GERENCIA_AREA, l.DESC_GERENCIA_AREA,
+    l.CHAVE_COORDENACAO, l.DESC_COORDENACAO, l.CHAVE_SUPERVISAO, l.DESC_SUPERVISAO,
+    l.DIR_REGIONAL, l.GER_REGIONAL, l.AG_RELACIONAMENTO, l.COD_AG_RELACIONAMENTO
+"""
+
+_METRICAS = """
+    SUM(ISNULL({a}.MES_M0, 0)) as TOTAL_MES_ATUAL,
+    SUM(ISNULL({a}.MES_M1, 0)) as TOTAL_MES_ANTERIOR,
+    COUNT(*) as LOJAS_NA_ESTRATEGIA,
+    SUM(CASE WHEN ISNULL({a}.MES_M0, 0) > 0 THEN 1 ELSE 0 END) as LOJAS_C_PRODUCAO_M0,
+    SUM(CASE WHEN ISNULL({a}.MES_M1, 0) > 0 AND ISNULL({a}.MES_M0, 0) = 0 THEN 1 ELSE 0 END) as LOJAS_QUE_ZERARAM,
+    SUM(CASE WHEN ISNULL({a}.MES_M0, 0) = 0 THEN 1 ELSE 0 END) as LOJAS_SEM_MOVIMENTO
+"""
+
+# Mesmas formas de consulta de routes/estrategiaComercial.js. {filtro} é o
+# getHierarchyFilter, {dica} a dica de tabela em TB_ESTR_LOJAS e {opcao} o OPTION.
+CONSULTAS = {
+    'lojas': f"""
+        SELECT {_COLUNAS_LISTAGEM}
+        FROM TB_ESTR_LOJAS l {{dica}}
+        {{filtro}}
+        ORDER BY l.NOME_LOJA
+        {{opcao}}""",
+    'abertura-conta': """
+        SELECT l.CHAVE_LOJA, l.NOME_LOJA, l.SITUACAO, l.DESC_SUPERVISAO, l.MUNICIPIO, l.UF,
+               ISNULL(c.MES_M3, 0) as MES_M3, ISNULL(c.MES_M2, 0) as MES_M2,
+               ISNULL(c.MES_M1, 0) as MES_M1, ISNULL(c.MES_M0, 0) as MES_M0
+        FROM TB_ESTR_CONTAS c
+        LEFT JOIN TB_ESTR_LOJAS l {dica} ON l.CHAVE_LOJA = c.CHAVE_LOJA
+        {filtro}
+        ORDER BY l.NOME_LOJA
+        {opcao}""",
+    'pontos-realizando-negocio': """
+        SELECT l.CHAVE_LOJA, l.NOME_LOJA, l.SITUACAO, l.DT_ULT_TRANSACAO, l.SALDO_CX, l.LIMITE
+        FROM TB_ESTR_LOJAS l {dica}
+        {filtro}
+        AND l.DT_ULT_TRANSACAO >= DATEADD(month, -3, GETDATE())
+        ORDER BY l.DT_ULT_TRANSACAO DESC
+        {opcao}""",
+    'pontos-bloqueados': """
+        SELECT l.CHAVE_LOJA, l.NOME_LOJA, l.SITUACAO, l.DT_BLOQUEIO, l.MOTIVO_BLOQUEIO
+        FROM TB_ESTR_LOJAS l {dica}
+        {filtro}
+        AND l.SITUACAO = 'BLOQUEADO'
+        ORDER BY l.DT_BLOQUEIO DESC
+        {opcao}""",
+    'metricas-contas': f"""
+        SELECT {_METRICAS.format(a='c')}
+        FROM TB_ESTR_CONTAS c
+        LEFT JOIN TB_ESTR_LOJAS l {{dica}} ON l.CHAVE_LOJA = c.CHAVE_LOJA
+        {{filtro}}
+        {{opcao}}""",
+    'metricas-ativo': f"""
+        SELECT {_METRICAS.format(a='a')}
+        FROM TB_ESTR_ATIVO a
+        LEFT JOIN TB_ESTR_LOJAS l {{dica}} ON l.CHAVE_LOJA = a.CHAVE_LOJA
+        {{filtro}}
+        {{opcao}}""",
+}
+
+# Coluna de hierarquia de cada perfil (getHierarchyFilter)
+COLUNA_POR_PERFIL = {
+    'gerente': 'CHAVE_GERENCIA_AREA',
+    'coordenador': 'CHAVE_COORDENACAO',
+    'supervisor': 'CHAVE_SUPERVISAO',
+}
+
+
+def filtro_hierarquia(perfil, chave):
+    if perfil == 'admin':
+        # O backend devolve '' e as consultas com AND quebram; aqui fica sempre válido
+        return 'WHERE 1=1'
+    return f"WHERE l.{COLUNA_POR_PERFIL[perfil]} = {int(chave)}"
+
+
+def montar_consulta(nome, filtro, com_indices):
+    return CONSULTAS[nome].format(
+        filtro=filtro,
+        dica='' if com_indices else 'WITH (INDEX(0))',
+        opcao='' if com_indices else 'OPTION (IGNORE_NONCLUSTERED_COLUMNSTORE_INDEX)',
+    )
+
+
+def operadores_do_plano(linhas_plano):
+    """Resumo do SHOWPLAN_TEXT: operadores físicos e índices usados, sem repetição."""
+    operadores = []
+    for linha in linhas_plano:
+        operador = re.search(r'\|--([A-Za-z ]+?)\(', linha) or re.match(r'\s*([A-Za-z ]+?)\(', linha)
+        if not operador:
+            continue
+        indice = re.search(r'\.\[((?:IX|CS|PK)_?\w*)\]', linha)
+        descricao = operador.group(1).strip() + (f"[{indice.group(1)}]" if indice else '')
+        if descricao not in operadores:
+            operadores.append(descricao)
+    return operadores
+
+
+def plano(conn, sql):
+    cursor = conn.cursor()
+    cursor.execute("SET SHOWPLAN_TEXT ON")
+    try:
+        cursor.execute(sql)
+        linhas = []
+        while True:
+            if cursor.description:
+                linhas.extend(str(row[0]) for row in cursor.fetchall())
+            if not cursor.nextset():
+                break
+    finally:
+        cursor.execute("SET SHOWPLAN_TEXT OFF")
+        cursor.close()
+    # A primeira linha é o texto da própria consulta
+    return linhas[1:]
+
+
+def cronometrar(conn, sql, repeticoes):
+    cursor = conn.cursor()
+    tempos = []
+    linhas = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        cursor.execute(sql)
+        linhas = len(cursor.fetchall())
+        tempos.append(time.perf_counter() - inicio)
+    cursor.close()
+    return statistics.median(tempos), linhas
+
+
+def chave_de_exemplo(conn, perfil):
+    """A hierarquia com mais lojas do perfil, como um usuário real típico."""
+    if perfil == 'admin':
+        return None
+    coluna = COLUNA_POR_PERFIL[perfil]
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT TOP 1 {coluna} FROM TB_ESTR_LOJAS GROUP BY {coluna} ORDER BY COUNT(*) DESC")
+    linha = cursor.fetchone()
+    cursor.close()
+    return linha[0] if linha else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plano e tempo das consultas do backend com e sem os índices.")
+    parser.add_argument('--perfil', choices=['admin'] + sorted(COLUNA_POR_PERFIL), default='supervisor')
+    parser.add_argument('--chave', type=int, help="Chave da hierarquia (padrão: a com mais lojas)")
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--consultas', nargs='+', choices=sorted(CONSULTAS), default=list(CONSULTAS))
+    args = parser.parse_args(argv)
+
+    with db.conexao(db.config().banco_dw) as conn:
+        chave = args.chave if args.chave is not None else chave_de_exemplo(conn, args.perfil)
+        filtro = filtro_hierarquia(args.perfil, chave)
+        print(f"🔎 Perfil {args.perfil} ({filtro}), mediana de {args.repeticoes} execuções\n")
+
+        for nome in args.consultas:
+            resultados = {}
+            for com_indices in (False, True):
+                sql = montar_consulta(nome, filtro, com_indices)
+                operadores = operadores_do_plano(plano(conn, sql))
+                segundos, linhas = cronometrar(conn, sql, args.repeticoes)
+                resultados[com_indices] = (segundos, linhas, operadores)
+
+            sem, com = resultados[False], resultados[True]
+            ganho = sem[0] / com[0] if com[0] else float('inf')
+            print(f"📋 {nome} ({com[1]} linhas): {sem[0] * 1000:.1f} ms → {com[0] * 1000:.1f} ms ({ganho:.1f}x)")
+            print(f"   sem índices: {' → '.join(sem[2])}")
+            print(f"   com índices: {' → '.join(com[2])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Pools de textos do Faker gerados uma vez por (locale, seed, tamanho) e
+guardados em disco.
+
+Na primeira execução cada pool é gerado pelo Faker e gravado como .npy
+(texto de largura fixa, sem pickle); nas seguintes o arquivo é aberto com
+mmap e os geradores só sorteiam índices, sem chamar o Faker. Processos de
+shards diferentes leem o mesmo arquivo e compartilham as páginas em memória.
+
+Cada pool tem a própria seed, então o conteúdo não depende da ordem em que os
+pools são pedidos nem de quais já estavam em cache.
+"""
+
+import os
+import random
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from .colunas import categorico
+
+# Tamanho padrão dos pools de texto do Faker. Nomes, empresas e endereços se
+# repetem entre lojas, mas com 5 mil valores distintos a repetição não aparece
+# nas telas e o custo do Faker deixa de crescer com o número de lojas.
+TAMANHO_POOL_PADRAO = 5000
+
+# Sobe quando GERADORES mudar: os arquivos antigos deixam de ser usados
+VERSAO_POOLS = 1
+
+PASTA_CACHE_PADRAO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.cache', 'pools'))
+
+# Provedores do Faker usados pelos geradores de linhas
+GERADORES = {
+    'company': lambda fake: fake.company(),
+    'city': lambda fake: fake.city(),
+    'name': lambda fake: fake.name(),
+    'phone_number': lambda fake: fake.phone_number(),
+    'address': lambda fake: fake.address().replace("\n", " "),
+    'sentence4': lambda fake: fake.sentence(nb_words=4),
+    'sentence5': lambda fake: fake.sentence(nb_words=5),
+    'word': lambda fake: fake.word().capitalize(),
+}
+
+
+def pasta_cache():
+    """Pasta do cache (CARGA_CACHE_POOLS); CARGA_CACHE_POOLS=0 desliga o cache em disco."""
+    pasta = os.environ.get('CARGA_CACHE_POOLS', PASTA_CACHE_PADRAO)
+    return None if pasta.lower() in ('', '0', 'no', 'false') else pasta
+
+
+class PoolsFaker:
+    """Pools de textos do Faker gerados uma vez e sorteados por índice."""
+
+    def __init__(self, seed=42, locale='pt_BR', tamanho=TAMANHO_POOL_PADRAO, pasta=None):
+        self.seed = seed
+        self.locale = locale
+        self.tamanho = tamanho
+        self.pasta = pasta
+        self._fake = None
+        self._pools = {}
+
+    @property
+    def fake(self):
+        # Só criado se algum pool realmente precisar ser gerado
+        if self._fake is None:
+            self._fake = Faker(self.locale)
+        return self._fake
+
+    def arquivo(self, nome):
+        if not self.pasta:
+            return None
+        subpasta = f"v{VERSAO_POOLS}_{self.locale}_s{self.seed}_n{self.tamanho}"
+        return os.path.join(self.pasta, subpasta, f"{nome}.npy")
+
+    def _gerar(self, nome):
+        self.fake.seed_instance(f"{self.seed}:{nome}")
+        gerador = GERADORES[nome]
+        # Sem repetidos: o pool vira as categorias de uma coluna Categorical
+        valores = pd.unique(np.array([gerador(self.fake) for _ in range(self.tamanho)], dtype=object))
+        return valores.astype(str)
+
+    def _gravar(self, caminho, valores):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        # Grava ao lado e renomeia: outro processo nunca lê um arquivo pela metade
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as arquivo:
+            np.save(arquivo, valores, allow_pickle=False)
+        os.replace(temporario, caminho)
+
+    def pool(self, nome):
+        """Valores distintos do pool `nome` (um array de texto, mapeado do disco quando há cache)."""
+        if nome not in self._pools:
+            caminho = self.arquivo(nome)
+            if caminho and os.path.isfile(caminho):
+                valores = np.load(caminho, mmap_mode='r', allow_pickle=False)
+            else:
+                valores = self._gerar(nome)
+                if caminho:
+                    self._gravar(caminho, valores)
+            self._pools[nome] = valores
+        return self._pools[nome]
+
+    def sortear(self, rng, nome, n, mascara=None):
+        """Coluna Categorical com `n` valores do pool; posições fora da máscara ficam nulas."""
+        valores = self.pool(nome)
+        return categorico(valores, rng.integers(0, len(valores), n), mascara)
+
+    def sorteador(self, nome, aleatorio=random):
+        """Substituto de fake.<provedor>() para laços linha a linha: sorteia um valor do pool."""
+        valores = self.pool(nome).tolist()
+        return lambda: aleatorio.choice(valores)
+
+
+_pools_por_processo = {}
+
+
+def pools_compartilhados(seed=42, locale='pt_BR', tamanho=TAMANHO_POOL_PADRAO, pasta=None):
+    """
+    Pools do Faker reaproveitados dentro do processo e, pelo cache em disco,
+    entre execuções.
+
+    Dependem só da seed base (não da seed de cada shard), então todos os
+    workers sorteiam dos mesmos valores e a saída não muda com o número de
+    processos.
+    """
+    pasta = pasta_cache() if pasta is None else pasta
+    chave = (seed, locale, tamanho, pasta)
+    if chave not in _pools_por_processo:
+        _pools_por_processo[chave] = PoolsFaker(seed, locale, tamanho, pasta)
+    return _pools_por_processo[chave]
+
+
+def preaquecer(seed=42, locale='pt_BR', tamanho=TAMANHO_POOL_PADRAO, pasta=None, nomes=None):
+    """Gera (ou confere) no cache todos os pools; útil antes de disparar shards em paralelo."""
+    pools = pools_compartilhados(seed, locale, tamanho, pasta)
+    return {nome: len(pools.pool(nome)) for nome in nomes or GERADORES}
+
+
+if __name__ == '__main__':
+    pasta = pasta_cache()
+    for nome, quantidade in preaquecer().items():
+        print(f"📦 {nome}: {quantidade} valores")
+    print(f"💾 Cache em {pasta}" if pasta else "⚠️ Cache em disco desligado (CARGA_CACHE_POOLS=0)")
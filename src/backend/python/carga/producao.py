@@ -0,0 +1,121 @@
+"""
+Geração colunar das tabelas de produção mensal (TB_ESTR_CONTAS e TB_ESTR_ATIVO)
+e o gerador de linhas de cada tabela, como os scripts o usam (fonte_de_linhas).
+"""
+
+from datetime import date
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from .colunas import DIAS_1_ANO, datas
+
+COLUNAS_CONTAS = ['CHAVE_LOJA', 'DT_ULT_AB_CONTA', 'MES_M3', 'MES_M2', 'MES_M1', 'MES_M0']
+COLUNAS_ATIVO = ['CHAVE_LOJA', 'DT_ULT_TRANSACAO', 'MES_M3', 'MES_M2', 'MES_M1', 'MES_M0']
+
+MESES = ['MES_M3', 'MES_M2', 'MES_M1', 'MES_M0']
+
+# Colunas do CREATE TABLE (também usadas para montar o format file do bcp)
+DDL_COLUNAS_CONTAS = """
+    CHAVE_LOJA INT PRIMARY KEY,
+    DT_ULT_AB_CONTA DATE,
+    MES_M3 INT,
+    MES_M2 INT,
+    MES_M1 INT,
+    MES_M0 INT
+"""
+
+DDL_COLUNAS_ATIVO = """
+    CHAVE_LOJA INT PRIMARY KEY,
+    DT_ULT_TRANSACAO DATE,
+    MES_M3 INT,
+    MES_M2 INT,
+    MES_M1 INT,
+    MES_M0 INT
+"""
+
+
+def _gerar_producao(chaves_loja, colunas, maximo_mes, seed, hoje):
+    chaves = np.asarray(chaves_loja, dtype=np.int64)
+    n = len(chaves)
+    rng = np.random.default_rng(seed)
+    hoje = hoje or date.today()
+
+    dados = {colunas[0]: chaves, colunas[1]: datas(rng, n, DIAS_1_ANO, hoje)}
+    for mes in MESES:
+        dados[mes] = rng.integers(0, maximo_mes + 1, n, dtype=np.int32)
+    return pd.DataFrame(dados, columns=colunas)
+
+
+def gerar_contas_colunar(chaves_loja, seed=42, hoje=None):
+    """TB_ESTR_CONTAS: última abertura de conta no último ano e 0..50 contas por mês."""
+    return _gerar_producao(chaves_loja, COLUNAS_CONTAS, 50, seed, hoje)
+
+
+def gerar_ativo_colunar(chaves_loja, seed=42, hoje=None):
+    """TB_ESTR_ATIVO: última transação no último ano e flag 0/1 de ativo por mês."""
+    return _gerar_producao(chaves_loja, COLUNAS_ATIVO, 1, seed, hoje)
+
+
+def _chaves(n):
+    from .chaves import chaves_loja
+    from .shards import SEED_PADRAO
+    return chaves_loja(n, seed=SEED_PADRAO)
+
+
+def _producao(gerador, n):
+    """Como estr_contas.py/estr_ativo.py: blocos do gerador colunar em CARGA_PROCESSOS processos."""
+    from .shards import processos_de_geracao
+    from .stream import linhas_em_chunks
+    return linhas_em_chunks(gerador, _chaves(n), workers=processos_de_geracao())
+
+
+def _lojas(colunar, n):
+    """Como estr_lojas.py (linha a linha, ou --colunar), com a validação em memória no caminho."""
+    from .distribuicao import distribuicoes_configuradas
+    from .hierarquia import hierarquia_configurada
+    from .lojas import COLUNAS_LOJAS, ESQUEMA_LOJAS, HIERARQUIA_ORGANIZACIONAL, gerar_lojas_colunar
+    from .shards import SEED_PADRAO, processos_de_geracao
+    from .stream import linhas_em_chunks
+    from .validacao import validador_lojas
+
+    chaves = _chaves(n)
+    arvore = hierarquia_configurada(HIERARQUIA_ORGANIZACIONAL)
+    distribuicoes = distribuicoes_configuradas()
+    validador = validador_lojas(None)
+    if colunar:
+        gerador = partial(gerar_lojas_colunar, hierarquia=arvore, seed_pools=SEED_PADRAO, distribuicoes=distribuicoes)
+        return linhas_em_chunks(gerador, chaves, workers=processos_de_geracao(), observar=validador.observar)
+    from .orquestrador import importar_script
+    script = importar_script('estr_lojas')
+    sorteio = script.sortear_lojas(arvore, distribuicoes, n)
+    return validador.linhas(ESQUEMA_LOJAS.linhas(script.gerar_linhas(chaves.tolist(), arvore, sorteio)),
+                            COLUNAS_LOJAS)
+
+
+def fonte_de_linhas(tabela):
+    """
+    (colunas, gerar(n)) de cada tabela, com o mesmo gerador usado pelo script.
+
+    Usado pelo benchmark e pela exportação (carga.arquivos).
+    """
+    if tabela in ('TB_ESTR_LOJAS', 'TB_ESTR_LOJAS_COLUNAR'):
+        from .lojas import COLUNAS_LOJAS
+        return COLUNAS_LOJAS, partial(_lojas, tabela == 'TB_ESTR_LOJAS_COLUNAR')
+    if tabela == 'TB_ESTR_CONTAS':
+        return COLUNAS_CONTAS, partial(_producao, gerar_contas_colunar)
+    if tabela == 'TB_ESTR_ATIVO':
+        return COLUNAS_ATIVO, partial(_producao, gerar_ativo_colunar)
+    # Os demais geram linha a linha no próprio script
+    from .orquestrador import importar_script
+    if tabela == 'HOTLIST':
+        modulo = importar_script('hotlist')
+        return modulo.COLUNAS, modulo.gerar_linhas
+    if tabela == 'OPORTUNIDADES_CONTAS':
+        modulo = importar_script('oportunidades_contas')
+        return modulo.colunas, modulo.gerar_linhas
+    if tabela == 'MUNICIPIOS_PRIORITARIOS':
+        modulo = importar_script('estr_municipios_prioratrios')
+        return modulo.COLUNAS_MUNICIPIOS, modulo.gerar_municipios
+    raise ValueError(f"Tabela sem gerador: {tabela}")
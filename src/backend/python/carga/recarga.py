@@ -0,0 +1,66 @@
+"""
+Recarga de uma tabela pela sombra (carga.troca), com o carregamento do modo
+da carga:
+
+- checkpoint a cada lote (carga.retomada), com um `diario`;
+- partições em conexões simultâneas (carga.assincrono), com `particoes`;
+- senão executemany em lotes, bcp ou BULK INSERT (CARGA_ESTRATEGIA).
+
+    carregar = carregador_da_sombra(conn, COLUNAS_LOJAS, DDL_COLUNAS_LOJAS, dados, 'TB_ESTR_LOJAS',
+                                    diario=diario, validador=validador)
+    resultado = recarregar_com_troca(conn, 'TB_ESTR_LOJAS', DDL_COLUNAS_LOJAS, carregar, indices=...)
+    concluir_recarga(conn, 'TB_ESTR_LOJAS', diario)
+
+O validador confere a tabela inteira antes da troca: se falhar, a tabela
+atual continua no ar.
+"""
+
+import asyncio
+
+from .assincrono import carregar_particoes
+from .bcp import carregar_tabela
+from .bulk import montar_insert
+from .esquema import registrar_versao
+from .instrumentacao import fase
+from .retomada import carregar_com_checkpoint
+from .rollup import atualizar_rollup
+
+
+def carregador_da_sombra(conn, colunas, ddl_colunas, linhas, tabela, diario=None, particoes=None, conexoes=None,
+                         concorrencia=None, validador=None, database=None, log=print):
+    """
+    O `carregar(sombra)` de recarregar_com_troca. Com `diario`, as `linhas`
+    entram com checkpoint; com `particoes`, cada partição entra em uma
+    conexão de `conexoes` (obter, devolver), como db.conectar/db.liberar, e
+    as `linhas` são ignoradas; senão pela estratégia de carregar_tabela.
+    """
+    def carregar(sombra):
+        if diario:
+            resultado = carregar_com_checkpoint(conn, montar_insert(sombra, colunas), linhas, diario, tabela=tabela,
+                                                log=log)
+        elif particoes:
+            obter, devolver = conexoes
+            resultado = asyncio.run(carregar_particoes(obter, devolver, montar_insert(sombra, colunas), particoes,
+                                                       tabela=tabela, concorrencia=concorrencia, log=log))
+        else:
+            resultado = carregar_tabela(conn, sombra, colunas, ddl_colunas, linhas, tabela=tabela,
+                                        database=database, log=log)
+        if validador:
+            # Chave repetida entre blocos ou partições, cobertura incompleta: não troca a tabela
+            with fase('validar'):
+                validador.concluir()
+        return resultado
+
+    return carregar
+
+
+def concluir_recarga(conn, tabela, diario=None, fontes=None, log=print):
+    """
+    Depois da troca: descarta o diário (a próxima carga começa do zero),
+    registra a versão do esquema e recalcula o rollup das `fontes` (padrão:
+    todas, pois a hierarquia das lojas pode ter mudado).
+    """
+    if diario:
+        diario.concluir()
+    registrar_versao(conn, tabela)
+    return atualizar_rollup(conn, fontes, log=log)
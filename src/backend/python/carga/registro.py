@@ -0,0 +1,53 @@
+"""
+Esquema de tabela declarado uma vez: a mesma lista de colunas gera o DDL, o
+INSERT e o tipo de registro usado pelos geradores linha a linha.
+
+    ESQUEMA = Esquema('TB_EXEMPLO', [
+        ('CHAVE_LOJA', 'INT NOT NULL'),
+        ('NOME_LOJA', 'VARCHAR(255)'),
+    ])
+    ESQUEMA.ddl_colunas()   # "CHAVE_LOJA INT NOT NULL, NOME_LOJA VARCHAR(255)" (uma por linha)
+    ESQUEMA.insert()        # INSERT INTO TB_EXEMPLO (CHAVE_LOJA, NOME_LOJA) VALUES (?, ?)
+    ESQUEMA.registro(CHAVE_LOJA=1, NOME_LOJA='Loja')
+
+O registro é uma classe com __slots__ (sem __dict__ por instância) e os
+campos são preenchidos por nome, então a ordem das colunas só existe aqui.
+esquema.linhas(registros) converte para as tuplas do executemany com um
+attrgetter (C), sem montar listas intermediárias.
+"""
+
+from dataclasses import make_dataclass
+from operator import attrgetter
+
+from .bulk import montar_insert
+
+
+class Esquema:
+    """Colunas (nome, tipo SQL) de uma tabela e tudo o que deriva delas."""
+
+    def __init__(self, nome, colunas):
+        self.nome = nome
+        self.definicoes = list(colunas)
+        self.colunas = [coluna for coluna, _ in self.definicoes]
+        if len(set(self.colunas)) != len(self.colunas):
+            raise ValueError(f"{nome}: colunas repetidas no esquema")
+        self.registro = make_dataclass(self._nome_registro(), self.colunas, slots=True)
+        self.como_tupla = attrgetter(*self.colunas)
+
+    def _nome_registro(self):
+        # TB_ESTR_LOJAS -> RegistroTbEstrLojas
+        return 'Registro' + ''.join(parte.capitalize() for parte in self.nome.split('_'))
+
+    def ddl_colunas(self):
+        """Trecho do CREATE TABLE (uma coluna por linha, como em troca.criar_sombra)."""
+        return '\n' + ',\n'.join(f"    {coluna} {tipo}" for coluna, tipo in self.definicoes) + '\n'
+
+    def create_table(self, tabela=None):
+        return f"CREATE TABLE {tabela or self.nome} ({self.ddl_colunas()});"
+
+    def insert(self, tabela=None):
+        return montar_insert(tabela or self.nome, self.colunas)
+
+    def linhas(self, registros):
+        """Tuplas na ordem das colunas, prontas para o executemany."""
+        return map(self.como_tupla, registros)
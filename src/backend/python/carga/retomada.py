@@ -0,0 +1,322 @@
+"""
+Cargas retomáveis: checkpoint por lote em um diário local e linhas rejeitadas
+em um arquivo de dead-letter.
+
+Cada lote confirmado grava no diário (.cache/retomada/<tabela>.json) a
+posição da próxima linha, as linhas já inseridas e a "assinatura" da carga
+(seed, quantidade de linhas, chaves, modo, data de referência). Se o processo
+morrer na linha 400 mil, `python estr_lojas.py --retomar` (ou python -m carga
+--retomar):
+
+1. mantém a sombra (<tabela>_NOVA) em vez de fazer o DROP;
+2. confere o diário contra um COUNT_BIG(*) da sombra;
+3. gera as linhas de novo a partir da mesma seed, começando na posição salva.
+
+O diário é gravado duas vezes por lote: antes do commit ('pendente') e
+depois dele. Se o processo morrer entre o commit e a segunda gravação, a
+contagem da sombra diz se o lote pendente entrou ou não. Nenhuma linha é
+inserida duas vezes e nenhuma fica para trás.
+
+As linhas que falham mesmo sozinhas (no modo linha a linha) vão para
+<tabela>.rejeitadas.jsonl, uma linha JSON por registro com a posição, o erro
+e os valores. Elas não são mais só impressas e esquecidas.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from .assincrono import CarregadorAssincrono, modo_assincrono
+from .bulk import CarregadorEmLote
+from .instrumentacao import fase
+from .troca import nome_sombra
+
+PASTA_RETOMADA_PADRAO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.cache', 'retomada'))
+
+
+class DiarioInconsistente(Exception):
+    pass
+
+
+def modo_retomada():
+    """True com CARGA_RETOMAR=1 (python -m carga --retomar)."""
+    return os.environ.get('CARGA_RETOMAR', '0').lower() in ('1', 'yes', 'true')
+
+
+def pasta_retomada():
+    return os.environ.get('CARGA_RETOMADA_DIR', PASTA_RETOMADA_PADRAO)
+
+
+def data_de_referencia(tabela, retomar, pasta=None):
+    """
+    O "hoje" das colunas de data: retomando, o gravado na assinatura do diário
+    (as linhas refeitas são as da carga interrompida, mesmo em outro dia);
+    senão a data de hoje, fixada no início da carga.
+    """
+    caminho = os.path.join(pasta or pasta_retomada(), f"{tabela}.json")
+    if retomar and os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as arquivo:
+            valor = json.load(arquivo).get('assinatura', {}).get('hoje')
+        if valor:
+            return date.fromisoformat(valor)
+    return date.today()
+
+
+def assinatura(**parametros):
+    """Parâmetros que determinam as linhas geradas; arrays (ex.: as chaves) entram pelo hash."""
+    resultado = {}
+    for nome, valor in sorted(parametros.items()):
+        if isinstance(valor, (list, tuple, np.ndarray)):
+            valor = hashlib.sha1(np.asarray(valor, dtype=np.int64).tobytes()).hexdigest()
+        resultado[nome] = valor
+    return resultado
+
+
+def _gravar_json(caminho, dados):
+    """Grava em um temporário e troca: um diário pela metade nunca fica no lugar do anterior."""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+class ArquivoRejeitados:
+    """Dead-letter: linhas que não entraram, uma por linha JSON."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.quantidade = 0
+
+    def gravar(self, posicao, linha, erro):
+        registro = {'posicao': posicao, 'erro': str(erro), 'linha': list(linha)}
+        with open(self.caminho, 'a', encoding='utf-8') as arquivo:
+            # Datas, Decimal e UUID viram texto
+            arquivo.write(json.dumps(registro, ensure_ascii=False, default=str) + '\n')
+        self.quantidade += 1
+
+    def ler(self):
+        if not os.path.exists(self.caminho):
+            return []
+        with open(self.caminho, encoding='utf-8') as arquivo:
+            return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+    def truncar(self, posicao):
+        """Descarta o que foi gravado a partir de `posicao` (lote que será refeito)."""
+        registros = [r for r in self.ler() if r['posicao'] < posicao]
+        if not registros:
+            self.limpar()
+            return
+        temporario = f"{self.caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            for registro in registros:
+                arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        os.replace(temporario, self.caminho)
+        self.quantidade = len(registros)
+
+    def limpar(self):
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+        self.quantidade = 0
+
+
+class Diario:
+    """
+    Checkpoint de uma carga: posição da próxima linha, linhas inseridas e
+    falhas até ela, e o lote pendente (gravado antes do commit).
+    """
+
+    def __init__(self, tabela, assinatura_carga, pasta=None):
+        self.tabela = tabela
+        self.assinatura = assinatura_carga
+        self.pasta = pasta or pasta_retomada()
+        os.makedirs(self.pasta, exist_ok=True)
+        self.caminho = os.path.join(self.pasta, f"{tabela}.json")
+        self.rejeitadas = ArquivoRejeitados(os.path.join(self.pasta, f"{tabela}.rejeitadas.jsonl"))
+        self.posicao = 0
+        self.inseridos = 0
+        self.falhas = 0
+
+    def _estado(self, pendente=None):
+        return {
+            'tabela': self.tabela,
+            'assinatura': self.assinatura,
+            'posicao': self.posicao,
+            'inseridos': self.inseridos,
+            'falhas': self.falhas,
+            'pendente': pendente,
+            'atualizado_em': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def ler(self):
+        if not os.path.exists(self.caminho):
+            return None
+        with open(self.caminho, encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+
+    def reiniciar(self):
+        """Carga do zero: descarta diário e rejeitadas de uma carga anterior."""
+        self.posicao = self.inseridos = self.falhas = 0
+        self.rejeitadas.limpar()
+        _gravar_json(self.caminho, self._estado())
+
+    def retomar(self, linhas_na_tabela):
+        """
+        Posição de onde continuar, conferida contra as `linhas_na_tabela` da
+        sombra. Levanta DiarioInconsistente se o diário não serve para ela.
+        """
+        estado = self.ler()
+        if estado is None:
+            raise DiarioInconsistente(f"Sem diário de {self.tabela} em {self.pasta}")
+        if estado['assinatura'] != self.assinatura:
+            raise DiarioInconsistente(f"O diário de {self.tabela} é de outra carga (seed, linhas ou chaves diferentes)")
+
+        pendente = estado.get('pendente')
+        if pendente and linhas_na_tabela == pendente['inseridos']:
+            # O commit do lote pendente aconteceu; só a segunda gravação não
+            estado.update(posicao=pendente['posicao'], inseridos=pendente['inseridos'],
+                          falhas=pendente['falhas'])
+        elif linhas_na_tabela != estado['inseridos']:
+            raise DiarioInconsistente(
+                f"{self.tabela}: a sombra tem {linhas_na_tabela} linhas e o diário esperava {estado['inseridos']}"
+            )
+
+        self.posicao, self.inseridos, self.falhas = estado['posicao'], estado['inseridos'], estado['falhas']
+        # Rejeitadas de um lote que não chegou ao commit voltam a ser tentadas
+        self.rejeitadas.truncar(self.posicao)
+        _gravar_json(self.caminho, self._estado())
+        return self.posicao
+
+    def preparar(self, posicao, inseridos, falhas):
+        """Antes do commit: registra o lote que está para entrar."""
+        _gravar_json(self.caminho, self._estado({'posicao': posicao, 'inseridos': inseridos, 'falhas': falhas}))
+
+    def confirmar(self, posicao, inseridos, falhas):
+        """Depois do commit: o lote entrou."""
+        self.posicao, self.inseridos, self.falhas = posicao, inseridos, falhas
+        _gravar_json(self.caminho, self._estado())
+
+    def concluir(self):
+        """Carga terminada (e a sombra promovida): o diário não é mais necessário."""
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+
+
+class CarregadorRetomavel(CarregadorEmLote):
+    """
+    CarregadorEmLote com checkpoint: as linhas recebidas começam na posição
+    do diário, cada commit é registrado nele e as linhas rejeitadas vão para
+    o dead-letter em vez de só para o resultado.
+    """
+
+    def __init__(self, conn, insert_sql, diario, tabela='', tamanho_lote=None,
+                 fast_executemany=True, log=print, ritmo=None):
+        super().__init__(conn, insert_sql, tabela, tamanho_lote, fast_executemany, log, ritmo=ritmo)
+        self.diario = diario
+        self.posicao_inicial = diario.posicao
+        self._inseridos_antes = diario.inseridos
+        self._falhas_antes = diario.falhas
+        self._falhas = 0
+
+    def _rejeitar(self, posicao, linha, erro, resultado):
+        super()._rejeitar(posicao, linha, erro, resultado)
+        self.diario.rejeitadas.gravar(posicao, linha, erro)
+        self._falhas = resultado.falhas
+
+    def _confirmar(self, fim, inseridos):
+        # `inseridos` e as falhas contam só esta execução; o diário guarda o total da sombra
+        total, falhas = self._inseridos_antes + inseridos, self._falhas_antes + self._falhas
+        self.diario.preparar(fim, total, falhas)
+        super()._confirmar(fim, inseridos)
+        self.diario.confirmar(fim, total, falhas)
+
+
+class CarregadorRetomavelAssincrono(CarregadorRetomavel, CarregadorAssincrono):
+    """O checkpoint do CarregadorRetomavel com o carregar() do CarregadorAssincrono."""
+
+
+def carregar_com_checkpoint(conn, insert_sql, linhas, diario, tabela='', tamanho_lote=None, log=print):
+    """
+    Como carregar_em_lotes, com checkpoint no `diario` (CARGA_ASSINCRONO=1
+    também vale aqui). As `linhas` devem começar na posição do diário.
+    """
+    if diario.posicao:
+        log(f"   ♻️ Retomando {tabela} na linha {diario.posicao + 1} ({diario.inseridos} já inseridas)")
+    if modo_assincrono():
+        carregador = CarregadorRetomavelAssincrono(conn, insert_sql, diario, tabela=tabela,
+                                                   tamanho_lote=tamanho_lote, log=log)
+        resultado = asyncio.run(carregador.carregar(linhas))
+    else:
+        carregador = CarregadorRetomavel(conn, insert_sql, diario, tabela=tabela, tamanho_lote=tamanho_lote, log=log)
+        resultado = carregador.carregar(linhas)
+    if diario.rejeitadas.quantidade:
+        log(f"   🪦 {diario.rejeitadas.quantidade} linhas rejeitadas em {diario.rejeitadas.caminho}")
+    return resultado
+
+
+def linhas_na_tabela(conn, tabela):
+    """COUNT_BIG(*) da tabela, ou None se ela não existe."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT OBJECT_ID('{tabela}', 'U')")
+        if cursor.fetchone()[0] is None:
+            return None
+        cursor.execute(f"SELECT COUNT_BIG(*) FROM {tabela}")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def ponto_de_retomada(conn, diario, validador=None, colunas=None, log=print):
+    """
+    Posição de onde a carga de `diario.tabela` continua, conferida contra a
+    sombra; 0 (com o diário reiniciado) se não há carga interrompida que sirva.
+    As linhas já gravadas e as rejeitadas passam pelo `validador`, que confere
+    a tabela inteira.
+    """
+    sombra = nome_sombra(diario.tabela)
+    linhas = linhas_na_tabela(conn, sombra)
+    try:
+        if linhas is None:
+            raise DiarioInconsistente(f"{sombra} não existe")
+        inicio = diario.retomar(linhas)
+    except DiarioInconsistente as e:
+        log(f"⚠️ Não dá para retomar ({e}); a carga recomeça do zero")
+        diario.reiniciar()
+        return 0
+
+    if inicio:
+        log(f"♻️ Retomando na linha {inicio + 1}: {linhas} já estão em {sombra}")
+        if validador:
+            cursor = conn.cursor()
+            try:
+                validador.observar_tabela(cursor, sombra, colunas)
+            finally:
+                cursor.close()
+            # As rejeitadas também tinham passado pela validação antes de ir para o banco
+            rejeitadas = [registro['linha'] for registro in diario.rejeitadas.ler()]
+            if rejeitadas:
+                validador.observar(pd.DataFrame.from_records(rejeitadas, columns=colunas))
+    return inicio
+
+
+def diario_da_carga(conn, tabela, retomar, validador=None, colunas=None, pasta_diario=None, log=print,
+                    **parametros):
+    """
+    (diario, inicio) de uma carga com checkpoint, com o diário em
+    `pasta_diario` (padrão: CARGA_RETOMADA_DIR). `parametros` são os da
+    assinatura. Com `retomar`, continua do ponto_de_retomada; senão o diário
+    recomeça e a carga parte da linha 0.
+    """
+    diario = Diario(tabela, assinatura(**parametros), pasta=pasta_diario)
+    if not retomar:
+        diario.reiniciar()
+        return diario, 0
+    with fase('retomar'):
+        return diario, ponto_de_retomada(conn, diario, validador, colunas, log=log)
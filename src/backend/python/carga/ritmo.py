@@ -0,0 +1,274 @@
+"""
+Ritmo adaptativo da carga: tamanho do lote e pausas ajustados pela latência
+de cada lote, para a carga não disputar o DATAWAREHOUSE com as consultas do
+dashboard (routes/estrategiaComercial.js) em horário comercial.
+
+    CARGA_LATENCIA_ALVO=250 python estr_lojas.py        # ms por lote (executemany + commit)
+    CARGA_MAX_LINHAS_S=20000 python estr_lojas.py       # teto de vazão, com ou sem alvo
+    python -m carga --latencia-alvo 250 --max-linhas-s 20000
+
+A cada lote o ControleDeRitmo recebe a latência (executemany + commit) e a
+espera por bloqueios (LCK_*) da sessão durante o lote, e então:
+
+- acima do alvo (ou com espera por bloqueio acima de um quarto dele): o lote
+  encolhe na proporção alvo/latência; se já está no mínimo, a pausa entre
+  lotes dobra, e o banco fica livre para as leituras;
+- com folga: a pausa cai pela metade e, sem pausa, o lote cresce até 1,5x
+  por vez, mirando 90% do alvo;
+- com CARGA_MAX_LINHAS_S: espera o necessário para a vazão média não passar
+  do teto.
+
+A espera por bloqueio vem de sys.dm_exec_session_wait_stats (precisa de VIEW
+SERVER STATE); sem permissão, só a latência conta. Para ver o controle
+reagindo a um pico de carga, sem banco:
+
+    python -m carga.ritmo simular --linhas 500000 --alvo 250 --pico 4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Limites do tamanho do lote adaptativo
+LOTE_MINIMO = 100
+LOTE_MAXIMO = 50_000
+
+# Pausa máxima entre lotes (segundos)
+PAUSA_MAXIMA = 5.0
+
+# Espera por bloqueio tolerada por lote, como fração da latência alvo
+FRACAO_BLOQUEIO = 0.25
+
+# Espera acumulada por locks da própria sessão, em ms
+SQL_ESPERA_BLOQUEIOS = (
+    "SELECT ISNULL(SUM(wait_time_ms), 0) FROM sys.dm_exec_session_wait_stats "
+    "WHERE session_id = @@SPID AND wait_type LIKE 'LCK[_]%'"
+)
+
+
+class ControleDeRitmo:
+    """Tamanho do próximo lote e pausa antes dele, a partir dos lotes anteriores."""
+
+    def __init__(self, latencia_alvo=None, max_linhas_s=None, tamanho_inicial=5000,
+                 tamanho_minimo=LOTE_MINIMO, tamanho_maximo=LOTE_MAXIMO, pausa_maxima=PAUSA_MAXIMA,
+                 espera_bloqueio_max=None, relogio=time.perf_counter, dormir=time.sleep):
+        if latencia_alvo is not None and latencia_alvo <= 0:
+            raise ValueError("latencia_alvo deve ser maior que zero")
+        if max_linhas_s is not None and max_linhas_s <= 0:
+            raise ValueError("max_linhas_s deve ser maior que zero")
+        self.latencia_alvo = latencia_alvo
+        self.max_linhas_s = max_linhas_s
+        self.tamanho_minimo = tamanho_minimo
+        self.tamanho_maximo = tamanho_maximo
+        self.tamanho = min(max(tamanho_inicial, tamanho_minimo), tamanho_maximo)
+        self.pausa_maxima = pausa_maxima
+        self.espera_bloqueio_max = (espera_bloqueio_max if espera_bloqueio_max is not None
+                                    else (latencia_alvo or 0) * FRACAO_BLOQUEIO)
+        self.relogio = relogio
+        self.dormir = dormir
+        self.pausa = 0.0
+        self.historico = []          # (linhas, segundos, bloqueio, espera) de cada lote
+        self._inicio = None
+        self._linhas = 0
+
+    def _ajustar(self, segundos, bloqueio):
+        razao = self.latencia_alvo / max(segundos, 1e-6)
+        if self.espera_bloqueio_max and bloqueio > self.espera_bloqueio_max:
+            # O lote esperou por locks das leituras: recua mesmo dentro do alvo
+            razao = min(razao, 0.5)
+        if razao < 1:
+            if self.tamanho <= self.tamanho_minimo:
+                self.pausa = min(self.pausa_maxima, max(2 * self.pausa, segundos))
+            self.tamanho = max(self.tamanho_minimo, int(self.tamanho * razao))
+        else:
+            self.pausa = self.pausa / 2 if self.pausa > 0.001 else 0.0
+            if not self.pausa:
+                self.tamanho = min(self.tamanho_maximo, max(self.tamanho_minimo,
+                                                            int(self.tamanho * min(0.9 * razao, 1.5))))
+
+    def registrar(self, linhas, segundos, bloqueio=0.0):
+        """Depois de um lote: ajusta tamanho e pausa e devolve quanto esperar antes do próximo."""
+        agora = self.relogio()
+        if self._inicio is None:
+            self._inicio = agora - segundos
+        self._linhas += linhas
+        if self.latencia_alvo:
+            self._ajustar(segundos, bloqueio)
+
+        espera = self.pausa
+        if self.max_linhas_s:
+            # Tempo mínimo para as linhas até aqui, no teto de vazão
+            espera = max(espera, self._linhas / self.max_linhas_s - (agora - self._inicio))
+        self.historico.append((linhas, segundos, bloqueio, espera))
+        return espera
+
+    def esperar(self, segundos):
+        if segundos > 0:
+            self.dormir(segundos)
+
+    def resumo(self):
+        if not self.historico:
+            return "nenhum lote"
+        latencias = sorted(segundos for _, segundos, _, _ in self.historico)
+        p95 = latencias[min(len(latencias) - 1, int(0.95 * len(latencias)))]
+        pausas = sum(espera for _, _, _, espera in self.historico)
+        return (f"{len(self.historico)} lotes, latência mediana {statistics.median(latencias) * 1000:.0f}ms "
+                f"e p95 {p95 * 1000:.0f}ms, {pausas:.1f}s em pausas, lote final {self.tamanho}")
+
+
+class SondaDeBloqueios:
+    """Espera por locks da sessão desde a última leitura (sys.dm_exec_session_wait_stats)."""
+
+    def __init__(self, conn, log=print):
+        self.conn = conn
+        self.log = log
+        self.ativa = True
+        self._anterior = None
+
+    def medir(self):
+        """Segundos de espera por bloqueio desde a chamada anterior (0 se indisponível)."""
+        if not self.ativa:
+            return 0.0
+        try:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(SQL_ESPERA_BLOQUEIOS)
+                total = float(cursor.fetchone()[0] or 0) / 1000
+            finally:
+                cursor.close()
+        except Exception as e:
+            # Sem VIEW SERVER STATE (ou outro banco): o ritmo segue só pela latência
+            self.ativa = False
+            self.log(f"   ⚠️ Sem leitura de esperas por bloqueio ({e}); o ritmo segue só pela latência")
+            return 0.0
+        anterior, self._anterior = self._anterior, total
+        return 0.0 if anterior is None else max(0.0, total - anterior)
+
+
+def ritmo_configurado(tamanho_inicial, fatia=1):
+    """
+    ControleDeRitmo de CARGA_LATENCIA_ALVO (ms) e CARGA_MAX_LINHAS_S, ou None
+    sem nenhum dos dois. Com `fatia` conexões em paralelo, cada uma fica com
+    1/fatia do teto.
+    """
+    alvo = os.environ.get('CARGA_LATENCIA_ALVO')
+    teto = os.environ.get('CARGA_MAX_LINHAS_S')
+    if not alvo and not teto:
+        return None
+    return ControleDeRitmo(latencia_alvo=float(alvo) / 1000 if alvo else None,
+                           max_linhas_s=float(teto) / fatia if teto else None,
+                           tamanho_inicial=tamanho_inicial)
+
+
+class RelogioSimulado:
+    """Relógio que só anda quando alguém dorme: a simulação roda na hora."""
+
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.agora += max(0.0, segundos)
+
+
+class ConexaoLenta:
+    """
+    Driver DB-API simulado: cada executemany leva `fixo + por_linha × linhas`
+    segundos, multiplicados por `pico` durante a janela `janela_pico` (fração
+    do total de linhas), como o banco em horário comercial. Na janela, um
+    terço do tempo do lote é espera por bloqueio (lida pela SondaDeBloqueios).
+    """
+
+    def __init__(self, total_linhas, fixo=0.02, por_linha=0.00004, pico=4.0, janela_pico=(0.3, 0.6),
+                 relogio=None):
+        self.relogio = relogio or RelogioSimulado()
+        self.total_linhas = total_linhas
+        self.fixo = fixo
+        self.por_linha = por_linha
+        self.pico = pico
+        self.janela_pico = janela_pico
+        self.linhas = 0
+        self.bloqueio_ms = 0.0
+
+    def cursor(self):
+        return self
+
+    def executemany(self, sql, linhas):
+        n = len(linhas)
+        segundos = self.fixo + self.por_linha * n
+        progresso = self.linhas / self.total_linhas
+        if self.janela_pico[0] <= progresso < self.janela_pico[1]:
+            segundos *= self.pico
+            self.bloqueio_ms += segundos / 3 * 1000
+        self.relogio.dormir(segundos)
+        self.linhas += n
+
+    def execute(self, sql, parametros=()):
+        self._resultado = (self.bloqueio_ms,) if 'dm_exec_session_wait_stats' in sql else None
+
+    def fetchone(self):
+        return self._resultado
+
+    def commit(self):
+        self.relogio.dormir(self.fixo / 2)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def simular(linhas, latencia_alvo=None, max_linhas_s=None, tamanho_lote=5000, pico=4.0):
+    """
+    Carrega `linhas` linhas na ConexaoLenta, no relógio simulado. Sem alvo nem
+    teto o controle só registra os lotes (lote fixo). Devolve (ResultadoCarga, ControleDeRitmo).
+    """
+    from .bulk import CarregadorEmLote
+
+    relogio = RelogioSimulado()
+    conn = ConexaoLenta(linhas, pico=pico, relogio=relogio)
+    ritmo = ControleDeRitmo(latencia_alvo=latencia_alvo, max_linhas_s=max_linhas_s,
+                            tamanho_inicial=tamanho_lote, relogio=relogio, dormir=relogio.dormir)
+    carregador = CarregadorEmLote(conn, 'INSERT INTO SIMULADA VALUES (?)', tabela='SIMULADA',
+                                  tamanho_lote=tamanho_lote, log=None, ritmo=ritmo)
+    resultado = carregador.carregar((i,) for i in range(linhas))
+    # O tempo que vale é o simulado
+    resultado.segundos = relogio()
+    return resultado, ritmo
+
+
+def _acima_do_alvo(ritmo, alvo):
+    return sum(segundos > alvo for _, segundos, _, _ in ritmo.historico)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m carga.ritmo',
+                                     description="Simula uma carga contra um driver lento, com e sem ritmo adaptativo.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    simulacao = comandos.add_parser('simular')
+    simulacao.add_argument('--linhas', type=int, default=500_000)
+    simulacao.add_argument('--alvo', type=float, default=250, help="Latência alvo por lote, em ms")
+    simulacao.add_argument('--max-linhas-s', type=float, help="Teto de vazão")
+    simulacao.add_argument('--lote', type=int, default=5000, help="Lote fixo (e inicial do adaptativo)")
+    simulacao.add_argument('--pico', type=float, default=4.0,
+                           help="Quanto o banco fica mais lento no meio da carga (horário comercial)")
+    args = parser.parse_args(argv)
+    alvo = args.alvo / 1000
+
+    fixo, ritmo = simular(args.linhas, tamanho_lote=args.lote, pico=args.pico)
+    print(f"📦 Lote fixo de {args.lote}: {fixo.resumo()}")
+    print(f"   {ritmo.resumo()}; {_acima_do_alvo(ritmo, alvo)} lotes acima de {args.alvo:.0f}ms")
+
+    adaptativo, ritmo = simular(args.linhas, alvo, args.max_linhas_s, args.lote, args.pico)
+    print(f"🎚️ Adaptativo: {adaptativo.resumo()}")
+    print(f"   {ritmo.resumo()}; {_acima_do_alvo(ritmo, alvo)} lotes acima de {args.alvo:.0f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
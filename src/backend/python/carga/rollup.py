@@ -0,0 +1,165 @@
+"""
+Tabela de agregados por nó da hierarquia (TB_ESTR_ROLLUP_HIERARQUIA).
+
+As métricas são as mesmas que /:produto/metricas e /metricas-gerenciais
+calculam a cada requisição; aqui elas são calculadas uma vez por carga, para
+todos os nós de uma vez (GROUPING SETS), e o dashboard passa a ler uma linha:
+
+    SELECT * FROM TB_ESTR_ROLLUP_HIERARQUIA
+    WHERE FONTE = 'CONTAS' AND NIVEL = 'SUPERVISAO' AND CHAVE = @chave
+
+A atualização é incremental: cada fonte é recalculada em uma tabela
+temporária e um MERGE só altera as linhas cujos números mudaram.
+"""
+
+from .instrumentacao import fase
+
+TABELA_ROLLUP = 'TB_ESTR_ROLLUP_HIERARQUIA'
+
+# Tabela de produção de cada fonte (o produto do dashboard)
+FONTES = {
+    'CONTAS': 'TB_ESTR_CONTAS',   # credito, abertura-conta, seguro
+    'ATIVO': 'TB_ESTR_ATIVO',     # pontos-ativos
+}
+
+# (nível, chave, descrição) em TB_ESTR_LOJAS, do mais alto para o mais baixo
+NIVEIS = [
+    ('DIRETORIA', 'DIRE_REG', 'DIR_REGIONAL'),
+    ('GERENCIA_AREA', 'CHAVE_GERENCIA_AREA', 'DESC_GERENCIA_AREA'),
+    ('COORDENACAO', 'CHAVE_COORDENACAO', 'DESC_COORDENACAO'),
+    ('SUPERVISAO', 'CHAVE_SUPERVISAO', 'DESC_SUPERVISAO'),
+]
+
+_M0, _M1, _M2, _M3 = (f"ISNULL(m.MES_M{i}, 0)" for i in range(4))
+
+# Métricas por nó, com os nomes usados no backend
+METRICAS = [
+    ('LOJAS_NA_ESTRATEGIA', "COUNT(*)"),
+    ('SOMA_MES_M3', f"SUM({_M3})"),
+    ('SOMA_MES_M2', f"SUM({_M2})"),
+    ('SOMA_MES_M1', f"SUM({_M1})"),
+    ('SOMA_MES_M0', f"SUM({_M0})"),
+    ('LOJAS_C_PRODUCAO_M0', f"SUM(CASE WHEN {_M0} > 0 THEN 1 ELSE 0 END)"),
+    ('LOJAS_C_PRODUCAO_M1', f"SUM(CASE WHEN {_M1} > 0 THEN 1 ELSE 0 END)"),
+    ('LOJAS_QUE_ZERARAM', f"SUM(CASE WHEN {_M1} > 0 AND {_M0} = 0 THEN 1 ELSE 0 END)"),
+    ('LOJAS_NOVAS', f"SUM(CASE WHEN {_M1} = 0 AND {_M0} > 0 THEN 1 ELSE 0 END)"),
+    ('LOJAS_QUE_VOLTARAM', f"SUM(CASE WHEN {_M2} > 0 AND {_M1} = 0 AND {_M0} > 0 THEN 1 ELSE 0 END)"),
+    ('LOJAS_ESTAVEIS_ATIVAS', f"SUM(CASE WHEN {_M1} > 0 AND {_M0} > 0 THEN 1 ELSE 0 END)"),
+    ('LOJAS_CRESCERAM', f"SUM(CASE WHEN {_M0} > {_M1} THEN 1 ELSE 0 END)"),
+    ('LOJAS_QUEDA_PRODUCAO', f"SUM(CASE WHEN {_M0} < {_M1} THEN 1 ELSE 0 END)"),
+    ('LOJAS_SEM_MOVIMENTO', f"SUM(CASE WHEN {_M0} = 0 THEN 1 ELSE 0 END)"),
+    ('LOJAS_SITUACAO_ATIVA', "SUM(CASE WHEN l.SITUACAO = 'ATIVA' THEN 1 ELSE 0 END)"),
+    ('LOJAS_BLOQUEADAS', "SUM(CASE WHEN l.SITUACAO = 'BLOQUEADO' THEN 1 ELSE 0 END)"),
+]
+
+COLUNAS_CHAVE = ['FONTE', 'NIVEL', 'CHAVE']
+
+
+def ddl_rollup():
+    metricas = ',\n            '.join(f"{nome} INT NOT NULL" for nome, _ in METRICAS)
+    return f"""
+    IF OBJECT_ID('{TABELA_ROLLUP}', 'U') IS NULL
+        CREATE TABLE {TABELA_ROLLUP} (
+            FONTE VARCHAR(20) NOT NULL,
+            NIVEL VARCHAR(20) NOT NULL,
+            CHAVE INT NOT NULL,
+            DESCRICAO VARCHAR(255),
+            {metricas},
+            ATUALIZADO_EM DATETIME2 NOT NULL DEFAULT SYSDATETIME(),
+            CONSTRAINT PK_{TABELA_ROLLUP} PRIMARY KEY CLUSTERED (FONTE, NIVEL, CHAVE)
+        );
+    """
+
+
+def sql_agregados(fonte, destino=None):
+    """
+    SELECT com todos os nós da hierarquia da fonte (e o TOTAL, CHAVE = 0) em uma
+    leitura só; com `destino`, vira SELECT ... INTO destino.
+    """
+    tabela = FONTES[fonte]
+
+    nivel = '\n'.join(f"            WHEN GROUPING(l.{chave}) = 0 THEN '{nome}'" for nome, chave, _ in NIVEIS)
+    chave = '\n'.join(f"            WHEN GROUPING(l.{chave}) = 0 THEN l.{chave}" for _, chave, _ in NIVEIS)
+    descricao = '\n'.join(f"            WHEN GROUPING(l.{chave}) = 0 THEN MAX(l.{desc})" for _, chave, desc in NIVEIS)
+    conjuntos = ', '.join(f"(l.{chave})" for _, chave, _ in NIVEIS)
+    metricas = ',\n            '.join(f"{expressao} AS {nome}" for nome, expressao in METRICAS)
+
+    into = f"INTO {destino} " if destino else ''
+    return f"""
+    SELECT * {into}FROM (
+        SELECT
+            '{fonte}' AS FONTE,
+            CASE
+{nivel}
+            ELSE 'TOTAL' END AS NIVEL,
+            CASE
+{chave}
+            ELSE 0 END AS CHAVE,
+            CASE
+{descricao}
+            ELSE 'TOTAL' END AS DESCRICAO,
+            {metricas}
+        FROM {tabela} m
+        LEFT JOIN TB_ESTR_LOJAS l ON l.CHAVE_LOJA = m.CHAVE_LOJA
+        GROUP BY GROUPING SETS ({conjuntos}, ())
+    ) agregados
+    -- Lojas da fonte sem cadastro em TB_ESTR_LOJAS só entram no TOTAL
+    WHERE CHAVE IS NOT NULL
+    """
+
+
+def sql_merge_rollup(fonte, staging):
+    colunas = COLUNAS_CHAVE + ['DESCRICAO'] + [nome for nome, _ in METRICAS]
+    valores = [c for c in colunas if c not in COLUNAS_CHAVE]
+    condicao = ' AND '.join(f"alvo.{c} = origem.{c}" for c in COLUNAS_CHAVE)
+    atualizacoes = ',\n        '.join(f"{c} = origem.{c}" for c in valores)
+    return f"""
+    MERGE {TABELA_ROLLUP} WITH (HOLDLOCK) AS alvo
+    USING {staging} AS origem
+        ON {condicao}
+    -- EXCEPT compara tratando NULL = NULL: só regrava o nó se algum número mudou
+    WHEN MATCHED AND EXISTS (SELECT {', '.join(f'origem.{c}' for c in valores)}
+                             EXCEPT SELECT {', '.join(f'alvo.{c}' for c in valores)}) THEN UPDATE SET
+        {atualizacoes},
+        ATUALIZADO_EM = SYSDATETIME()
+    WHEN NOT MATCHED BY TARGET THEN
+        INSERT ({', '.join(colunas)}) VALUES ({', '.join(f'origem.{c}' for c in colunas)})
+    WHEN NOT MATCHED BY SOURCE AND alvo.FONTE = '{fonte}' THEN
+        DELETE;
+    """
+
+
+def atualizar_rollup(conn, fontes=None, log=print):
+    """
+    Recalcula os agregados das `fontes` (padrão: todas) e aplica no rollup.
+
+    Depois de carregar TB_ESTR_CONTAS basta a fonte CONTAS; depois de
+    TB_ESTR_LOJAS (a hierarquia mudou), todas. Fontes cuja tabela ainda não
+    existe são ignoradas. Devolve {fonte: linhas do rollup alteradas}.
+    """
+    cursor = conn.cursor()
+    cursor.execute(ddl_rollup())
+    conn.commit()
+
+    alteradas = {}
+    for fonte in fontes or list(FONTES):
+        cursor.execute("SELECT OBJECT_ID(?, 'U')", (FONTES[fonte],))
+        if cursor.fetchone()[0] is None:
+            continue
+
+        staging = f"#ROLLUP_{fonte}"
+        try:
+            with fase(f"rollup_{fonte.lower()}"):
+                cursor.execute(f"IF OBJECT_ID('tempdb..{staging}') IS NOT NULL DROP TABLE {staging};")
+                cursor.execute(sql_agregados(fonte, destino=staging))
+                cursor.execute(sql_merge_rollup(fonte, staging))
+                alteradas[fonte] = cursor.rowcount
+                cursor.execute(f"DROP TABLE {staging};")
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        log(f"🧮 Rollup {fonte}: {alteradas[fonte]} nós da hierarquia atualizados em {TABELA_ROLLUP}")
+
+    cursor.close()
+    return alteradas
@@ -0,0 +1,124 @@
+"""
+Geração em paralelo (multiprocesso) dividindo o espaço de CHAVE_LOJA em shards.
+
+Uso para testes de carga:
+    python -m carga.shards TB_ESTR_LOJAS --linhas 10000000 --workers 8
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from .lojas import gerar_lojas_colunar
+from .pools import preaquecer
+from .producao import gerar_ativo_colunar, gerar_contas_colunar
+
+# Mesma seed usada nos scripts (Faker.seed(42) / random.seed(42))
+SEED_PADRAO = 42
+
+# O tamanho do shard é fixo (e não derivado do número de workers, do tamanho
+# do lote ou de CARGA_CONCORRENCIA) para que a saída seja a mesma com 1 ou 32
+# processos. 10 mil lojas ocupam uns 25 MB em DataFrame.
+TAMANHO_SHARD_PADRAO = 10_000
+
+
+def processos_de_geracao():
+    """Processos que geram os shards nos scripts (CARGA_PROCESSOS; 1 = no próprio processo)."""
+    return int(os.environ.get('CARGA_PROCESSOS', 1))
+
+
+def seed_do_shard(seed_base, indice):
+    """Seed determinística e independente para o shard `indice` (SeedSequence com spawn_key)."""
+    sequencia = np.random.SeedSequence(seed_base, spawn_key=(indice,))
+    return int(sequencia.generate_state(1, dtype=np.uint64)[0])
+
+
+def dividir_em_shards(chaves, tamanho_shard=TAMANHO_SHARD_PADRAO):
+    chaves = np.asarray(chaves, dtype=np.int64)
+    return [chaves[i:i + tamanho_shard] for i in range(0, len(chaves), tamanho_shard)]
+
+
+def geradores_por_tabela(seed_base=SEED_PADRAO):
+    """Gerador colunar de cada tabela, no formato gerador(chaves, seed=...)."""
+    return {
+        # Os pools do Faker usam a seed base, então são iguais em todos os shards
+        'TB_ESTR_LOJAS': partial(gerar_lojas_colunar, seed_pools=seed_base),
+        'TB_ESTR_CONTAS': gerar_contas_colunar,
+        'TB_ESTR_ATIVO': gerar_ativo_colunar,
+    }
+
+
+def _gerar_shard(gerador, chaves, seed):
+    return gerador(chaves, seed=seed)
+
+
+def gerar_em_paralelo(gerador, chaves, seed_base=SEED_PADRAO, tamanho_shard=TAMANHO_SHARD_PADRAO,
+                      workers=None, primeiro_shard=0, ultimo_shard=None):
+    """
+    Gera os shards em um ProcessPoolExecutor e devolve os DataFrames na ordem das chaves.
+
+    É um gerador: cada shard é entregue assim que fica pronto (respeitando a
+    ordem), e no máximo 2 × workers shards ficam em voo ao mesmo tempo, o que
+    mantém a memória limitada mesmo para dezenas de milhões de linhas.
+    Com workers=1 tudo roda no próprio processo. Com primeiro_shard (retomada)
+    e ultimo_shard (partições), os shards fora do intervalo nem são gerados:
+    os de dentro saem iguais aos de uma geração completa.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = list(enumerate(dividir_em_shards(chaves, tamanho_shard)))[primeiro_shard:ultimo_shard]
+
+    if workers == 1:
+        for indice, chaves_shard in shards:
+            yield _gerar_shard(gerador, chaves_shard, seed_do_shard(seed_base, indice))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        em_voo = deque()
+        for indice, chaves_shard in shards:
+            em_voo.append(executor.submit(_gerar_shard, gerador, chaves_shard, seed_do_shard(seed_base, indice)))
+            if len(em_voo) >= 2 * workers:
+                yield em_voo.popleft().result()
+        while em_voo:
+            yield em_voo.popleft().result()
+
+
+def gerar_tabela(tabela, chaves, seed_base=SEED_PADRAO, tamanho_shard=TAMANHO_SHARD_PADRAO, workers=None):
+    """Gera a tabela inteira e junta os shards em um único DataFrame."""
+    gerador = geradores_por_tabela(seed_base)[tabela]
+    if tabela == 'TB_ESTR_LOJAS':
+        # Gera os pools do Faker uma vez aqui; os workers só abrem os arquivos do cache
+        preaquecer(seed_base)
+    partes = list(gerar_em_paralelo(gerador, chaves, seed_base, tamanho_shard, workers))
+    return pd.concat(partes, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma tabela fictícia em paralelo e mede a vazão.")
+    parser.add_argument('tabela', choices=sorted(geradores_por_tabela()))
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--tamanho-shard', type=int, default=TAMANHO_SHARD_PADRAO)
+    parser.add_argument('--seed', type=int, default=SEED_PADRAO)
+    args = parser.parse_args()
+
+    chaves = np.arange(10000, 10000 + args.linhas, dtype=np.int64)
+    gerador = geradores_por_tabela(args.seed)[args.tabela]
+
+    inicio = time.perf_counter()
+    total = 0
+    for parte in gerar_em_paralelo(gerador, chaves, args.seed, args.tamanho_shard, args.workers):
+        total += len(parte)
+    segundos = time.perf_counter() - inicio
+
+    print(f"✅ {args.tabela}: {total} linhas em {segundos:.2f}s — {total / segundos:,.0f} linhas/s "
+          f"({args.workers or os.cpu_count()} workers)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Pipeline em streaming: as linhas são geradas em blocos e consumidas pelo
+carregador à medida que ficam prontas, sem montar a tabela inteira em memória.
+"""
+
+import tracemalloc
+from datetime import date
+from functools import partial
+
+import numpy as np
+
+from .colunas import linhas_do_dataframe
+from .shards import SEED_PADRAO, TAMANHO_SHARD_PADRAO, gerar_em_paralelo
+
+
+class TetoDeMemoriaExcedido(Exception):
+    pass
+
+
+def linhas_dos_dataframes(dataframes, observar=None):
+    """
+    Achata uma sequência de DataFrames (ex.: shards) em tuplas, um DataFrame por vez.
+    `observar(df)` (ex.: Validador.observar) vê cada DataFrame antes das suas linhas.
+    """
+    for df in dataframes:
+        if observar:
+            observar(df)
+        yield from linhas_do_dataframe(df)
+
+
+def linhas_em_chunks(gerador, chaves, tamanho_chunk=TAMANHO_SHARD_PADRAO, seed_base=SEED_PADRAO, workers=1,
+                     observar=None, inicio=0, fim=None, hoje=None):
+    """
+    Linhas de um gerador colunar, produzidas em blocos (shards) de `tamanho_chunk` chaves.
+
+    O bloco tem tamanho fixo e cada um usa a seed do seu índice, então as
+    linhas não dependem do tamanho do lote, de `workers` (processos que geram
+    os blocos) nem de como a carga é dividida. O pico de memória fica
+    proporcional ao bloco × workers e não ao total de linhas (além do próprio
+    vetor de chaves, 8 bytes por linha). Com `inicio`/`fim` (retomada,
+    partições) saem só as linhas dessas posições, iguais às de uma execução
+    completa: os blocos de fora nem são gerados. Todos os blocos usam a mesma
+    data de referência `hoje` (a do início da chamada, se omitida), então um
+    bloco gerado depois da meia-noite não muda as datas.
+    """
+    fim = len(chaves) if fim is None else fim
+    gerador = partial(gerador, hoje=hoje or date.today())
+    dataframes = gerar_em_paralelo(gerador, chaves, seed_base, tamanho_chunk, workers,
+                                   primeiro_shard=inicio // tamanho_chunk, ultimo_shard=-(-fim // tamanho_chunk))
+    return linhas_dos_dataframes(_fatiar(dataframes, inicio % tamanho_chunk, fim - inicio), observar)
+
+
+def _fatiar(dataframes, pular, quantidade):
+    """Descarta as primeiras `pular` linhas e entrega só as `quantidade` seguintes."""
+    for df in dataframes:
+        if pular:
+            df, pular = df.iloc[pular:], 0
+        if len(df) > quantidade:
+            df = df.iloc[:quantidade]
+        quantidade -= len(df)
+        yield df
+        if quantidade <= 0:
+            break
+
+
+def limites_das_particoes(total, partes, tamanho_chunk=TAMANHO_SHARD_PADRAO):
+    """
+    (inicio, fim) de até `partes` partições de `total` linhas, nas fronteiras
+    dos blocos: cada partição gera blocos inteiros, com as mesmas seeds de
+    uma carga sem partições.
+    """
+    blocos = -(-total // tamanho_chunk)
+    return [(int(grupo[0]) * tamanho_chunk, min(total, (int(grupo[-1]) + 1) * tamanho_chunk))
+            for grupo in np.array_split(np.arange(blocos), partes) if len(grupo)]
+
+
+def particoes_em_chunks(gerador, chaves, partes, tamanho_chunk=TAMANHO_SHARD_PADRAO, seed_base=SEED_PADRAO,
+                        workers=1, observar=None, hoje=None):
+    """
+    As linhas de linhas_em_chunks divididas em até `partes` partições
+    (limites_das_particoes), uma sequência por partição, para
+    carregar_particoes. Os `workers` são repartidos entre elas e todas usam a
+    mesma data de referência: juntas, dão as linhas de uma carga sem partições.
+    """
+    hoje = hoje or date.today()
+    limites = limites_das_particoes(len(chaves), partes, tamanho_chunk)
+    return [linhas_em_chunks(gerador, chaves, tamanho_chunk, seed_base, workers=max(1, workers // len(limites)),
+                             observar=observar, inicio=de, fim=ate, hoje=hoje)
+            for de, ate in limites]
+
+
+class MedicaoMemoria:
+    """
+    Mede o pico de memória alocada (tracemalloc) dentro de um bloco `with`.
+
+        with MedicaoMemoria(teto_bytes=64 * 1024 ** 2) as medicao:
+            carregador.carregar(linhas_em_chunks(...))
+        print(medicao.pico_bytes)
+
+    Com teto_bytes definido, sair do bloco acima do teto levanta
+    TetoDeMemoriaExcedido. NumPy registra suas alocações no tracemalloc,
+    então os arrays dos blocos entram na conta.
+    """
+
+    def __init__(self, teto_bytes=None):
+        self.teto_bytes = teto_bytes
+        self.pico_bytes = 0
+        self._ja_ativo = False
+
+    def __enter__(self):
+        self._ja_ativo = tracemalloc.is_tracing()
+        if not self._ja_ativo:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._base = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, tipo, valor, tb):
+        self.pico_bytes = max(0, tracemalloc.get_traced_memory()[1] - self._base)
+        if not self._ja_ativo:
+            tracemalloc.stop()
+        if tipo is None and self.teto_bytes is not None and self.pico_bytes > self.teto_bytes:
+            raise TetoDeMemoriaExcedido(
+                f"Pico de memória de {self.pico_bytes / 1024 ** 2:.1f} MB "
+                f"acima do teto de {self.teto_bytes / 1024 ** 2:.1f} MB"
+            )
+        return False
@@ -0,0 +1,107 @@
+"""
+Recarga completa sem indisponibilidade: a tabela nova é montada ao lado da
+atual (<tabela>_NOVA) e trocada por sp_rename em uma única transação.
+
+Enquanto a carga roda, as consultas continuam lendo a tabela antiga inteira;
+depois da troca, leem a nova inteira. Chave primária e índices só são criados
+depois da carga, então os inserts não pagam manutenção de índice.
+"""
+
+import time
+
+from .instrumentacao import fase
+
+
+def nome_sombra(tabela):
+    return f"{tabela}_NOVA"
+
+
+def nome_antiga(tabela):
+    return f"{tabela}_ANTIGA"
+
+
+def _drop_se_existe(tabela):
+    return f"IF OBJECT_ID('{tabela}', 'U') IS NOT NULL DROP TABLE {tabela};"
+
+
+def criar_sombra(conn, tabela, ddl_colunas):
+    """Cria <tabela>_NOVA como heap (sem PK/índices), descartando sobras de uma carga interrompida."""
+    sombra = nome_sombra(tabela)
+    cursor = conn.cursor()
+    cursor.execute(_drop_se_existe(sombra))
+    cursor.execute(f"CREATE TABLE {sombra} ({ddl_colunas});")
+    conn.commit()
+    cursor.close()
+    return sombra
+
+
+def criar_indices(conn, tabela, indices, log=print):
+    """Executa as DDLs de `indices` (com {tabela} no lugar do nome) depois da carga."""
+    cursor = conn.cursor()
+    for ddl in indices:
+        ddl = ddl.format(tabela=tabela)
+        inicio = time.perf_counter()
+        cursor.execute(ddl)
+        conn.commit()
+        # Só o CREATE/ALTER, sem o IF NOT EXISTS das DDLs idempotentes
+        log(f"   🗂️ {ddl.strip().splitlines()[-1].strip()} ({time.perf_counter() - inicio:.1f}s)")
+    cursor.close()
+
+
+def sql_troca(tabela):
+    sombra, antiga = nome_sombra(tabela), nome_antiga(tabela)
+    return f"""
+    SET XACT_ABORT ON;
+    BEGIN TRANSACTION;
+        {_drop_se_existe(antiga)}
+        IF OBJECT_ID('{tabela}', 'U') IS NOT NULL
+            EXEC sp_rename '{tabela}', '{antiga}';
+        EXEC sp_rename '{sombra}', '{tabela}';
+    COMMIT TRANSACTION;
+    """
+
+
+def trocar(conn, tabela):
+    """
+    Troca atômica: renomeia a atual para <tabela>_ANTIGA e a sombra para <tabela>.
+    Os dois sp_rename ficam na mesma transação; a antiga é descartada em seguida.
+    """
+    cursor = conn.cursor()
+    cursor.execute(sql_troca(tabela))
+    conn.commit()
+    cursor.execute(_drop_se_existe(nome_antiga(tabela)))
+    conn.commit()
+    cursor.close()
+
+
+def recarregar_com_troca(conn, tabela, ddl_colunas, carregar, indices=(), log=print, manter_sombra=False):
+    """
+    Recarga completa de `tabela` pela sombra:
+
+        criar_sombra → carregar(sombra) → criar_indices → trocar
+
+    `carregar` recebe o nome da sombra e devolve o ResultadoCarga. Se algo falhar
+    antes da troca, a tabela atual fica intacta (a sombra é refeita na próxima).
+    Com `manter_sombra` (retomada, carga.retomada), a sombra de uma carga
+    interrompida é aproveitada em vez de refeita.
+    """
+    if manter_sombra:
+        sombra = nome_sombra(tabela)
+        log(f"♻️ Continuando a carga de {sombra} (a {tabela} atual continua no ar)")
+    else:
+        with fase('ddl'):
+            sombra = criar_sombra(conn, tabela, ddl_colunas)
+        log(f"🪞 Carregando {sombra} (a {tabela} atual continua no ar)")
+
+    with fase('carga'):
+        resultado = carregar(sombra)
+
+    if indices:
+        log(f"🗂️ Criando {len(indices)} índice(s) em {sombra}...")
+        with fase('indices'):
+            criar_indices(conn, sombra, indices, log=log)
+
+    with fase('troca'):
+        trocar(conn, tabela)
+    log(f"🔀 {sombra} promovida a {tabela}")
+    return resultado
@@ -0,0 +1,92 @@
+"""
+Supervisores de supervisor_id/USER_ID e TESTE..users.
+
+HOTLIST.supervisor_id e TRATADAS_HOTLIST.user_id têm FK para TESTE..users,
+então os scripts que gravam supervisor_id/USER_ID pedem a usuarios_da_carga
+os ids que podem usar. TESTE..users é a tabela de login do backend, por isso
+a carga só cadastra contas com opt-in explícito:
+
+    python -m carga --escala SF10 --criar-usuarios
+    CARGA_CRIAR_USUARIOS=1 python estr_municipios_prioratrios.py
+
+Sem ele, as linhas vão só para os supervisores de ids_usuarios() que já estão
+cadastrados (no mínimo os dois usuários de teste, IDS_USUARIOS). Com ele, os
+que faltam são inseridos com uma senha aleatória que não é guardada em lugar
+nenhum (não dá para entrar com essas contas) e os dois usuários de teste
+nunca são tocados.
+"""
+
+import os
+import secrets
+
+from .bulk import carregar_em_lotes
+from .escala import IDS_USUARIOS, ids_usuarios
+
+INSERT_USUARIOS = """
+    INSERT INTO TESTE..users (id, name, funcional, password, role, email)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def criar_usuarios_configurado():
+    """True com CARGA_CRIAR_USUARIOS=1 (python -m carga --criar-usuarios)."""
+    return os.environ.get('CARGA_CRIAR_USUARIOS', '0').lower() in ('1', 'yes', 'true')
+
+
+def linhas_de_usuarios(ids, pular=()):
+    """
+    (id, name, funcional, password, role, email) dos supervisores gerados de
+    `ids`, menos os de `pular`. O número vem da posição em `ids`, então o
+    supervisor é o mesmo qualquer que seja o que já estava cadastrado. A senha
+    é aleatória e descartada: a conta existe só para a FK.
+    """
+    for numero, id_usuario in enumerate(ids, start=1):
+        if id_usuario in IDS_USUARIOS or id_usuario in pular:
+            continue
+        yield (id_usuario, f"Supervisor Carga {numero:05d}", f"CARGA{numero:05d}", secrets.token_hex(32),
+               'supervisor', f"supervisor.carga{numero:05d}@example.com")
+
+
+def usuarios_cadastrados(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT UPPER(CONVERT(VARCHAR(36), id)) FROM TESTE..users")
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def garantir_usuarios(conn, ids=None):
+    """Insere em TESTE..users os supervisores gerados que faltam; devolve quantos entraram."""
+    ids = ids_usuarios() if ids is None else ids
+    if all(id_usuario in IDS_USUARIOS for id_usuario in ids):
+        return 0
+
+    faltantes = list(linhas_de_usuarios(ids, pular=usuarios_cadastrados(conn)))
+    if not faltantes:
+        return 0
+    resultado = carregar_em_lotes(conn, INSERT_USUARIOS, faltantes, tabela='TESTE..users')
+    print(f"👥 {resultado.inseridos} supervisores gerados cadastrados em TESTE..users ({len(ids)} no total)")
+    return resultado.inseridos
+
+
+def usuarios_da_carga(conn, ids=None, criar=None):
+    """
+    Ids para supervisor_id/USER_ID: todos os de ids_usuarios() com
+    CARGA_CRIAR_USUARIOS (os que faltam são cadastrados), senão só os que já
+    existem em TESTE..users (IDS_USUARIOS se nenhum existir).
+    """
+    ids = ids_usuarios() if ids is None else ids
+    criar = criar_usuarios_configurado() if criar is None else criar
+    if criar:
+        garantir_usuarios(conn, ids)
+        return list(ids)
+
+    if all(id_usuario in IDS_USUARIOS for id_usuario in ids):
+        return list(ids)
+    cadastrados = usuarios_cadastrados(conn)
+    existentes = [id_usuario for id_usuario in ids if id_usuario in cadastrados] or list(IDS_USUARIOS)
+    if len(existentes) < len(ids):
+        print(f"⚠️ {len(ids) - len(existentes)} dos {len(ids)} supervisores da escala não estão em TESTE..users; "
+              f"usando os {len(existentes)} cadastrados (--criar-usuarios para cadastrar os demais)")
+    return existentes
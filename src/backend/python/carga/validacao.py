@@ -0,0 +1,293 @@
+"""
+Validação dos dados antes da carga, sobre os blocos colunares em memória.
+
+Em vez de varrer a tabela recém-carregada várias vezes (um GROUP BY por nível
+da hierarquia, um DISTINCT das oito colunas, dois HAVING COUNT(DISTINCT)), o
+Validador olha cada bloco (DataFrame) no caminho entre o gerador e o
+carregador e acumula:
+
+- consistência da hierarquia: cada nó com um único pai e uma única descrição;
+- nulos por coluna (colunas obrigatórias e taxas máximas);
+- unicidade da chave (CHAVE_LOJA);
+- cobertura da chave estrangeira: toda CHAVE_LOJA de TB_ESTR_CONTAS com loja;
+- lojas por nó da hierarquia (a distribuição que era exibida pelo servidor).
+
+Erros de um bloco (hierarquia inconsistente, nulo em coluna obrigatória)
+interrompem a carga antes de o bloco ir para o banco. Os que dependem da
+tabela inteira (chave repetida entre blocos, cobertura) saem de concluir(),
+chamado antes da troca da sombra: com erro, a tabela atual continua no ar.
+
+    validador = validador_lojas(chaves_contas)
+    dados = validador.linhas(linhas, COLUNAS_LOJAS)     # ou linhas_em_chunks(..., observar=validador.observar)
+    carregar(dados)
+    validador.concluir().imprimir()
+
+Quando uma conferência no servidor ainda for desejada, conferir_no_servidor()
+faz tudo em uma leitura só (GROUPING SETS).
+"""
+
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .bulk import em_lotes, tamanho_lote_padrao
+from .hierarquia import COLUNAS_HIERARQUIA, NIVEIS
+
+
+# Títulos da distribuição por nível (os mesmos da verificação antiga do estr_lojas.py)
+ROTULOS_NIVEIS = {
+    'diretoria': 'Diretorias',
+    'gerencia': 'Gerências de Área',
+    'coordenacao': 'Coordenações',
+    'supervisao': 'Supervisões',
+}
+
+
+class ErroDeValidacao(Exception):
+    pass
+
+
+@dataclass
+class RelatorioValidacao:
+    tabela: str = ''
+    linhas: int = 0
+    nulos: dict = field(default_factory=dict)        # coluna -> quantidade
+    duplicadas: int = 0                              # linhas com chave repetida
+    sem_cadastro: int = 0                            # chaves da referência sem linha na tabela
+    conflitos: list = field(default_factory=list)    # mensagens de hierarquia inconsistente
+    problemas: list = field(default_factory=list)
+    por_nivel: dict = field(default_factory=dict)    # nível -> Counter(chave -> linhas)
+    descricoes: dict = field(default_factory=dict)   # nível -> {chave: descrição}
+
+    @property
+    def ok(self):
+        return not self.problemas
+
+    def taxa_nulos(self, coluna):
+        return self.nulos.get(coluna, 0) / self.linhas if self.linhas else 0.0
+
+    def imprimir(self, log=print, maximo=20):
+        log(f"\n📊 Distribuição das Hierarquias ({self.tabela}, {self.linhas} linhas):")
+        for nivel, _, _ in NIVEIS:
+            contagem = self.por_nivel.get(nivel)
+            if not contagem:
+                continue
+            log(f"\n🏢 {ROTULOS_NIVEIS.get(nivel, nivel)} ({len(contagem)}):")
+            descricoes = self.descricoes.get(nivel, {})
+            for chave, qtd in sorted(contagem.items(), key=lambda item: str(descricoes.get(item[0], item[0])))[:maximo]:
+                log(f"   {descricoes.get(chave, chave)} ({chave}): {qtd} lojas")
+            if len(contagem) > maximo:
+                log(f"   ... e mais {len(contagem) - maximo}")
+
+        com_nulos = [(c, self.taxa_nulos(c)) for c, qtd in self.nulos.items() if qtd]
+        if com_nulos:
+            log("\n🕳️ Nulos: " + ', '.join(f"{c} {taxa:.1%}" for c, taxa in com_nulos))
+
+        if self.ok:
+            log("\n✅ Hierarquia consistente, chave única e sem nulos em colunas obrigatórias")
+        else:
+            log("\n❌ Problemas encontrados:")
+            for problema in self.problemas:
+                log(f"   {problema}")
+
+
+class Validador:
+    """
+    Acumula as verificações bloco a bloco. Pode ser alimentado por várias
+    threads ao mesmo tempo (partições simultâneas).
+    """
+
+    def __init__(self, tabela='', chave='CHAVE_LOJA', obrigatorias=(), taxas_maximas=None,
+                 chaves_referencia=None, niveis=NIVEIS):
+        self.tabela = tabela
+        self.chave = chave
+        self.obrigatorias = list(obrigatorias)
+        self.taxas_maximas = dict(taxas_maximas or {})
+        self.chaves_referencia = chaves_referencia
+        self.niveis = niveis
+        self.relatorio = RelatorioValidacao(tabela=tabela)
+        self._pais = {nivel: {} for nivel, _, _ in niveis}
+        self._chaves = []
+        self._trava = threading.Lock()
+
+    def observar(self, df):
+        """Confere um bloco; levanta ErroDeValidacao se ele não pode ir para o banco."""
+        nulos = df.isna().sum()
+        chaves = df[self.chave].to_numpy(dtype=np.int64, na_value=-1) if self.chave in df else None
+        pares = self._pares(df)
+
+        with self._trava:
+            r = self.relatorio
+            r.linhas += len(df)
+            for coluna, qtd in nulos.items():
+                r.nulos[coluna] = r.nulos.get(coluna, 0) + int(qtd)
+            if chaves is not None:
+                self._chaves.append(chaves)
+            erros = [f"{coluna}: {int(nulos[coluna])} nulos em coluna obrigatória"
+                     for coluna in self.obrigatorias if nulos.get(coluna, 0)]
+            erros += self._acumular_hierarquia(pares)
+
+        if erros:
+            raise ErroDeValidacao(f"{self.tabela}: " + '; '.join(erros))
+
+    def _pares(self, df):
+        """(chave, pai, descrição) distintos e lojas por nó, para cada nível presente no bloco."""
+        pares = {}
+        coluna_pai = None
+        for nivel, coluna_chave, coluna_desc in self.niveis:
+            if coluna_chave in df:
+                colunas = [coluna_chave, coluna_pai if coluna_pai in df else None,
+                           coluna_desc if coluna_desc in df else None]
+                distintos = df[[c for c in colunas if c]].drop_duplicates()
+                valores = [distintos[c].tolist() if c else [None] * len(distintos) for c in colunas]
+                pares[nivel] = (list(zip(*valores)), df[coluna_chave].value_counts())
+            coluna_pai = coluna_chave
+        return pares
+
+    def _acumular_hierarquia(self, pares):
+        erros = []
+        r = self.relatorio
+        for nivel, (distintos, contagem) in pares.items():
+            vistos = self._pais[nivel]
+            descricoes = r.descricoes.setdefault(nivel, {})
+            for chave, pai, desc in distintos:
+                if pd.isna(chave):
+                    continue
+                chave = int(chave)
+                if pai is not None and not pd.isna(pai) and vistos.setdefault(chave, int(pai)) != int(pai):
+                    erros.append(f"{nivel} {chave} pertence a mais de um pai ({vistos[chave]} e {int(pai)})")
+                if desc is not None and not pd.isna(desc) and descricoes.setdefault(chave, desc) != desc:
+                    erros.append(f"{nivel} {chave} aparece como '{descricoes[chave]}' e '{desc}'")
+            contador = r.por_nivel.setdefault(nivel, Counter())
+            for chave, qtd in contagem.items():
+                contador[int(chave)] += int(qtd)
+        r.conflitos.extend(erros)
+        return erros
+
+    def dataframes(self, dataframes):
+        """Repassa os DataFrames depois de conferir cada um."""
+        for df in dataframes:
+            self.observar(df)
+            yield df
+
+    def linhas(self, linhas, colunas, tamanho_lote=None):
+        """Repassa tuplas (modo linha a linha, arquivos) conferindo um lote de cada vez."""
+        for lote in em_lotes(linhas, tamanho_lote or tamanho_lote_padrao()):
+            self.observar(pd.DataFrame.from_records(lote, columns=colunas))
+            yield from lote
+
+    def observar_tabela(self, cursor, tabela, colunas, tamanho_lote=None):
+        """Confere linhas já gravadas (ex.: a sombra de uma carga retomada), um lote por vez."""
+        cursor.execute(f"SELECT {', '.join(colunas)} FROM {tabela}")
+        while True:
+            lote = cursor.fetchmany(tamanho_lote or tamanho_lote_padrao())
+            if not lote:
+                break
+            self.observar(pd.DataFrame.from_records([tuple(linha) for linha in lote], columns=colunas))
+
+    def concluir(self, falhar=True):
+        """Verificações da tabela inteira; com falhar=True, levanta ErroDeValidacao se houver problema."""
+        r = self.relatorio
+        chaves = np.concatenate(self._chaves) if self._chaves else np.empty(0, dtype=np.int64)
+        unicas = np.unique(chaves)
+        r.duplicadas = len(chaves) - len(unicas)
+        if self.chaves_referencia is not None:
+            referencia = np.unique(np.asarray(self.chaves_referencia, dtype=np.int64))
+            r.sem_cadastro = int((~np.isin(referencia, unicas)).sum())
+
+        r.problemas = list(r.conflitos)
+        r.problemas += [f"{c}: {r.nulos[c]} nulos em coluna obrigatória"
+                        for c in self.obrigatorias if r.nulos.get(c)]
+        r.problemas += [f"{c}: {r.taxa_nulos(c):.1%} de nulos (máximo {maximo:.1%})"
+                        for c, maximo in self.taxas_maximas.items() if r.taxa_nulos(c) > maximo]
+        if r.duplicadas:
+            r.problemas.append(f"{self.chave}: {r.duplicadas} linhas com chave repetida")
+        if r.sem_cadastro:
+            r.problemas.append(f"{self.chave}: {r.sem_cadastro} chaves da referência sem linha em {self.tabela}")
+
+        if falhar and r.problemas:
+            raise ErroDeValidacao(f"{self.tabela}: " + '; '.join(r.problemas))
+        return r
+
+
+def conferencia_no_servidor():
+    """True com CARGA_CONFERIR_SERVIDOR=1."""
+    return os.environ.get('CARGA_CONFERIR_SERVIDOR', '0').lower() in ('1', 'yes', 'true')
+
+
+def validador_lojas(chaves_contas=None):
+    """Validador da TB_ESTR_LOJAS; `chaves_contas` são as CHAVE_LOJA de TB_ESTR_CONTAS."""
+    return Validador('TB_ESTR_LOJAS', chave='CHAVE_LOJA', obrigatorias=['CHAVE_LOJA'] + COLUNAS_HIERARQUIA,
+                     chaves_referencia=chaves_contas)
+
+
+def sql_conferencia(tabela='TB_ESTR_LOJAS', chave='CHAVE_LOJA'):
+    """
+    Uma leitura da tabela com GROUPING SETS: lojas, pais distintos e descrições
+    distintas por nó de cada nível, e no TOTAL as linhas e chaves distintas.
+    """
+    nivel = '\n'.join(f"            WHEN GROUPING({coluna}) = 0 THEN '{nome.upper()}'" for nome, coluna, _ in NIVEIS)
+    no = '\n'.join(f"            WHEN GROUPING({coluna}) = 0 THEN {coluna}" for _, coluna, _ in NIVEIS)
+    descricao = '\n'.join(f"            WHEN GROUPING({coluna}) = 0 THEN MAX({desc})" for _, coluna, desc in NIVEIS)
+    descricoes = '\n'.join(f"            WHEN GROUPING({coluna}) = 0 THEN COUNT(DISTINCT {desc})"
+                           for _, coluna, desc in NIVEIS)
+    pais = '\n'.join(f"            WHEN GROUPING({coluna}) = 0 THEN COUNT(DISTINCT {pai})"
+                     for (_, pai, _), (_, coluna, _) in zip(NIVEIS, NIVEIS[1:]))
+    nulos = ' OR '.join(f"{coluna} IS NULL" for coluna in COLUNAS_HIERARQUIA)
+    conjuntos = ', '.join(f"({coluna})" for _, coluna, _ in NIVEIS)
+    return f"""
+    SELECT
+        CASE
+{nivel}
+        ELSE 'TOTAL' END AS NIVEL,
+        CASE
+{no}
+        END AS CHAVE,
+        CASE
+{descricao}
+        END AS DESCRICAO,
+        COUNT(*) AS LINHAS,
+        CASE
+{pais}
+        ELSE 1 END AS PAIS,
+        CASE
+{descricoes}
+        ELSE 1 END AS DESCRICOES,
+        COUNT(DISTINCT {chave}) AS CHAVES_DISTINTAS,
+        SUM(CASE WHEN {nulos} THEN 1 ELSE 0 END) AS NULOS_HIERARQUIA
+    FROM {tabela}
+    GROUP BY GROUPING SETS ({conjuntos}, ())
+    """
+
+
+def conferir_no_servidor(cursor, tabela='TB_ESTR_LOJAS', chave='CHAVE_LOJA'):
+    """Executa sql_conferencia e devolve o RelatorioValidacao correspondente."""
+    r = RelatorioValidacao(tabela=tabela)
+    cursor.execute(sql_conferencia(tabela, chave))
+    for nivel, no, descricao, linhas, pais, descricoes, distintas, nulos in cursor.fetchall():
+        if nivel == 'TOTAL':
+            r.linhas = linhas
+            r.duplicadas = linhas - distintas
+            r.nulos['HIERARQUIA'] = nulos or 0
+            continue
+        if no is None:
+            # Lojas sem o nó preenchido: já contadas em NULOS_HIERARQUIA
+            continue
+        nivel = nivel.lower()
+        r.por_nivel.setdefault(nivel, Counter())[no] = linhas
+        r.descricoes.setdefault(nivel, {})[no] = descricao
+        if pais > 1:
+            r.conflitos.append(f"{nivel} {no} pertence a {pais} pais")
+        if descricoes > 1:
+            r.conflitos.append(f"{nivel} {no} aparece com {descricoes} descrições")
+
+    r.problemas = list(r.conflitos)
+    if r.duplicadas:
+        r.problemas.append(f"{chave}: {r.duplicadas} linhas com chave repetida")
+    if r.nulos.get('HIERARQUIA'):
+        r.problemas.append(f"{r.nulos['HIERARQUIA']} linhas sem hierarquia completa")
+    return r
@@ -0,0 +1,107 @@
+"""
+Conexões compartilhadas pelos scripts Python de carga.
+
+    import db
+
+    conn = db.conectar(db.config().banco_dw)
+    ...
+    db.liberar(conn)
+
+ou, com bloco `with`:
+
+    with db.conexao() as conn:
+        ...
+
+Servidor, usuário e senha vêm do ambiente ou do .env (DB_SERVER, DB_USER,
+DB_PASSWORD, ...). As conexões ficam em um pool por banco, então scripts
+encadeados no mesmo processo reaproveitam conexões já autenticadas.
+"""
+
+import atexit
+import threading
+from dataclasses import replace
+
+from .config import ConfigBanco, carregar_env
+from .pool import PoolConexoes, PoolEsgotado
+
+_config = None
+_pools = {}
+_pool_da_conexao = {}
+_lock = threading.Lock()
+
+
+def config():
+    global _config
+    if _config is None:
+        _config = ConfigBanco.do_ambiente()
+    return _config
+
+
+def _conectar_pyodbc(database):
+    import pyodbc
+
+    conn_str = config().conn_str(database)
+    return lambda: pyodbc.connect(conn_str)
+
+
+def obter_pool(database=None, conectar=None):
+    """Pool do banco informado (padrão: DB_DATABASE, 'TESTE'); criado na primeira chamada."""
+    database = database or config().banco_teste
+    with _lock:
+        if database not in _pools:
+            _pools[database] = PoolConexoes(
+                conectar or _conectar_pyodbc(database),
+                tamanho_max=config().pool_tamanho,
+                tempo_max=config().pool_tempo_max,
+            )
+        return _pools[database]
+
+
+def conectar(database=None):
+    pool = obter_pool(database)
+    conn = pool.obter()
+    with _lock:
+        _pool_da_conexao[id(conn)] = pool
+    return conn
+
+
+def liberar(conn):
+    """Devolve ao pool uma conexão obtida com conectar()."""
+    with _lock:
+        pool = _pool_da_conexao.pop(id(conn), None)
+    if pool is None:
+        conn.close()
+    else:
+        pool.devolver(conn)
+
+
+def conexao(database=None):
+    return obter_pool(database).conexao()
+
+
+def dimensionar_pools(tamanho_min):
+    """
+    Pelo menos `tamanho_min` conexões por banco, nos pools já criados e nos
+    próximos (ex.: o orquestrador, com --workers tabelas em paralelo e as
+    partições de CARGA_CONCORRENCIA). DB_POOL_TAMANHO maior prevalece.
+    """
+    global _config
+    atual = config()
+    if atual.pool_tamanho >= tamanho_min:
+        return
+    with _lock:
+        _config = replace(atual, pool_tamanho=tamanho_min)
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.dimensionar(tamanho_min)
+
+
+def fechar_pools():
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.fechar_todas()
+
+
+atexit.register(fechar_pools)
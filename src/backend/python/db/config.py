@@ -0,0 +1,71 @@
+"""Configuração de conexão dos scripts Python, lida do ambiente ou do .env."""
+
+import os
+from dataclasses import dataclass
+
+# Raiz do projeto (onde fica o .env usado também pelo backend Node)
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
+
+
+def carregar_env(caminhos=None):
+    """
+    Lê arquivos .env (KEY=VALUE) para os.environ sem sobrescrever o que já existe.
+
+    Como no config.js do backend: primeiro o .env do diretório atual, depois o
+    da raiz do projeto.
+    """
+    caminhos = caminhos or [os.path.join(os.getcwd(), '.env'), os.path.join(RAIZ_PROJETO, '.env')]
+    for caminho in caminhos:
+        if not os.path.isfile(caminho):
+            continue
+        with open(caminho, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                linha = linha.strip()
+                if not linha or linha.startswith('#') or '=' not in linha:
+                    continue
+                chave, valor = linha.split('=', 1)
+                os.environ.setdefault(chave.strip(), valor.strip().strip('"').strip("'"))
+
+
+@dataclass(frozen=True)
+class ConfigBanco:
+    server: str
+    username: str
+    password: str
+    driver: str = 'ODBC Driver 17 for SQL Server'
+    trust_server_certificate: bool = True
+    # Autenticação integrada (Windows/Kerberos): sem usuário e senha na conexão nem no bcp
+    trusted_connection: bool = False
+    banco_teste: str = 'TESTE'
+    banco_dw: str = 'DATAWAREHOUSE'
+    pool_tamanho: int = 4
+    pool_tempo_max: float = 1800.0
+
+    @classmethod
+    def do_ambiente(cls):
+        carregar_env()
+        return cls(
+            server=os.environ.get('DB_SERVER', 'DESKTOP-G4V6794'),
+            username=os.environ.get('DB_USER', 'sa'),
+            password=os.environ.get('DB_PASSWORD', 'expresso'),
+            driver=os.environ.get('DB_DRIVER', 'ODBC Driver 17 for SQL Server'),
+            trust_server_certificate=os.environ.get('DB_TRUST_SERVER_CERTIFICATE', 'yes').lower() in ('1', 'yes', 'true'),
+            trusted_connection=os.environ.get('DB_TRUSTED_CONNECTION', 'no').lower() in ('1', 'yes', 'true'),
+            banco_teste=os.environ.get('DB_DATABASE', 'TESTE'),
+            banco_dw=os.environ.get('DB_DATABASE_DW', 'DATAWAREHOUSE'),
+            pool_tamanho=int(os.environ.get('DB_POOL_TAMANHO', 4)),
+            pool_tempo_max=float(os.environ.get('DB_POOL_TEMPO_MAX', 1800)),
+        )
+
+    def conn_str(self, database):
+        if self.trusted_connection:
+            autenticacao = "Trusted_Connection=yes;"
+        else:
+            autenticacao = f"UID={self.username};PWD={self.password};"
+        return (
+            f"DRIVER={{{self.driver}}};"
+            f"SERVER={self.server};"
+            f"DATABASE={database};"
+            f"{autenticacao}"
+            f"TrustServerCertificate={'yes' if self.trust_server_certificate else 'no'};"
+        )
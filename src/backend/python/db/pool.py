@@ -0,0 +1,148 @@
+import threading
+import time
+
+
+class PoolEsgotado(Exception):
+    pass
+
+
+class PoolConexoes:
+    """
+    Pool de conexões DB-API reaproveitáveis entre scripts do mesmo processo.
+
+    `conectar` é a fábrica de conexões (pyodbc.connect com a conn_str, ou
+    sqlite3.connect em testes locais). Ao emprestar uma conexão ociosa, o
+    pool roda `sql_validacao` para confirmar que ela continua viva e descarta
+    conexões mais antigas que `tempo_max` segundos.
+    """
+
+    def __init__(self, conectar, tamanho_max=4, tempo_max=1800.0, sql_validacao='SELECT 1', timeout=30.0):
+        self._conectar = conectar
+        self.tamanho_max = tamanho_max
+        self.tempo_max = tempo_max
+        self.sql_validacao = sql_validacao
+        self.timeout = timeout
+        self._ociosas = []          # [(conexão, criada_em)]
+        self._criada_em = {}        # id(conexão) -> instante da criação
+        self._emprestadas = 0
+        self._cond = threading.Condition()
+        self.criadas = 0
+        self.reaproveitadas = 0
+
+    def _saudavel(self, conn, criada_em):
+        if time.monotonic() - criada_em > self.tempo_max:
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.sql_validacao)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _fechar(self, conn):
+        self._criada_em.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def obter(self):
+        prazo = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._ociosas:
+                        # Reserva a ociosa; a validação roda fora do lock
+                        conn, criada_em = self._ociosas.pop()
+                        self._emprestadas += 1
+                        break
+
+                    if self._emprestadas < self.tamanho_max:
+                        self._emprestadas += 1
+                        conn = None
+                        break
+
+                    restante = prazo - time.monotonic()
+                    if restante <= 0:
+                        raise PoolEsgotado(f"Nenhuma conexão livre após {self.timeout:.0f}s "
+                                           f"(máximo de {self.tamanho_max})")
+                    self._cond.wait(restante)
+
+            if conn is None:
+                break
+            # O SELECT 1 é uma ida ao banco: quem pede outra conexão não espera por ele
+            if self._saudavel(conn, criada_em):
+                with self._cond:
+                    self.reaproveitadas += 1
+                return conn
+            self._fechar(conn)
+            with self._cond:
+                self._emprestadas -= 1
+                self._cond.notify()
+
+        # Abre a conexão fora do lock: o login ODBC é a parte lenta
+        try:
+            conn = self._conectar()
+        except Exception:
+            with self._cond:
+                self._emprestadas -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._criada_em[id(conn)] = time.monotonic()
+            self.criadas += 1
+        return conn
+
+    def devolver(self, conn):
+        try:
+            # Não deixa transação pendente para o próximo usuário da conexão
+            conn.rollback()
+            saudavel = True
+        except Exception:
+            saudavel = False
+
+        with self._cond:
+            self._emprestadas -= 1
+            if saudavel:
+                self._ociosas.append((conn, self._criada_em.get(id(conn), time.monotonic())))
+            else:
+                self._fechar(conn)
+            self._cond.notify()
+
+    @property
+    def livres(self):
+        """Conexões que ainda podem ser emprestadas sem esperar (ociosas ou a abrir)."""
+        with self._cond:
+            return self.tamanho_max - self._emprestadas
+
+    def dimensionar(self, tamanho_max):
+        """Aumenta o máximo de conexões; nunca diminui (as emprestadas continuam valendo)."""
+        with self._cond:
+            if tamanho_max > self.tamanho_max:
+                self.tamanho_max = tamanho_max
+                self._cond.notify_all()
+
+    def fechar_todas(self):
+        with self._cond:
+            while self._ociosas:
+                conn, _ = self._ociosas.pop()
+                self._fechar(conn)
+
+    def conexao(self):
+        return _ConexaoEmprestada(self)
+
+
+class _ConexaoEmprestada:
+    def __init__(self, pool):
+        self.pool = pool
+        self.conn = None
+
+    def __enter__(self):
+        self.conn = self.pool.obter()
+        return self.conn
+
+    def __exit__(self, tipo, valor, tb):
+        self.pool.devolver(self.conn)
+        return False
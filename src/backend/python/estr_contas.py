@@ -1,89 +1,94 @@
-import pandas as pd
-from faker import Faker
-import random
-import uuid
-from datetime import datetime
-import pyodbc
-
-# Conexão com o SQL Server
-server = 'DESKTOP-G4V6794'
-database = 'TESTE'
-username = 'sa'
-password = 'expresso'
-
-conn_str = f"""
-    DRIVER={{ODBC Driver 17 for SQL Server}};
-    SERVER={server};
-    DATABASE={database};
-    UID={username};
-    PWD={password};
-    TrustServerCertificate=yes;
-"""
-
-
-# Atualizando conexão para o banco DATAWAREHOUSE
-database = 'DATAWAREHOUSE'
-
-conn_str = f"""
-    DRIVER={{ODBC Driver 17 for SQL Server}};
-    SERVER={server};
-    DATABASE={database};
-    UID={username};
-    PWD={password};
-    TrustServerCertificate=yes;
-"""
-
-# Conectar ao banco
-conn = pyodbc.connect(conn_str)
-cursor = conn.cursor()
-
-# Criar a tabela
-create_table_sql = """
-IF OBJECT_ID('TB_ESTR_CONTAS', 'U') IS NOT NULL
-    DROP TABLE TB_ESTR_CONTAS;
-
-CREATE TABLE TB_ESTR_CONTAS (
-    CHAVE_LOJA INT PRIMARY KEY,
-    DT_ULT_AB_CONTA DATE,
-    MES_M3 INT,
-    MES_M2 INT,
-    MES_M1 INT,
-    MES_M0 INT
-);
-"""
-
-cursor.execute(create_table_sql)
-conn.commit()
-
-# Gerar dados fictícios
-fake = Faker()
-num_registros = 2500    
-dados = []
-
-# Gerar chaves únicas para evitar violação de PRIMARY KEY
-chaves_unicas = random.sample(range(10000, 999999), num_registros)
-
-for i in range(num_registros):
-    chave_loja = chaves_unicas[i]
-    dt_ult_ab_conta = fake.date_between(start_date='-1y', end_date='today')
-    mes_m3 = random.randint(0, 50)
-    mes_m2 = random.randint(0, 50)
-    mes_m1 = random.randint(0, 50)
-    mes_m0 = random.randint(0, 50)
-    
-    dados.append((chave_loja, dt_ult_ab_conta, mes_m3, mes_m2, mes_m1, mes_m0))
-
-# Inserir os dados
-insert_sql = """
-INSERT INTO TB_ESTR_CONTAS (CHAVE_LOJA, DT_ULT_AB_CONTA, MES_M3, MES_M2, MES_M1, MES_M0)
-VALUES (?, ?, ?, ?, ?, ?)
-"""
-
-for linha in dados:
-    cursor.execute(insert_sql, linha)
-
-conn.commit()
-cursor.close()
-conn.close()
-
-print("✅ Tabela TB_ESTR_CONTAS criada e populada com sucesso!")
+import sys
+
+import db
+from carga.arquivos import linhas_de_arquivos, pasta_de_arquivos
+from carga.bcp import carregar_tabela
+from carga.chaves import chaves_loja
+from carga.escala import linhas_padrao
+from carga.esquema import aplicar_esquema
+from carga.incremental import tabela_existe, virada_incremental
+from carga.instrumentacao import fase, instrumentado
+from carga.rollup import atualizar_rollup
+from carga.producao import COLUNAS_CONTAS, DDL_COLUNAS_CONTAS, gerar_contas_colunar
+from carga.shards import SEED_PADRAO, processos_de_geracao
+from carga.stream import linhas_em_chunks
+
+# Quantidade padrão de lojas geradas (pode ser alterada pelo orquestrador: --rows, ou pela escala: CARGA_ESCALA)
+LINHAS_PADRAO = 2500
+
+# python estr_contas.py --incremental  → vira o mês (MES_M3..MES_M0) via staging + MERGE, sem DROP
+MODO_INCREMENTAL = '--incremental' in sys.argv
+
+# python estr_contas.py --de-arquivos PASTA  → carrega o que foi exportado por carga.arquivos
+PASTA_ARQUIVOS = pasta_de_arquivos()
+
+
+@instrumentado('TB_ESTR_CONTAS')
+def main(linhas=None, incremental=None, arquivos=None):
+    modo_incremental = MODO_INCREMENTAL if incremental is None else incremental
+    pasta_arquivos = PASTA_ARQUIVOS if arquivos is None else arquivos
+
+    # Conectar ao banco (pool compartilhado, configurado via .env)
+    with fase('conectar'):
+        conn = db.conectar(db.config().banco_dw)
+    try:
+        cursor = conn.cursor()
+
+        if modo_incremental and tabela_existe(conn, 'TB_ESTR_CONTAS'):
+            with fase('ler_chaves'):
+                cursor.execute("SELECT CHAVE_LOJA FROM TB_ESTR_CONTAS")
+                chaves = [row[0] for row in cursor.fetchall()]
+            virada_incremental(conn, 'TB_ESTR_CONTAS', COLUNAS_CONTAS, chaves, maximo_mes=50)
+            aplicar_esquema(conn, 'TB_ESTR_CONTAS')
+            atualizar_rollup(conn, ['CONTAS'])
+            print("✅ Tabela TB_ESTR_CONTAS atualizada (virada incremental)!")
+            return
+
+        # Criar a tabela
+        create_table_sql = f"""
+        IF OBJECT_ID('TB_ESTR_CONTAS', 'U') IS NOT NULL
+            DROP TABLE TB_ESTR_CONTAS;
+
+        CREATE TABLE TB_ESTR_CONTAS ({DDL_COLUNAS_CONTAS});
+        """
+
+        with fase('ddl'):
+            cursor.execute(create_table_sql)
+            conn.commit()
+
+        # Gerar dados fictícios
+        num_registros = linhas or linhas_padrao('TB_ESTR_CONTAS', LINHAS_PADRAO)
+
+        # Chaves únicas (sem violação de PRIMARY KEY) alocadas de uma vez, sem limite de 1 milhão
+        chaves_unicas = chaves_loja(num_registros, seed=SEED_PADRAO)
+
+        if pasta_arquivos:
+            # Linhas exportadas antes (python -m carga.arquivos exportar), sem gerar de novo
+            dados = linhas_de_arquivos(pasta_arquivos, 'TB_ESTR_CONTAS', COLUNAS_CONTAS)
+        else:
+            # Gerado com NumPy em blocos de tamanho fixo (CARGA_PROCESSOS=N: em N processos),
+            # entregues ao carregador à medida que ficam prontos
+            dados = linhas_em_chunks(gerar_contas_colunar, chaves_unicas, workers=processos_de_geracao())
+
+        # Inserir os dados (executemany em lotes, ou bcp/BULK INSERT com CARGA_ESTRATEGIA)
+        with fase('carga'):
+            resultado = carregar_tabela(conn, 'TB_ESTR_CONTAS', COLUNAS_CONTAS, DDL_COLUNAS_CONTAS, dados,
+                                        tabela='TB_ESTR_CONTAS', database=db.config().banco_dw)
+        print(f"⏱️ {resultado.resumo()}")
+
+        # Índices do pacote carga.esquema (columnstore com CARGA_COLUMNSTORE=1)
+        aplicar_esquema(conn, 'TB_ESTR_CONTAS')
+
+        # Agregados por nó da hierarquia lidos pelas métricas do dashboard
+        atualizar_rollup(conn, ['CONTAS'])
+
+        print("✅ Tabela TB_ESTR_CONTAS criada e populada com sucesso!")
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        # Devolve a conexão ao pool mesmo se a geração ou a carga falhar
+        db.liberar(conn)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,495 +1,340 @@
-import pandas as pd
-from faker import Faker
-import random
-from datetime import datetime, timedelta
-import pyodbc
-
-# Conectar ao banco de dados
-server = 'DESKTOP-G4V6794'
-database = 'DATAWAREHOUSE'
-username = 'sa'
-password = 'expresso'
-
-conn_str = f"""
-    DRIVER={{ODBC Driver 17 for SQL Server}};
-    SERVER={server};
-    DATABASE={database};
-    UID={username};
-    PWD={password};
-    TrustServerCertificate=yes;
-"""
-
-try:
-    conn = pyodbc.connect(conn_str)
-    cursor = conn.cursor()
-
-    # Criar a tabela TB_ESTR_LOJAS
-    create_table_sql = """
-    IF OBJECT_ID('TB_ESTR_LOJAS', 'U') IS NOT NULL
-        DROP TABLE TB_ESTR_LOJAS;
-
-    CREATE TABLE TB_ESTR_LOJAS (
-        CHAVE_LOJA INT PRIMARY KEY,
-        CNPJ VARCHAR(18),
-        NOME_LOJA VARCHAR(255),
-        DESC_SEGTO VARCHAR(50),
-        COD_AG_RELACIONAMENTO INT,
-        NR_PACB INT,
-        AG_RELACIONAMENTO VARCHAR(255),
-        CHAVE_PAA INT,
-        NOME_PAA VARCHAR(255),
-        DT_ENVIO_VAN DATE,
-        DT_INAUGURACAO DATE,
-        DT_INAUGURACAO_BACEN DATE,
-        DT_ENCERRAMENTO_BACEN DATE,
-        MOTIVO_ENCERRAMENTO VARCHAR(255),
-        DT_RETIRADA_EQTO DATE,
-        STATUS_TABLET VARCHAR(50),
-        DT_IMPLANTACAO_TABLET DATE,
-        DT_RETIRADA_TABLET DATE,
-        GTE_RESP_LOJA VARCHAR(255),
-        TELEFONE_PADRAO VARCHAR(20),
-        DT_BLOQUEIO DATE,
-        MOTIVO_BLOQUEIO VARCHAR(255),
-        TIPO_POSTO VARCHAR(50),
-        BE_AVANCADO BIT,
-        BE_ORG_PAGADOR BIT,
-        BE_PLATAFORMA BIT,
-        ENDERECO VARCHAR(500),
-        COD_IBGE INT,
-        MUNICIPIO VARCHAR(255),
-        UF CHAR(2),
-        QUADRANTE VARCHAR(50),
-        COD_MULT INT,
-        MULTIPLICADOR VARCHAR(255),
-        DIRE_REG INT,
-        DIR_REGIONAL VARCHAR(255),
-        COD_GER_REG INT,
-        GER_REGIONAL VARCHAR(255),
-        CHAVE_GERENCIA_AREA INT,
-        DESC_GERENCIA_AREA VARCHAR(255),
-        CHAVE_COORDENACAO INT,
-        DESC_COORDENACAO VARCHAR(255),
-        CHAVE_SUPERVISAO INT,
-        DESC_SUPERVISAO VARCHAR(255),
-        COD_ILHA INT,
-        DESC_ILHA VARCHAR(255),
-        NOME_ILHA VARCHAR(255),
-        CHAVE_GERENCIA_NEGOCIO INT,
-        DESC_GERENCIA_NEGOCIO VARCHAR(255),
-        SITUACAO VARCHAR(50),
-        DT_ULT_TRANSACAO DATE,
-        HABILITADO_CONTA BIT,
-        HABILITADO_MICRO BIT,
-        HABILITADO_LIME BIT,
-        HABILITADO_CONSIG BIT,
-        SALDO_CX DECIMAL(15,2),
-        LIMITE DECIMAL(15,2)
-    );
-    """
-
-    cursor.execute(create_table_sql)
-    conn.commit()
-    print("✅ Tabela TB_ESTR_LOJAS criada com sucesso!")
-
-    # Buscar CHAVE_LOJA da TB_ESTR_CONTAS
-    try:
-        cursor.execute("SELECT CHAVE_LOJA FROM TB_ESTR_CONTAS")
-        chaves_loja = [row[0] for row in cursor.fetchall()]
-        
-        if not chaves_loja:
-            print("⚠️ Nenhuma CHAVE_LOJA encontrada na TB_ESTR_CONTAS. Gerando chaves fictícias.")
-            chaves_loja = random.sample(range(10000, 999999), 2500)
-            
-    except Exception as e:
-        print(f"⚠️ Erro ao buscar dados da TB_ESTR_CONTAS: {e}")
-        print("Gerando chaves fictícias...")
-        chaves_loja = random.sample(range(10000, 999999), 2500)
-
-    fake = Faker('pt_BR')
-    segmentos = ['Mercado', 'Farmácia', 'Vestuário', 'Padaria', 'Posto']
-    status_tablet_opcoes = ['RETIRADO', 'S/ TABLET', 'INSTALADO']
-    tipo_posto_opcoes = ['TRADICIONAL']
-    quadrantes = ['PRESENÇA', 'PA', 'AGÊNCIA']
-    situacoes = ['ATIVA', 'BLOQUEADO', 'EM PROCESSO DE ENCERRAMENTO']
-    
-    # Municípios e UFs para diversificar os dados
-    municipios_uf = [
-        # São Paulo
-        ('São Paulo', 'SP'), ('Campinas', 'SP'), ('Santos', 'SP'), ('Sorocaba', 'SP'), 
-        ('Ribeirão Preto', 'SP'), ('Osasco', 'SP'), ('Santo André', 'SP'), ('São Bernardo do Campo', 'SP'),
-        ('Guarulhos', 'SP'), ('Piracicaba', 'SP'), ('Jundiaí', 'SP'), ('Bauru', 'SP'),
-        
-        # Rio de Janeiro  
-        ('Rio de Janeiro', 'RJ'), ('Niterói', 'RJ'), ('Nova Iguaçu', 'RJ'), ('Duque de Caxias', 'RJ'),
-        ('Petrópolis', 'RJ'), ('Volta Redonda', 'RJ'), ('Campos dos Goytacazes', 'RJ'), ('Belford Roxo', 'RJ'),
-        
-        # Minas Gerais
-        ('Belo Horizonte', 'MG'), ('Uberlândia', 'MG'), ('Contagem', 'MG'), ('Juiz de Fora', 'MG'),
-        ('Betim', 'MG'), ('Montes Claros', 'MG'), ('Uberaba', 'MG'), ('Governador Valadares', 'MG'),
-        
-        # Bahia
-        ('Salvador', 'BA'), ('Feira de Santana', 'BA'), ('Vitória da Conquista', 'BA'), ('Camaçari', 'BA'),
-        ('Juazeiro', 'BA'), ('Lauro de Freitas', 'BA'), ('Ilhéus', 'BA'), ('Itabuna', 'BA'),
-        
-        # Paraná
-        ('Curitiba', 'PR'), ('Londrina', 'PR'), ('Maringá', 'PR'), ('Ponta Grossa', 'PR'),
-        ('Cascavel', 'PR'), ('São José dos Pinhais', 'PR'), ('Foz do Iguaçu', 'PR'), ('Colombo', 'PR'),
-        
-        # Rio Grande do Sul
-        ('Porto Alegre', 'RS'), ('Caxias do Sul', 'RS'), ('Pelotas', 'RS'), ('Canoas', 'RS'),
-        ('Santa Maria', 'RS'), ('Gravataí', 'RS'), ('Viamão', 'RS'), ('Novo Hamburgo', 'RS'),
-        
-        # Ceará
-        ('Fortaleza', 'CE'), ('Caucaia', 'CE'), ('Juazeiro do Norte', 'CE'), ('Maracanaú', 'CE'),
-        ('Sobral', 'CE'), ('Crato', 'CE'), ('Itapipoca', 'CE'), ('Maranguape', 'CE'),
-        
-        # Pernambuco
-        ('Recife', 'PE'), ('Jaboatão dos Guararapes', 'PE'), ('Olinda', 'PE'), ('Caruaru', 'PE'),
-        ('Petrolina', 'PE'), ('Paulista', 'PE'), ('Cabo de Santo Agostinho', 'PE'), ('Garanhuns', 'PE')
-    ]
-
-    # Estrutura hierárquica organizacional consistente
-    hierarquia_organizacional = {
-        # Diretoria SP INTERIOR
-        10001: {
-            'diretoria': 'SP INTERIOR',
-            'gerencias': {
-                20001: {
-                    'desc': 'SAO PAULO',
-                    'coordenacoes': {
-                        30001: {
-                            'desc': 'COORD LESTE',
-                            'supervisoes': [
-                                (40001, 'SUP LESTE'),
-                                (40002, 'SUP OESTE')
-                            ]
-                        },
-                        30002: {
-                            'desc': 'COORD OESTE',
-                            'supervisoes': [
-                                (40003, 'SUP SUL')
-                            ]
-                        }
-                    }
-                }
-            }
-        },
-        # Diretoria SUL
-        10002: {
-            'diretoria': 'SUL',
-            'gerencias': {
-                20002: {
-                    'desc': 'SUL',
-                    'coordenacoes': {
-                        30003: {
-                            'desc': 'COORD SUL',
-                            'supervisoes': [
-                                (40004, 'SUP SUL REGIAO')
-                            ]
-                        }
-                    }
-                }
-            }
-        },
-        # Diretoria NORDESTE 1
-        10003: {
-            'diretoria': 'NORDESTE 1',
-            'gerencias': {
-                20003: {
-                    'desc': 'NORDESTE 1',
-                    'coordenacoes': {
-                        30004: {
-                            'desc': 'COORD NORDESTE',
-                            'supervisoes': [
-                                (40005, 'SUP NORDESTE A'),
-                                (40006, 'SUP NORDESTE B')
-                            ]
-                        }
-                    }
-                }
-            }
-        }
-    }
-
-    dados = []
-    
-    # Criar todas as combinações hierárquicas válidas
-    combinacoes_hierarquicas = []
-    
-    for chave_diretoria, data_diretoria in hierarquia_organizacional.items():
-        for chave_gerencia, data_gerencia in data_diretoria['gerencias'].items():
-            for chave_coordenacao, data_coordenacao in data_gerencia['coordenacoes'].items():
-                for chave_supervisao, desc_supervisao in data_coordenacao['supervisoes']:
-                    combinacoes_hierarquicas.append({
-                        'diretoria_chave': chave_diretoria,
-                        'diretoria_desc': data_diretoria['diretoria'],
-                        'gerencia_chave': chave_gerencia,
-                        'gerencia_desc': data_gerencia['desc'],
-                        'coordenacao_chave': chave_coordenacao,
-                        'coordenacao_desc': data_coordenacao['desc'],
-                        'supervisao_chave': chave_supervisao,
-                        'supervisao_desc': desc_supervisao
-                    })
-    
-    print(f"🏗️ Criadas {len(combinacoes_hierarquicas)} combinações hierárquicas válidas")
-    
-    # Mostrar estrutura criada
-    print("\n🏢 Estrutura Hierárquica Organizacional:")
-    for combinacao in combinacoes_hierarquicas:
-        print(f"   📋 {combinacao['diretoria_desc']} → {combinacao['gerencia_desc']} → {combinacao['coordenacao_desc']} → {combinacao['supervisao_desc']}")
-    
-    # Distribuir as lojas entre as combinações hierárquicas
-    total_lojas = len(chaves_loja)
-    lojas_por_combinacao = total_lojas // len(combinacoes_hierarquicas)
-    
-    hierarquias_distribuidas = []
-    
-    # Distribuir lojas para cada combinação hierárquica
-    for combinacao in combinacoes_hierarquicas:
-        hierarquias_distribuidas.extend([combinacao] * lojas_por_combinacao)
-    
-    # Distribuir lojas restantes aleatoriamente
-    lojas_restantes = total_lojas - len(hierarquias_distribuidas)
-    for _ in range(lojas_restantes):
-        combinacao_aleatoria = random.choice(combinacoes_hierarquicas)
-        hierarquias_distribuidas.append(combinacao_aleatoria)
-    
-    # Embaralhar a distribuição
-    random.shuffle(hierarquias_distribuidas)
-    
-    print(f"📊 Distribuindo ~{lojas_por_combinacao} lojas por combinação hierárquica")
-
-    for i, chave in enumerate(chaves_loja):
-        dt_encerramento = fake.date_between(start_date='-6M', end_date='today') if random.random() < 0.1 else None
-        motivo_encerramento = fake.sentence(nb_words=4) if dt_encerramento else None
-        dt_bloqueio = fake.date_between(start_date='-3M', end_date='today') if random.random() < 0.1 else None
-        motivo_bloqueio = fake.sentence(nb_words=5) if dt_bloqueio else None
-        chave_paa = random.randint(1000, 9999) if random.random() < 0.6 else None
-        nome_paa = fake.name() if chave_paa else None
-        cod_mult = random.randint(1, 999) if random.random() < 0.6 else None
-        desc_ilha = fake.word().capitalize() if random.random() < 0.4 else None
-        nome_ilha = fake.name() if desc_ilha else None
-        chave_ger_neg = random.randint(10000, 99999) if random.random() < 0.4 else None
-        desc_ger_neg = fake.name() if chave_ger_neg else None
-        dt_ult_transacao = fake.date_between(start_date='-2M', end_date='today') if random.random() < 0.8 else None
-        
-        # Usar hierarquia da distribuição equilibrada
-        hierarquia = hierarquias_distribuidas[i]
-        diretoria_chave = hierarquia['diretoria_chave']
-        diretoria_desc = hierarquia['diretoria_desc']
-        gerencia_area_chave = hierarquia['gerencia_chave']
-        gerencia_area_desc = hierarquia['gerencia_desc']
-        coordenacao_chave = hierarquia['coordenacao_chave']
-        coordenacao_desc = hierarquia['coordenacao_desc']
-        supervisao_chave = hierarquia['supervisao_chave']
-        supervisao_desc = hierarquia['supervisao_desc']
-        
-        # Selecionar município e UF aleatório
-        municipio, uf = random.choice(municipios_uf)
-        
-        dados.append((
-            chave,
-            fake.cnpj(),
-            fake.company(),
-            random.choice(segmentos),
-            random.randint(1000, 9999),
-            random.randint(1, 999) if random.random() < 0.7 else None,
-            fake.city(),
-            chave_paa,
-            nome_paa,
-            fake.date_between(start_date='-3y', end_date='today'),
-            fake.date_between(start_date='-3y', end_date='today'),
-            fake.date_between(start_date='-3y', end_date='today') if dt_encerramento else None,
-            dt_encerramento,
-            motivo_encerramento,
-            fake.date_between(start_date='-1y', end_date='today'),
-            random.choice(status_tablet_opcoes),
-            fake.date_between(start_date='-3y', end_date='today'),
-            fake.date_between(start_date='-1y', end_date='today'),
-            fake.name(),
-            fake.phone_number(),
-            dt_bloqueio,
-            motivo_bloqueio,
-            'TRADICIONAL',
-            1 if random.random() < 0.5 else 0,
-            1 if random.random() < 0.5 else 0,
-            1 if random.random() < 0.5 else 0,
-            fake.address().replace("\n", " "),
-            4100707,
-            municipio,
-            uf,
-            random.choice(quadrantes),
-            cod_mult,
-            fake.name(),
-            diretoria_chave,
-            diretoria_desc,
-            random.randint(1000, 9999),
-            fake.city(),
-            gerencia_area_chave,
-            gerencia_area_desc,
-            coordenacao_chave,
-            coordenacao_desc,
-            supervisao_chave,
-            supervisao_desc,
-            random.randint(10000, 99999) if random.random() < 0.6 else None,
-            desc_ilha,
-            nome_ilha,
-            chave_ger_neg,
-            desc_ger_neg,
-            random.choice(situacoes),
-            dt_ult_transacao,
-            1 if random.random() < 0.8 else 0,
-            1 if random.random() < 0.6 else 0,
-            1 if random.random() < 0.7 else 0,
-            1 if random.random() < 0.5 else 0,
-            round(random.uniform(-1000, 10000), 2) if random.random() < 0.9 else None,
-            round(random.uniform(-5000, 20000), 2) if random.random() < 0.9 else None
-        ))
-
-    # Inserir os dados no banco
-    insert_sql = """
-    INSERT INTO TB_ESTR_LOJAS (
-        CHAVE_LOJA, CNPJ, NOME_LOJA, DESC_SEGTO, COD_AG_RELACIONAMENTO, NR_PACB, AG_RELACIONAMENTO,
-        CHAVE_PAA, NOME_PAA, DT_ENVIO_VAN, DT_INAUGURACAO, DT_INAUGURACAO_BACEN, DT_ENCERRAMENTO_BACEN,
-        MOTIVO_ENCERRAMENTO, DT_RETIRADA_EQTO, STATUS_TABLET, DT_IMPLANTACAO_TABLET, DT_RETIRADA_TABLET,
-        GTE_RESP_LOJA, TELEFONE_PADRAO, DT_BLOQUEIO, MOTIVO_BLOQUEIO, TIPO_POSTO,
-        BE_AVANCADO, BE_ORG_PAGADOR, BE_PLATAFORMA, ENDERECO, COD_IBGE, MUNICIPIO, UF, QUADRANTE,
-        COD_MULT, MULTIPLICADOR, DIRE_REG, DIR_REGIONAL, COD_GER_REG, GER_REGIONAL,
-        CHAVE_GERENCIA_AREA, DESC_GERENCIA_AREA, CHAVE_COORDENACAO, DESC_COORDENACAO,
-        CHAVE_SUPERVISAO, DESC_SUPERVISAO, COD_ILHA, DESC_ILHA, NOME_ILHA,
-        CHAVE_GERENCIA_NEGOCIO, DESC_GERENCIA_NEGOCIO, SITUACAO, DT_ULT_TRANSACAO,
-        HABILITADO_CONTA, HABILITADO_MICRO, HABILITADO_LIME, HABILITADO_CONSIG,
-        SALDO_CX, LIMITE
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
-
-    # Inserir os dados em lotes para melhor performance
-    print(f"📊 Inserindo {len(dados)} registros na tabela TB_ESTR_LOJAS...")
-    
-    for i, linha in enumerate(dados):
-        try:
-            cursor.execute(insert_sql, linha)
-            if (i + 1) % 500 == 0:  # Commit a cada 500 registros
-                conn.commit()
-                print(f"   ✅ {i + 1} registros inseridos...")
-        except Exception as e:
-            print(f"   ❌ Erro ao inserir registro {i + 1}: {e}")
-            continue
-
-    conn.commit()
-    print(f"✅ Tabela TB_ESTR_LOJAS populada com sucesso! {len(dados)} registros inseridos.")
-
-    # Exibir estatísticas
-    cursor.execute("SELECT COUNT(*) FROM TB_ESTR_LOJAS")
-    total_registros = cursor.fetchone()[0]
-    print(f"📈 Total de registros na tabela: {total_registros}")
-
-    cursor.execute("SELECT TOP 5 CHAVE_LOJA, NOME_LOJA, DESC_SEGTO, SITUACAO FROM TB_ESTR_LOJAS ORDER BY CHAVE_LOJA")
-    amostra = cursor.fetchall()
-    print("\n📋 Amostra dos primeiros 5 registros:")
-    print("CHAVE_LOJA | NOME_LOJA | DESC_SEGTO | SITUACAO")
-    print("-" * 60)
-    for registro in amostra:
-        print(f"{registro[0]} | {registro[1][:20]}... | {registro[2]} | {registro[3]}")
-    
-    # Exibir distribuição das hierarquias
-    print("\n📊 Distribuição das Hierarquias:")
-    
-    # Diretorias
-    cursor.execute("SELECT DIR_REGIONAL, COUNT(*) FROM TB_ESTR_LOJAS GROUP BY DIR_REGIONAL ORDER BY DIR_REGIONAL")
-    diretorias_stats = cursor.fetchall()
-    print("\n🏢 Diretorias:")
-    for desc, count in diretorias_stats:
-        print(f"   {desc}: {count} lojas")
-    
-    # Gerências de Área
-    cursor.execute("SELECT DESC_GERENCIA_AREA, COUNT(*) FROM TB_ESTR_LOJAS GROUP BY DESC_GERENCIA_AREA ORDER BY DESC_GERENCIA_AREA")
-    gerencias_stats = cursor.fetchall()
-    print("\n🏢 Gerências de Área:")
-    for desc, count in gerencias_stats:
-        print(f"   {desc}: {count} lojas")
-    
-    # Coordenações
-    cursor.execute("SELECT DESC_COORDENACAO, COUNT(*) FROM TB_ESTR_LOJAS GROUP BY DESC_COORDENACAO ORDER BY DESC_COORDENACAO")
-    coordenacoes_stats = cursor.fetchall()
-    print("\n🏢 Coordenações:")
-    for desc, count in coordenacoes_stats:
-        print(f"   {desc}: {count} lojas")
-    
-    # Supervisões
-    cursor.execute("SELECT DESC_SUPERVISAO, COUNT(*) FROM TB_ESTR_LOJAS GROUP BY DESC_SUPERVISAO ORDER BY DESC_SUPERVISAO")
-    supervisoes_stats = cursor.fetchall()
-    print("\n🏢 Supervisões:")
-    for desc, count in supervisoes_stats:
-        print(f"   {desc}: {count} lojas")
-    
-    # Verificar hierarquia organizacional
-    print("\n🔍 Verificação da Hierarquia Organizacional:")
-    cursor.execute("""
-        SELECT DISTINCT 
-            DIRE_REG, DIR_REGIONAL, 
-            CHAVE_GERENCIA_AREA, DESC_GERENCIA_AREA,
-            CHAVE_COORDENACAO, DESC_COORDENACAO,
-            CHAVE_SUPERVISAO, DESC_SUPERVISAO,
-            COUNT(*) as QTD_LOJAS
-        FROM TB_ESTR_LOJAS 
-        GROUP BY DIRE_REG, DIR_REGIONAL, 
-                 CHAVE_GERENCIA_AREA, DESC_GERENCIA_AREA,
-                 CHAVE_COORDENACAO, DESC_COORDENACAO,
-                 CHAVE_SUPERVISAO, DESC_SUPERVISAO
-        ORDER BY DIRE_REG, CHAVE_GERENCIA_AREA, CHAVE_COORDENACAO, CHAVE_SUPERVISAO
-    """)
-    
-    hierarquia_check = cursor.fetchall()
-    print("Hierarquia Completa (Dir → Ger → Coord → Sup):")
-    
-    for row in hierarquia_check:
-        dir_chave, dir_desc, ger_chave, ger_desc, coord_chave, coord_desc, sup_chave, sup_desc, qtd = row
-        print(f"   📊 {qtd:4d} lojas: {dir_desc} ({dir_chave}) → {ger_desc} ({ger_chave}) → {coord_desc} ({coord_chave}) → {sup_desc} ({sup_chave})")
-    
-    # Verificar consistência da hierarquia
-    print("\n✅ Verificação de Consistência:")
-    
-    # Verificar se cada coordenação pertence a apenas uma gerência
-    cursor.execute("""
-        SELECT CHAVE_COORDENACAO, DESC_COORDENACAO, COUNT(DISTINCT CHAVE_GERENCIA_AREA) as QTD_GERENCIAS
-        FROM TB_ESTR_LOJAS 
-        GROUP BY CHAVE_COORDENACAO, DESC_COORDENACAO
-        HAVING COUNT(DISTINCT CHAVE_GERENCIA_AREA) > 1
-    """)
-    
-    coord_inconsistente = cursor.fetchall()
-    if coord_inconsistente:
-        print("❌ Coordenações com múltiplas gerências (ERRO):")
-        for coord_chave, coord_desc, qtd_ger in coord_inconsistente:
-            print(f"   {coord_desc} ({coord_chave}) pertence a {qtd_ger} gerências")
-    else:
-        print("✅ Todas as coordenações pertencem a apenas 1 gerência")
-    
-    # Verificar se cada supervisão pertence a apenas uma coordenação
-    cursor.execute("""
-        SELECT CHAVE_SUPERVISAO, DESC_SUPERVISAO, COUNT(DISTINCT CHAVE_COORDENACAO) as QTD_COORDENACOES
-        FROM TB_ESTR_LOJAS 
-        GROUP BY CHAVE_SUPERVISAO, DESC_SUPERVISAO
-        HAVING COUNT(DISTINCT CHAVE_COORDENACAO) > 1
-    """)
-    
-    sup_inconsistente = cursor.fetchall()
-    if sup_inconsistente:
-        print("❌ Supervisões com múltiplas coordenações (ERRO):")
-        for sup_chave, sup_desc, qtd_coord in sup_inconsistente:
-            print(f"   {sup_desc} ({sup_chave}) pertence a {qtd_coord} coordenações")
-    else:
-        print("✅ Todas as supervisões pertencem a apenas 1 coordenação")
-
-except Exception as e:
-    print(f"❌ Erro durante a execução: {e}")
-    
-finally:
-    if 'cursor' in locals():
-        cursor.close()
-    if 'conn' in locals():
-        conn.close()
-    print("\n🔐 Conexão com o banco fechada.")
-
+import random
+from datetime import date, timedelta
+import sys
+from functools import partial
+
+import numpy as np
+
+import db
+from carga.arquivos import ler_exportacao, pasta_de_arquivos
+from carga.assincrono import concorrencia_no_pool, concorrencia_padrao
+from carga.bcp import estrategia_de_carga
+from carga.bulk import tamanho_lote_padrao
+from carga.colunas import DIAS_1_ANO, DIAS_2_MESES, DIAS_3_ANOS, DIAS_3_MESES, DIAS_6_MESES
+from carga.lojas import (
+    AGENCIAS,
+    COLUNAS_LOJAS,
+    DDL_COLUNAS_LOJAS,
+    ESQUEMA_LOJAS,
+    HIERARQUIA_ORGANIZACIONAL,
+    MUNICIPIOS_UF,
+    QUADRANTES,
+    RegistroLoja,
+    SEGMENTOS,
+    SITUACOES,
+    STATUS_TABLET_OPCOES,
+    gerar_lojas_colunar,
+)
+from carga.chaves import chaves_loja as alocar_chaves_loja
+from carga.cnpj import cnpjs_por_chave
+from carga.distribuicao import distribuicoes_configuradas, maior_fatia
+from carga.escala import chaves_de_contas, total_de_lojas
+from carga.pools import pools_compartilhados
+from carga.hierarquia import hierarquia_configurada
+from carga.shards import SEED_PADRAO, TAMANHO_SHARD_PADRAO, processos_de_geracao, seed_do_shard
+from carga.esquema import ddl_indices
+from carga.instrumentacao import contar, fase, instrumentado
+from carga.recarga import carregador_da_sombra, concluir_recarga
+from carga.retomada import data_de_referencia, diario_da_carga, modo_retomada
+from carga.stream import linhas_em_chunks, particoes_em_chunks
+from carga.troca import recarregar_com_troca
+from carga.validacao import conferencia_no_servidor, conferir_no_servidor, validador_lojas
+
+# python estr_lojas.py --colunar  → gera as lojas em modo vetorizado (NumPy/pandas)
+MODO_COLUNAR = '--colunar' in sys.argv
+
+# python estr_lojas.py --retomar  → continua uma carga interrompida do último lote confirmado (carga.retomada)
+MODO_RETOMAR = '--retomar' in sys.argv
+
+# python estr_lojas.py --de-arquivos PASTA  → carrega o que foi exportado por carga.arquivos
+PASTA_ARQUIVOS = pasta_de_arquivos()
+
+# Supervisões listadas no início da carga (uma hierarquia real pode ter milhares)
+MAXIMO_COMBINACOES_EXIBIDAS = 20
+
+
+def sortear_lojas(arvore, distribuicoes, total_lojas, seed=SEED_PADRAO):
+    """Supervisão (índice na hierarquia), agência e situação (índice em SITUACOES) de cada loja."""
+    # Mesma quantidade por supervisão, sobras sorteadas, tudo embaralhado; ou pelos pesos da distribuição enviesada.
+    # Com seed fixa, retomar a carga sorteia as mesmas supervisões para as mesmas lojas
+    rng = np.random.default_rng(seed)
+    return (arvore.sortear(rng, total_lojas, distribuicoes['supervisor']).tolist(),
+            AGENCIAS[distribuicoes['agencia'].sortear(rng, total_lojas, AGENCIAS)].tolist(),
+            distribuicoes['situacao'].sortear(rng, total_lojas, SITUACOES).tolist())
+
+
+def gerar_linhas(chaves_loja, arvore, sorteio, inicio=0, hoje=None, seed=SEED_PADRAO):
+    """
+    Lojas do modo linha a linha (o padrão), uma a uma, sem montar a lista
+    completa em memória. Também é o que o carga.benchmark mede em TB_ESTR_LOJAS.
+
+    Cada bloco de TAMANHO_SHARD_PADRAO lojas sorteia com a seed do seu índice
+    e as datas contam a partir de `hoje`: retomando em `inicio`, as lojas saem
+    iguais às da carga interrompida.
+    """
+    supervisao_da_loja, agencia_da_loja, situacao_da_loja = sorteio
+    linhas_hierarquia = arvore.linhas
+    aleatorio = random.Random()
+    hoje = hoje or date.today()
+
+    def data_ate(dias):
+        # Como fake.date_between(start_date=-dias, end_date='today'), mas com o sorteio do bloco
+        return hoje - timedelta(days=aleatorio.randint(0, dias))
+
+    # Textos sorteados dos pools do Faker em cache (gerados só na primeira execução)
+    pools = pools_compartilhados(SEED_PADRAO)
+    nome_fake = pools.sorteador('name', aleatorio)
+    empresa_fake = pools.sorteador('company', aleatorio)
+    cidade_fake = pools.sorteador('city', aleatorio)
+    telefone_fake = pools.sorteador('phone_number', aleatorio)
+    endereco_fake = pools.sorteador('address', aleatorio)
+    frase4_fake = pools.sorteador('sentence4', aleatorio)
+    frase5_fake = pools.sorteador('sentence5', aleatorio)
+    palavra_fake = pools.sorteador('word', aleatorio)
+    # CNPJs com DV correto, um por loja, calculados de uma vez
+    cnpjs = cnpjs_por_chave(chaves_loja, mascarado=True).tolist()
+
+    # Retomando, refaz o bloco da posição do diário desde o início e só entrega a partir dela
+    for i in range(inicio - inicio % TAMANHO_SHARD_PADRAO, len(chaves_loja)):
+        if i % TAMANHO_SHARD_PADRAO == 0:
+            aleatorio.seed(seed_do_shard(seed, i // TAMANHO_SHARD_PADRAO))
+        chave = chaves_loja[i]
+        dt_encerramento = data_ate(DIAS_6_MESES) if aleatorio.random() < 0.1 else None
+        motivo_encerramento = frase4_fake() if dt_encerramento else None
+        dt_bloqueio = data_ate(DIAS_3_MESES) if aleatorio.random() < 0.1 else None
+        motivo_bloqueio = frase5_fake() if dt_bloqueio else None
+        chave_paa = aleatorio.randint(1000, 9999) if aleatorio.random() < 0.6 else None
+        nome_paa = nome_fake() if chave_paa else None
+        cod_mult = aleatorio.randint(1, 999) if aleatorio.random() < 0.6 else None
+        desc_ilha = palavra_fake() if aleatorio.random() < 0.4 else None
+        nome_ilha = nome_fake() if desc_ilha else None
+        chave_ger_neg = aleatorio.randint(10000, 99999) if aleatorio.random() < 0.4 else None
+        desc_ger_neg = nome_fake() if chave_ger_neg else None
+        dt_ult_transacao = data_ate(DIAS_2_MESES) if aleatorio.random() < 0.8 else None
+
+        # Usar hierarquia da distribuição equilibrada (as oito colunas já prontas)
+        (diretoria_chave, diretoria_desc, gerencia_area_chave, gerencia_area_desc,
+         coordenacao_chave, coordenacao_desc, supervisao_chave,
+         supervisao_desc) = linhas_hierarquia[supervisao_da_loja[i]]
+
+        # Selecionar município e UF aleatório
+        municipio, uf = aleatorio.choice(MUNICIPIOS_UF)
+
+        # Campos por nome: a ordem das colunas vem de ESQUEMA_LOJAS
+        registro = RegistroLoja(
+            CHAVE_LOJA=chave,
+            CNPJ=cnpjs[i],
+            NOME_LOJA=empresa_fake(),
+            DESC_SEGTO=aleatorio.choice(SEGMENTOS),
+            COD_AG_RELACIONAMENTO=agencia_da_loja[i],
+            NR_PACB=aleatorio.randint(1, 999) if aleatorio.random() < 0.7 else None,
+            AG_RELACIONAMENTO=cidade_fake(),
+            CHAVE_PAA=chave_paa,
+            NOME_PAA=nome_paa,
+            DT_ENVIO_VAN=data_ate(DIAS_3_ANOS),
+            DT_INAUGURACAO=data_ate(DIAS_3_ANOS),
+            DT_INAUGURACAO_BACEN=data_ate(DIAS_3_ANOS) if dt_encerramento else None,
+            DT_ENCERRAMENTO_BACEN=dt_encerramento,
+            MOTIVO_ENCERRAMENTO=motivo_encerramento,
+            DT_RETIRADA_EQTO=data_ate(DIAS_1_ANO),
+            STATUS_TABLET=aleatorio.choice(STATUS_TABLET_OPCOES),
+            DT_IMPLANTACAO_TABLET=data_ate(DIAS_3_ANOS),
+            DT_RETIRADA_TABLET=data_ate(DIAS_1_ANO),
+            GTE_RESP_LOJA=nome_fake(),
+            TELEFONE_PADRAO=telefone_fake(),
+            DT_BLOQUEIO=dt_bloqueio,
+            MOTIVO_BLOQUEIO=motivo_bloqueio,
+            TIPO_POSTO='TRADICIONAL',
+            BE_AVANCADO=1 if aleatorio.random() < 0.5 else 0,
+            BE_ORG_PAGADOR=1 if aleatorio.random() < 0.5 else 0,
+            BE_PLATAFORMA=1 if aleatorio.random() < 0.5 else 0,
+            ENDERECO=endereco_fake(),
+            COD_IBGE=4100707,
+            MUNICIPIO=municipio,
+            UF=uf,
+            QUADRANTE=aleatorio.choice(QUADRANTES),
+            COD_MULT=cod_mult,
+            MULTIPLICADOR=nome_fake(),
+            DIRE_REG=diretoria_chave,
+            DIR_REGIONAL=diretoria_desc,
+            COD_GER_REG=aleatorio.randint(1000, 9999),
+            GER_REGIONAL=cidade_fake(),
+            CHAVE_GERENCIA_AREA=gerencia_area_chave,
+            DESC_GERENCIA_AREA=gerencia_area_desc,
+            CHAVE_COORDENACAO=coordenacao_chave,
+            DESC_COORDENACAO=coordenacao_desc,
+            CHAVE_SUPERVISAO=supervisao_chave,
+            DESC_SUPERVISAO=supervisao_desc,
+            COD_ILHA=aleatorio.randint(10000, 99999) if aleatorio.random() < 0.6 else None,
+            DESC_ILHA=desc_ilha,
+            NOME_ILHA=nome_ilha,
+            CHAVE_GERENCIA_NEGOCIO=chave_ger_neg,
+            DESC_GERENCIA_NEGOCIO=desc_ger_neg,
+            SITUACAO=SITUACOES[situacao_da_loja[i]],
+            DT_ULT_TRANSACAO=dt_ult_transacao,
+            HABILITADO_CONTA=1 if aleatorio.random() < 0.8 else 0,
+            HABILITADO_MICRO=1 if aleatorio.random() < 0.6 else 0,
+            HABILITADO_LIME=1 if aleatorio.random() < 0.7 else 0,
+            HABILITADO_CONSIG=1 if aleatorio.random() < 0.5 else 0,
+            SALDO_CX=round(aleatorio.uniform(-1000, 10000), 2) if aleatorio.random() < 0.9 else None,
+            LIMITE=round(aleatorio.uniform(-5000, 20000), 2) if aleatorio.random() < 0.9 else None
+        )
+        if i >= inicio:
+            yield registro
+
+
+@instrumentado('TB_ESTR_LOJAS')
+def main(colunar=None, arquivos=None, retomar=None):
+    modo_colunar = MODO_COLUNAR if colunar is None else colunar
+    pasta_arquivos = PASTA_ARQUIVOS if arquivos is None else arquivos
+    modo_retomar = (MODO_RETOMAR or modo_retomada()) if retomar is None else retomar
+
+    try:
+        with fase('conectar'):
+            conn = db.conectar(db.config().banco_dw)
+        cursor = conn.cursor()
+
+        with fase('ler_chaves'):
+            # Referência da validação: toda CHAVE_LOJA de TB_ESTR_CONTAS precisa de uma loja
+            chaves_contas = chaves_de_contas(conn)
+            if chaves_contas is None:
+                chaves_loja = alocar_chaves_loja(total_de_lojas(), seed=SEED_PADRAO).tolist()
+            else:
+                chaves_loja = chaves_contas.tolist()
+
+        # Hierarquia compilada em arrays (CARGA_HIERARQUIA=arquivo.csv/.json para usar uma real)
+        arvore = hierarquia_configurada(HIERARQUIA_ORGANIZACIONAL)
+        combinacoes_hierarquicas = arvore.combinacoes()
+
+        print(f"🏗️ Criadas {len(combinacoes_hierarquicas)} combinações hierárquicas válidas ({arvore.resumo()})")
+
+        # Mostrar estrutura criada
+        print("\n🏢 Estrutura Hierárquica Organizacional:")
+        for combinacao in combinacoes_hierarquicas[:MAXIMO_COMBINACOES_EXIBIDAS]:
+            print(f"   📋 {combinacao['diretoria_desc']} → {combinacao['gerencia_desc']} → {combinacao['coordenacao_desc']} → {combinacao['supervisao_desc']}")
+        if len(combinacoes_hierarquicas) > MAXIMO_COMBINACOES_EXIBIDAS:
+            print(f"   ... e mais {len(combinacoes_hierarquicas) - MAXIMO_COMBINACOES_EXIBIDAS} supervisões")
+
+        # CARGA_DISTRIBUICAO: lojas por supervisão, agência e situação enviesadas (ex.: Zipf)
+        distribuicoes = distribuicoes_configuradas()
+        enviesadas = {d: dist for d, dist in distribuicoes.items() if not dist.uniforme}
+        if enviesadas:
+            print(f"📈 Distribuição enviesada: {', '.join(f'{d} {dist}' for d, dist in enviesadas.items())}")
+
+        total_lojas = len(chaves_loja)
+        particoes = None
+        # Confere cada bloco antes de ele ir para o banco (hierarquia, nulos, chave, cobertura)
+        validador = validador_lojas(chaves_contas)
+
+        # CARGA_CONCORRENCIA=N: N partições de CHAVE_LOJA, cada uma em uma conexão livre do pool do DW
+        concorrencia = concorrencia_padrao() if modo_colunar and not pasta_arquivos else 1
+        if concorrencia > 1:
+            concorrencia = concorrencia_no_pool(concorrencia, db.obter_pool(db.config().banco_dw))
+        particionada = concorrencia > 1 and estrategia_de_carga() == 'executemany'
+
+        # Checkpoint a cada lote (executemany em uma conexão): com --retomar, a carga
+        # continua do último lote confirmado na sombra, sem DROP e sem gerar de novo o que já entrou
+        diario = None
+        inicio = 0
+        # Data de referência das colunas de data, fixada no início; retomando, a da carga interrompida
+        hoje = data_de_referencia('TB_ESTR_LOJAS', modo_retomar)
+        if estrategia_de_carga() == 'executemany' and not particionada:
+            diario, inicio = diario_da_carga(
+                conn, 'TB_ESTR_LOJAS', modo_retomar, validador, COLUNAS_LOJAS,
+                modo='arquivos' if pasta_arquivos else 'colunar' if modo_colunar else 'linhas',
+                pasta=pasta_arquivos, seed=SEED_PADRAO, chaves=chaves_loja, tamanho_lote=tamanho_lote_padrao(),
+                distribuicoes=str(sorted(distribuicoes.items())), hoje=hoje.isoformat(),
+            )
+
+        if pasta_arquivos:
+            # Lojas exportadas antes (python -m carga.arquivos exportar), sem gerar de novo
+            print(f"📂 Lendo as lojas exportadas em {pasta_arquivos}...")
+            linhas, total_lojas = ler_exportacao(pasta_arquivos, 'TB_ESTR_LOJAS', COLUNAS_LOJAS, inicio=inicio)
+            dados = validador.linhas(linhas, COLUNAS_LOJAS)
+        elif modo_colunar:
+            # Colunas sorteadas de uma vez com NumPy e textos do Faker vindos de pools
+            print("⚡ Modo colunar: gerando as lojas com NumPy...")
+            # Gerado em blocos de tamanho fixo (CARGA_PROCESSOS=N: em N processos), entregues ao carregador
+            # à medida que ficam prontos; nunca há mais que 2 × N blocos em memória
+            gerador = partial(gerar_lojas_colunar, hierarquia=arvore, seed_pools=SEED_PADRAO,
+                              distribuicoes=distribuicoes)
+            chaves = np.asarray(chaves_loja, dtype=np.int64)
+            if particionada:
+                # Partições nas fronteiras dos blocos: as lojas são as mesmas com qualquer CARGA_CONCORRENCIA
+                particoes = particoes_em_chunks(gerador, chaves, concorrencia, workers=processos_de_geracao(),
+                                                observar=validador.observar, hoje=hoje)
+                print(f"🔀 Carregando em {len(particoes)} partições simultâneas")
+                dados = None
+            else:
+                # Mesma seed por bloco: retomando, as linhas a partir de `inicio` são as de uma carga completa
+                dados = linhas_em_chunks(gerador, chaves, workers=processos_de_geracao(),
+                                         observar=validador.observar, inicio=inicio, hoje=hoje)
+        else:
+            # Distribuir as lojas entre as supervisões (um índice de supervisão por loja)
+            lojas_por_combinacao = total_lojas // len(arvore)
+            sorteio = sortear_lojas(arvore, distribuicoes, total_lojas)
+
+            if 'supervisor' in enviesadas:
+                chave, fatia = maior_fatia(arvore.chaves['supervisao'], sorteio[0])
+                print(f"📊 Supervisão {chave} com {fatia:.1%} das lojas (a mais carregada)")
+            else:
+                print(f"📊 Distribuindo ~{lojas_por_combinacao} lojas por combinação hierárquica")
+
+            # Registros com __slots__ viram as tuplas do executemany só aqui, via attrgetter
+            dados = validador.linhas(ESQUEMA_LOJAS.linhas(gerar_linhas(chaves_loja, arvore, sorteio, inicio, hoje)),
+                                     COLUNAS_LOJAS)
+
+        # Inserir os dados em lotes na tabela sombra; a TB_ESTR_LOJAS atual continua no ar até a troca
+        print(f"📊 Inserindo {total_lojas} registros na tabela TB_ESTR_LOJAS...")
+        carregar = carregador_da_sombra(
+            conn, COLUNAS_LOJAS, DDL_COLUNAS_LOJAS, dados, 'TB_ESTR_LOJAS', diario=diario, particoes=particoes,
+            conexoes=(lambda: db.conectar(db.config().banco_dw), db.liberar), concorrencia=concorrencia,
+            validador=validador, database=db.config().banco_dw,
+        )
+        resultado = recarregar_com_troca(conn, 'TB_ESTR_LOJAS', DDL_COLUNAS_LOJAS, carregar,
+                                         indices=ddl_indices('TB_ESTR_LOJAS'), manter_sombra=inicio > 0)
+        # A hierarquia das lojas mudou: versão do esquema e rollup de todas as fontes
+        concluir_recarga(conn, 'TB_ESTR_LOJAS', diario)
+        for indice, erro in resultado.erros:
+            print(f"   ❌ Erro ao inserir registro {indice + 1}: {erro}")
+
+        print(f"✅ Tabela TB_ESTR_LOJAS populada com sucesso! {resultado.inseridos} registros inseridos.")
+        print(f"⏱️ {resultado.resumo()}")
+
+        with fase('verificar'):
+            relatorio = validador.relatorio
+            print(f"📈 Total de registros na tabela: {relatorio.linhas}")
+
+            # TOP 5 pela chave primária: leitura de poucas páginas, não uma varredura
+            cursor.execute("SELECT TOP 5 CHAVE_LOJA, NOME_LOJA, DESC_SEGTO, SITUACAO FROM TB_ESTR_LOJAS ORDER BY CHAVE_LOJA")
+            amostra = cursor.fetchall()
+            print("\n📋 Amostra dos primeiros 5 registros:")
+            print("CHAVE_LOJA | NOME_LOJA | DESC_SEGTO | SITUACAO")
+            print("-" * 60)
+            for registro in amostra:
+                print(f"{registro[0]} | {registro[1][:20]}... | {registro[2]} | {registro[3]}")
+
+            if conferencia_no_servidor():
+                # CARGA_CONFERIR_SERVIDOR=1: distribuição e consistência lidas da tabela, em uma passada
+                print("\n🗄️ Conferência no servidor (GROUPING SETS):")
+                relatorio = conferir_no_servidor(cursor, 'TB_ESTR_LOJAS')
+
+            # Distribuição das lojas por nível e consistência da hierarquia
+            relatorio.imprimir()
+
+    except Exception as e:
+        contar('erros')
+        print(f"❌ Erro durante a execução: {e}")
+        # O orquestrador só marca a tabela como falha se a exceção chegar até ele
+        raise
+
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'conn' in locals():
+            db.liberar(conn)
+        print("\n🔐 Conexão devolvida ao pool.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Os testes importam carga e db como os scripts: a partir de src/backend/python
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def sem_configuracao_de_carga(monkeypatch):
+    """Variáveis CARGA_* do ambiente não mudam lote, ritmo nem modo dos testes."""
+    for nome in list(os.environ):
+        if nome.startswith('CARGA_'):
+            monkeypatch.delenv(nome)
+
+
+class _ContagemBig:
+    """COUNT_BIG(*) do SQL Server como agregado do sqlite."""
+
+    def __init__(self):
+        self.linhas = 0
+
+    def step(self):
+        self.linhas += 1
+
+    def finalize(self):
+        return self.linhas
+
+
+def conectar_sqlite(caminho, check_same_thread=True):
+    """
+    sqlite3 com as funções do SQL Server que a carga usa fora do INSERT
+    (OBJECT_ID(nome, 'U') e COUNT_BIG(*)), para exercitar carga.retomada.
+    Com check_same_thread=False, a conexão pode ser usada pelas threads do
+    carregador assíncrono.
+    """
+    conn = sqlite3.connect(caminho, check_same_thread=check_same_thread)
+
+    def object_id(nome, tipo):
+        existe = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (nome,)).fetchone()
+        return 1 if existe else None
+
+    conn.create_function('OBJECT_ID', 2, object_id)
+    conn.create_aggregate('COUNT_BIG', 0, _ContagemBig)
+    return conn
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """
+    Abre conexões ao mesmo banco sqlite em arquivo, com a tabela LOJAS criada.
+    Fechar uma conexão sem commit desfaz o lote aberto, como quando o processo
+    de carga morre. `abrir(check_same_thread=False)` serve às partições.
+    """
+    caminho = str(tmp_path / 'carga.db')
+    abertas = []
+
+    def abrir(check_same_thread=True):
+        conn = conectar_sqlite(caminho, check_same_thread)
+        conn.execute("CREATE TABLE IF NOT EXISTS LOJAS (CHAVE_LOJA INTEGER PRIMARY KEY, NOME TEXT NOT NULL)")
+        conn.commit()
+        abertas.append(conn)
+        return conn
+
+    yield abrir
+    for conn in abertas:
+        conn.close()
+
+
+@pytest.fixture
+def conn(banco):
+    return banco()
@@ -0,0 +1,31 @@
+import pytest
+
+from carga.arquivos import PASTA_ARQUIVOS_PADRAO, exportar, ler_exportacao, linhas_de_arquivos, pasta_de_arquivos
+
+
+@pytest.mark.parametrize('argv, pasta', [
+    (['estr_lojas.py'], None),
+    (['estr_lojas.py', '--colunar'], None),
+    (['estr_lojas.py', '--de-arquivos', '.cache/dados'], '.cache/dados'),
+    (['estr_lojas.py', '--colunar', '--de-arquivos', 'dados'], 'dados'),
+    (['estr_lojas.py', '--de-arquivos=dados'], 'dados'),
+    (['estr_lojas.py', '--de-arquivos'], PASTA_ARQUIVOS_PADRAO),
+    (['estr_lojas.py', '--de-arquivos='], PASTA_ARQUIVOS_PADRAO),
+])
+def test_pasta_de_arquivos(argv, pasta):
+    assert pasta_de_arquivos(argv) == pasta
+
+
+@pytest.mark.parametrize('opcao', ['--colunar', '--retomar', '-v'])
+def test_opcao_seguinte_nao_e_a_pasta(opcao):
+    assert pasta_de_arquivos(['estr_lojas.py', '--de-arquivos', opcao]) == PASTA_ARQUIVOS_PADRAO
+
+
+def test_ler_exportacao_a_partir_do_inicio(tmp_path):
+    exportar('TB_ESTR_CONTAS', 120, pasta=str(tmp_path), formato='arrow', particionar=False)
+    completas = list(linhas_de_arquivos(str(tmp_path), 'TB_ESTR_CONTAS', tamanho_lote=50))
+
+    linhas, total = ler_exportacao(str(tmp_path), 'TB_ESTR_CONTAS', inicio=70)
+
+    assert total == 120
+    assert list(linhas) == completas[70:]
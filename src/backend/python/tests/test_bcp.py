@@ -0,0 +1,71 @@
+import io
+import os
+
+import pytest
+
+from carga.bcp import (DDL_AMOSTRA, LINHAS_AMOSTRA, MODOS, PASTA_REFERENCIA, colunas_do_ddl, comando_bcp,
+                       escrever_dados, format_file, gravar_arquivos)
+from db.config import ConfigBanco
+
+COLUNAS = colunas_do_ddl(DDL_AMOSTRA)
+
+
+def ler(caminho):
+    with open(caminho, 'rb') as arquivo:
+        return arquivo.read()
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_amostra_igual_as_referencias(tmp_path, modo):
+    dados, formato, total = gravar_arquivos(str(tmp_path), f"amostra_{modo}", COLUNAS, LINHAS_AMOSTRA, modo)
+
+    assert total == len(LINHAS_AMOSTRA)
+    assert ler(dados) == ler(os.path.join(PASTA_REFERENCIA, f"amostra_{modo}.dat"))
+    assert ler(formato) == ler(os.path.join(PASTA_REFERENCIA, f"amostra_{modo}.fmt"))
+
+
+def test_format_file_tem_uma_linha_por_coluna():
+    for modo in MODOS:
+        linhas = format_file(COLUNAS, modo).split('\r\n')
+        assert linhas[:2] == ['14.0', str(len(COLUNAS))]
+        assert [linha.split()[6] for linha in linhas[2:-1]] == [coluna.nome for coluna in COLUNAS]
+
+
+def escrever(ddl, linhas, modo):
+    arquivo = io.BytesIO()
+    escrever_dados(arquivo, colunas_do_ddl(ddl), linhas, modo)
+    return arquivo.getvalue()
+
+
+def test_texto_vazio_e_nulo():
+    # Nativo: '' tem prefixo de tamanho 0, NULL o prefixo 0xFFFF
+    assert escrever("NOME VARCHAR(10)", [('',), (None,)], 'nativo') == b'\x00\x00' + b'\xff\xff'
+    # Caractere: os dois são o campo vazio, que o -k/KEEPNULLS carrega como NULL
+    assert escrever("NOME VARCHAR(10)", [('',), (None,)], 'caractere') == b'\r\n\r\n'
+
+
+def test_caractere_troca_terminadores_do_texto():
+    assert escrever("A INT\nB VARCHAR(20)", [(1, 'linha\tcom\r\nquebras')], 'caractere') == \
+        b'1\tlinha com  quebras\r\n'
+
+
+def test_not_null_nulo_no_nativo():
+    with pytest.raises(ValueError, match='NOT NULL'):
+        escrever("CHAVE_LOJA INT NOT NULL", [(None,)], 'nativo')
+
+
+def test_comando_bcp_sem_senha():
+    config = ConfigBanco(server='SRV', username='sa', password='segredo', trusted_connection=True)
+    comando = comando_bcp('TB_ESTR_LOJAS', 'lojas.dat', 'lojas.fmt', 'DATAWAREHOUSE', config, 'caractere', 500)
+
+    assert comando[1:4] == ['DATAWAREHOUSE.dbo.TB_ESTR_LOJAS', 'in', 'lojas.dat']
+    assert '-T' in comando and '-P' not in comando and '-U' not in comando
+    assert 'segredo' not in comando
+    assert comando[comando.index('-b') + 1] == '500'
+    assert comando[comando.index('-C') + 1] == '65001'
+
+
+def test_comando_bcp_recusa_login_sql():
+    config = ConfigBanco(server='SRV', username='sa', password='segredo')
+    with pytest.raises(ValueError, match='bulk_insert'):
+        comando_bcp('TB_ESTR_LOJAS', 'lojas.dat', 'lojas.fmt', 'DATAWAREHOUSE', config)
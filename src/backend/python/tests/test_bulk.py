@@ -0,0 +1,59 @@
+import pytest
+
+from carga.bulk import CarregadorEmLote, carregar_em_lotes, em_lotes, montar_insert
+
+
+def linhas(n, ruins=()):
+    """Linhas (CHAVE_LOJA, NOME); as posições em `ruins` têm NOME nulo e violam o NOT NULL."""
+    return ((i, None if i in ruins else f"Loja {i}") for i in range(n))
+
+
+def test_em_lotes_com_tamanho_fixo_e_variavel():
+    assert [len(lote) for lote in em_lotes(range(10), 4)] == [4, 4, 2]
+    # Consultado a cada lote, inclusive depois do último
+    tamanhos = iter([2, 3, 5, 5])
+    assert [len(lote) for lote in em_lotes(range(10), lambda: next(tamanhos))] == [2, 3, 5]
+
+
+def test_montar_insert():
+    assert montar_insert('LOJAS', ['CHAVE_LOJA', 'NOME']) == "INSERT INTO LOJAS (CHAVE_LOJA, NOME) VALUES (?, ?)"
+
+
+def test_carrega_todas_as_linhas_em_lotes(conn):
+    carregador = CarregadorEmLote(conn, montar_insert('LOJAS', ['CHAVE_LOJA', 'NOME']), tabela='LOJAS',
+                                  tamanho_lote=300, log=None)
+    resultado = carregador.carregar(linhas(1000))
+
+    assert (resultado.inseridos, resultado.falhas, resultado.lotes) == (1000, 0, 4)
+    assert resultado.lotes_com_fallback == 0
+    assert conn.execute("SELECT COUNT(*), MIN(CHAVE_LOJA), MAX(CHAVE_LOJA) FROM LOJAS").fetchone() == (1000, 0, 999)
+
+
+def test_lote_com_erro_cai_para_linha_a_linha(conn):
+    mensagens = []
+    carregador = CarregadorEmLote(conn, montar_insert('LOJAS', ['CHAVE_LOJA', 'NOME']), tabela='LOJAS',
+                                  tamanho_lote=100, log=mensagens.append)
+    resultado = carregador.carregar(linhas(1000, ruins={150, 720, 721}))
+
+    # Só as linhas ruins ficam de fora; o resto dos lotes com erro entra linha a linha
+    assert (resultado.inseridos, resultado.falhas, resultado.lotes) == (997, 3, 10)
+    assert resultado.lotes_com_fallback == 2
+    assert [posicao for posicao, _ in resultado.erros] == [150, 720, 721]
+    assert any('reinserindo linha a linha' in mensagem for mensagem in mensagens)
+
+    chaves = [chave for chave, in conn.execute("SELECT CHAVE_LOJA FROM LOJAS ORDER BY CHAVE_LOJA")]
+    assert chaves == [i for i in range(1000) if i not in (150, 720, 721)]
+
+
+def test_lote_desfeito_nao_deixa_linhas_pela_metade(conn):
+    # A falha está no fim do lote: as 99 linhas antes dela não podem entrar duas vezes
+    resultado = carregar_em_lotes(conn, montar_insert('LOJAS', ['CHAVE_LOJA', 'NOME']), linhas(200, ruins={99}),
+                                  tabela='LOJAS', tamanho_lote=100, log=None)
+
+    assert (resultado.inseridos, resultado.falhas) == (199, 1)
+    assert conn.execute("SELECT COUNT(*), COUNT(DISTINCT CHAVE_LOJA) FROM LOJAS").fetchone() == (199, 199)
+
+
+def test_tamanho_lote_invalido(conn):
+    with pytest.raises(ValueError):
+        CarregadorEmLote(conn, 'INSERT INTO LOJAS VALUES (?, ?)', tamanho_lote=0)
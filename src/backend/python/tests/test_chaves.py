@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from carga.chaves import (CHAVE_LOJA_FIM, CHAVE_LOJA_INICIO, PREFIXOS_IBGE, alocar, chaves_loja,
+                          chaves_loja_por_indice, codigos_municipio, permutar)
+
+LOJAS = 250_000
+
+
+@pytest.fixture(scope='module')
+def chaves():
+    return chaves_loja(LOJAS, seed=42)
+
+
+def test_chaves_loja_distintas_e_no_intervalo(chaves):
+    assert len(chaves) == LOJAS
+    assert len(np.unique(chaves)) == LOJAS
+    assert chaves.min() >= CHAVE_LOJA_INICIO and chaves.max() < CHAVE_LOJA_FIM
+    # Até 8 dígitos: as chaves se espalham pelo espaço todo, não só pelas 6 primeiras casas
+    assert chaves.max() > 10 ** 7
+
+
+def test_indice_e_chave_vao_e_voltam(chaves):
+    posicao_da_chave = {chave: i for i, chave in enumerate(chaves.tolist())}
+    indices = np.random.default_rng(1).choice(LOJAS, 20_000, replace=False)
+
+    por_indice = chaves_loja_por_indice(indices, seed=42)
+    assert (por_indice == chaves[indices]).all()
+    assert [posicao_da_chave[chave] for chave in por_indice.tolist()] == indices.tolist()
+
+
+def test_shards_dao_as_mesmas_chaves(chaves):
+    shards = [chaves_loja(50_000, seed=42, deslocamento=inicio) for inicio in range(0, LOJAS, 50_000)]
+    assert (np.concatenate(shards) == chaves).all()
+    # Estável por prefixo: a loja i é a mesma com menos lojas
+    assert (chaves_loja(2_500, seed=42) == chaves[:2_500]).all()
+    assert not (chaves_loja(2_500, seed=7) == chaves[:2_500]).all()
+
+
+@pytest.mark.parametrize('tamanho', [1, 2, 3, 10, 17, 1_000, 4_097, 89_999])
+def test_permutar_e_uma_bijecao(tamanho):
+    imagem = permutar(np.arange(tamanho), tamanho, seed=3)
+    assert (np.sort(imagem) == np.arange(tamanho)).all()
+
+
+def test_espaco_pequeno_demais():
+    with pytest.raises(ValueError):
+        alocar(11, 0, 10)
+    with pytest.raises(ValueError):
+        alocar(5, 0, 10, deslocamento=6)
+    with pytest.raises(ValueError):
+        permutar([10], 10)
+
+
+def test_codigos_municipio_por_uf():
+    ufs = np.array(['SP'] * 5_000 + ['RJ'] * 3_000 + ['AC'] * 10)
+    codigos = codigos_municipio(ufs, seed=42)
+
+    assert len(np.unique(codigos)) == len(ufs)
+    assert ((codigos // 100_000) == [PREFIXOS_IBGE[uf] for uf in ufs]).all()
+    assert ((codigos % 100_000) >= 1).all()
+    # O shard seguinte continua a alocação sem repetir
+    seguinte = codigos_municipio(np.array(['SP'] * 100), seed=42, deslocamento={'SP': 5_000})
+    assert not np.isin(seguinte, codigos).any()
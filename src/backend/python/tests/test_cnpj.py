@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from carga.cnpj import cnpj_valido, cnpjs_por_chave, formatar, gerar_cnpjs, validar_cnpjs
+
+# CNPJs públicos (Banco do Brasil, Petrobras, Caixa, Itaú) e o exemplo clássico
+VALIDOS = ['00.000.000/0001-91', '33.000.167/0001-01', '00.360.305/0001-04', '60.701.190/0001-04',
+           '11.222.333/0001-81']
+
+
+@pytest.mark.parametrize('cnpj', VALIDOS)
+def test_cnpjs_conhecidos_com_e_sem_mascara(cnpj):
+    assert cnpj_valido(cnpj)
+    assert cnpj_valido(cnpj.replace('.', '').replace('/', '').replace('-', ''))
+
+
+@pytest.mark.parametrize('cnpj', [
+    '11.222.333/0001-82',     # DV2 errado
+    '11.222.333/0001-71',     # DV1 errado
+    '11111111111111',         # dígitos todos iguais (DVs "corretos")
+    '00.000.000/0000-00',
+    '1122233300018',          # 13 dígitos
+    '112223330001811',        # 15 dígitos
+    '',
+    'CNPJ 11222333000181',
+])
+def test_cnpjs_invalidos(cnpj):
+    assert not cnpj_valido(cnpj)
+
+
+@pytest.mark.parametrize('cnpj', [
+    '11-222-333-0001-81',     # separadores em qualquer lugar
+    '11.222.333.0001.81',     # separador trocado
+    '11.222.333/000181',      # máscara pela metade
+    '112.223.33/0001-81',     # separadores deslocados
+    '11222333/0001-81',
+    '11.222.333/0001-81 ',    # espaço sobrando
+    ' 11222333000181',
+    '11.222.333/0001--81',
+])
+def test_mascara_errada_e_invalida(cnpj):
+    assert not cnpj_valido(cnpj)
+
+
+def test_validar_em_lote_com_nulos():
+    valores = np.array(['11.222.333/0001-81', None, '11222333000181', '11-222-333-0001-81', 42], dtype=object)
+    assert validar_cnpjs(valores).tolist() == [True, False, True, False, False]
+    assert validar_cnpjs([]).tolist() == []
+
+
+def test_gerados_sao_validos_e_distintos():
+    for mascarado in (False, True):
+        cnpjs = gerar_cnpjs(50_000, seed=7, mascarado=mascarado)
+        assert validar_cnpjs(cnpjs).all()
+        assert len(np.unique(cnpjs)) == len(cnpjs)
+
+    chaves = np.arange(0, 2_000_000, 7)
+    cnpjs = cnpjs_por_chave(chaves, mascarado=True)
+    assert validar_cnpjs(cnpjs).all()
+    assert len(np.unique(cnpjs)) == len(chaves)
+    # A mesma chave, o mesmo CNPJ
+    assert (cnpjs_por_chave(chaves[::-1], mascarado=True) == cnpjs[::-1]).all()
+
+
+def test_formatar_mascara():
+    digitos = [[1, 1, 2, 2, 2, 3, 3, 3, 0, 0, 0, 1, 8, 1]]
+    assert formatar(digitos).tolist() == ['11222333000181']
+    assert formatar(digitos, mascarado=True).tolist() == ['11.222.333/0001-81']
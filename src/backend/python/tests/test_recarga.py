@@ -0,0 +1,133 @@
+import pytest
+
+from carga.assincrono import concorrencia_no_pool
+from carga.esquema import VERSAO_ESQUEMA
+from carga.recarga import carregador_da_sombra, concluir_recarga
+from carga.retomada import Diario, assinatura
+from carga.validacao import ErroDeValidacao, Validador
+from db.pool import PoolConexoes
+
+COLUNAS = ['CHAVE_LOJA', 'NOME']
+DDL = "CHAVE_LOJA INT NOT NULL, NOME VARCHAR(50) NOT NULL"
+SOMBRA = 'LOJAS_NOVA'
+
+
+def criar_sombra(conn):
+    conn.execute(f"CREATE TABLE {SOMBRA} (CHAVE_LOJA INTEGER, NOME TEXT NOT NULL)")
+    conn.commit()
+
+
+def linhas(de, ate):
+    return [(i, f"Loja {i}") for i in range(de, ate)]
+
+
+def conteudo(conn):
+    return conn.execute(f"SELECT CHAVE_LOJA, NOME FROM {SOMBRA} ORDER BY CHAVE_LOJA").fetchall()
+
+
+def validador():
+    """Confere só a chave: única e cobrindo as 300 lojas de referência."""
+    return Validador('LOJAS', chaves_referencia=range(300), niveis=())
+
+
+def test_concorrencia_limitada_as_conexoes_livres():
+    pool = PoolConexoes(object, tamanho_max=4)
+    pool.obter()
+    avisos = []
+
+    assert concorrencia_no_pool(2, pool, log=avisos.append) == 2
+    assert concorrencia_no_pool(6, pool, log=avisos.append) == 3
+    assert avisos == ["⚠️ CARGA_CONCORRENCIA=6, mas só 3 das 4 conexões do pool estão livres "
+                      "(DB_POOL_TAMANHO); usando 3"]
+    for _ in range(3):
+        pool.obter()
+    # Sem conexão livre, as partições ainda andam uma de cada vez
+    assert concorrencia_no_pool(6, pool, log=avisos.append) == 1
+
+
+def test_sem_diario_nem_particoes_carrega_em_lotes(conn):
+    criar_sombra(conn)
+    carregar = carregador_da_sombra(conn, COLUNAS, DDL, iter(linhas(0, 300)), 'LOJAS', log=None)
+
+    resultado = carregar(SOMBRA)
+
+    assert resultado.inseridos == 300
+    assert conteudo(conn) == linhas(0, 300)
+
+
+def test_com_diario_carrega_com_checkpoint(conn, tmp_path):
+    criar_sombra(conn)
+    diario = Diario('LOJAS', assinatura(seed=42), pasta=str(tmp_path))
+    diario.reiniciar()
+
+    resultado = carregador_da_sombra(conn, COLUNAS, DDL, iter(linhas(0, 300)), 'LOJAS', diario=diario,
+                                     log=lambda *_: None)(SOMBRA)
+
+    assert resultado.inseridos == 300
+    assert (diario.ler()['posicao'], diario.ler()['inseridos']) == (300, 300)
+
+
+def test_particoes_em_conexoes_proprias(banco):
+    conn = banco()
+    criar_sombra(conn)
+    emprestadas = []
+
+    def obter():
+        emprestadas.append(banco(check_same_thread=False))
+        return emprestadas[-1]
+
+    particoes = [iter(linhas(de, de + 100)) for de in (0, 100, 200)]
+    resultado = carregador_da_sombra(conn, COLUNAS, DDL, None, 'LOJAS', particoes=particoes,
+                                     conexoes=(obter, lambda _: None), concorrencia=1, log=None)(SOMBRA)
+
+    assert resultado.inseridos == 300
+    assert len(emprestadas) == 3
+    assert conteudo(conn) == linhas(0, 300)
+
+
+def test_validador_impede_a_troca(conn):
+    criar_sombra(conn)
+    conferencia = validador()
+    # A loja 299 fica sem linha: a validação falha depois da carga, antes da troca
+    dados = conferencia.linhas(iter(linhas(0, 299)), COLUNAS)
+    carregar = carregador_da_sombra(conn, COLUNAS, DDL, dados, 'LOJAS', validador=conferencia, log=None)
+
+    with pytest.raises(ErroDeValidacao, match='1 chaves da referência sem linha'):
+        carregar(SOMBRA)
+
+
+class ConexaoGravadora:
+    """Guarda os comandos; nenhuma tabela de fonte existe, então o rollup não agrega nada."""
+
+    def __init__(self):
+        self.comandos = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, parametros=()):
+        self.comandos.append((' '.join(sql.split()), tuple(parametros)))
+
+    def fetchone(self):
+        return (None,)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_concluir_recarga_descarta_diario_e_registra_versao(tmp_path):
+    diario = Diario('LOJAS', assinatura(seed=42), pasta=str(tmp_path))
+    diario.reiniciar()
+    conn = ConexaoGravadora()
+
+    assert concluir_recarga(conn, 'TB_ESTR_LOJAS', diario, log=None) == {}
+
+    assert diario.ler() is None
+    assert [parametros for sql, parametros in conn.comandos if sql.startswith('MERGE ESQUEMA_VERSAO')] == \
+        [('TB_ESTR_LOJAS', VERSAO_ESQUEMA)]
+    # Todas as fontes do rollup são conferidas
+    assert [parametros for sql, parametros in conn.comandos if sql.startswith('SELECT OBJECT_ID')] == \
+        [('TB_ESTR_CONTAS',), ('TB_ESTR_ATIVO',)]
@@ -0,0 +1,252 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from carga.bulk import montar_insert
+from carga.retomada import (ArquivoRejeitados, CarregadorRetomavel, Diario, DiarioInconsistente, assinatura,
+                            carregar_com_checkpoint, diario_da_carga, linhas_na_tabela)
+from carga.validacao import Validador
+
+SOMBRA = 'LOJAS_NOVA'
+INSERT = montar_insert(SOMBRA, ['CHAVE_LOJA', 'NOME'])
+TOTAL = 1000
+RUINS = {150, 720}
+ASSINATURA = assinatura(seed=42, linhas=TOTAL, chaves=list(range(TOTAL)))
+
+
+class Morte(BaseException):
+    """O processo de carga morreu: nada de except Exception no caminho, como num kill."""
+
+
+class DiarioQueMorre(Diario):
+    """Diário que mata a carga no `lote`-ésimo preparar, antes ou depois do commit do lote."""
+
+    def __init__(self, *args, lote, quando, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lote = lote
+        self.quando = quando
+        self.preparados = 0
+
+    def preparar(self, posicao, inseridos, falhas):
+        super().preparar(posicao, inseridos, falhas)
+        self.preparados += 1
+        if self.quando == 'antes' and self.preparados == self.lote:
+            raise Morte()
+
+    def confirmar(self, posicao, inseridos, falhas):
+        if self.quando == 'depois' and self.preparados == self.lote:
+            raise Morte()
+        super().confirmar(posicao, inseridos, falhas)
+
+
+class ConexaoEspia:
+    """Conexão que guarda o diário como ele estava em cada commit."""
+
+    def __init__(self, conn, diario):
+        self.conn = conn
+        self.diario = diario
+        self.no_commit = []
+
+    def cursor(self):
+        return self.conn.cursor()
+
+    def commit(self):
+        self.no_commit.append(self.diario.ler())
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+
+def linhas(inicio=0):
+    """Linhas (CHAVE_LOJA, NOME) a partir de `inicio`; as de RUINS têm NOME nulo e são rejeitadas."""
+    return ((i, None if i in RUINS else f"Loja {i}") for i in range(inicio, TOTAL))
+
+
+def criar_sombra(conn):
+    conn.execute(f"DROP TABLE IF EXISTS {SOMBRA}")
+    conn.execute(f"CREATE TABLE {SOMBRA} (CHAVE_LOJA INTEGER PRIMARY KEY, NOME TEXT NOT NULL)")
+    conn.commit()
+
+
+def carregar(conn, diario):
+    return carregar_com_checkpoint(conn, INSERT, linhas(diario.posicao), diario, tabela=SOMBRA,
+                                   tamanho_lote=100, log=lambda *_: None)
+
+
+def conteudo(conn):
+    return conn.execute(f"SELECT CHAVE_LOJA, NOME FROM {SOMBRA} ORDER BY CHAVE_LOJA").fetchall()
+
+
+def test_diario_grava_o_lote_antes_do_commit_e_a_posicao_depois(banco, tmp_path):
+    conn = banco()
+    criar_sombra(conn)
+    diario = Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path))
+    diario.reiniciar()
+    espia = ConexaoEspia(conn, diario)
+
+    CarregadorRetomavel(espia, INSERT, diario, tabela=SOMBRA, tamanho_lote=300, log=None).carregar(linhas())
+
+    # No commit, o lote já está no diário como pendente e a posição ainda é a do anterior
+    assert [(estado['posicao'], estado['pendente']['posicao']) for estado in espia.no_commit] == \
+        [(0, 300), (300, 600), (600, 900), (900, 1000)]
+    assert [estado['pendente']['inseridos'] for estado in espia.no_commit] == [299, 599, 898, 998]
+    # Depois do último commit, confirmado e sem pendente
+    estado = diario.ler()
+    assert (estado['posicao'], estado['inseridos'], estado['falhas'], estado['pendente']) == (1000, 998, 2, None)
+
+
+@pytest.mark.parametrize('na_sombra, posicao', [(400, 400), (300, 300)])
+def test_retomar_confere_o_lote_pendente_com_a_contagem_da_sombra(tmp_path, na_sombra, posicao):
+    # Morreu entre preparar e confirmar: a contagem diz se o commit do lote 300..400 aconteceu
+    diario = Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path))
+    diario.reiniciar()
+    diario.confirmar(300, 300, 0)
+    diario.preparar(400, 400, 0)
+
+    retomado = Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path))
+    assert retomado.retomar(na_sombra) == posicao
+    assert (retomado.inseridos, retomado.ler()['pendente']) == (posicao, None)
+
+
+def test_retomar_recusa_diario_que_nao_serve(tmp_path):
+    with pytest.raises(DiarioInconsistente, match='Sem diário'):
+        Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path)).retomar(0)
+
+    diario = Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path))
+    diario.reiniciar()
+    diario.confirmar(300, 300, 0)
+    diario.preparar(400, 400, 0)
+    # Nem a posição confirmada nem a pendente
+    with pytest.raises(DiarioInconsistente, match='a sombra tem 350 linhas'):
+        Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path)).retomar(350)
+    with pytest.raises(DiarioInconsistente, match='outra carga'):
+        Diario(SOMBRA, assinatura(seed=7, linhas=TOTAL), pasta=str(tmp_path)).retomar(300)
+
+
+def test_linhas_na_tabela_conta_a_sombra(banco):
+    conn = banco()
+    assert linhas_na_tabela(conn, SOMBRA) is None
+
+    criar_sombra(conn)
+    conn.executemany(f"INSERT INTO {SOMBRA} VALUES (?, ?)", [(i, f"Loja {i}") for i in range(42)])
+    conn.commit()
+    assert linhas_na_tabela(conn, SOMBRA) == 42
+
+
+def test_arquivo_rejeitados_grava_jsonl_e_trunca_na_posicao(tmp_path):
+    rejeitadas = ArquivoRejeitados(str(tmp_path / 'LOJAS.rejeitadas.jsonl'))
+    assert rejeitadas.ler() == []
+
+    rejeitadas.gravar(150, (150, None, date(2024, 1, 31), Decimal('1.50')), ValueError('NOME nulo'))
+    rejeitadas.gravar(720, (720, None), ValueError('NOME nulo'))
+    assert rejeitadas.quantidade == 2
+    assert (tmp_path / 'LOJAS.rejeitadas.jsonl').read_text(encoding='utf-8').count('\n') == 2
+    assert rejeitadas.ler()[0] == {'posicao': 150, 'erro': 'NOME nulo', 'linha': [150, None, '2024-01-31', '1.50']}
+
+    # O lote a partir de 700 será refeito: a rejeitada dele sai
+    rejeitadas.truncar(700)
+    assert [registro['posicao'] for registro in rejeitadas.ler()] == [150]
+    assert rejeitadas.quantidade == 1
+
+    rejeitadas.truncar(0)
+    assert rejeitadas.ler() == [] and rejeitadas.quantidade == 0
+
+
+def test_carga_grava_rejeitadas_no_dead_letter(banco, tmp_path):
+    conn = banco()
+    criar_sombra(conn)
+    diario = Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path))
+    diario.reiniciar()
+
+    resultado = carregar(conn, diario)
+
+    assert (resultado.inseridos, resultado.falhas) == (998, 2)
+    assert [(registro['posicao'], registro['linha']) for registro in diario.rejeitadas.ler()] == \
+        [(150, [150, None]), (720, [720, None])]
+
+
+@pytest.mark.parametrize('quando, posicao', [('antes', 700), ('depois', 800)])
+def test_retomada_depois_de_morrer_da_as_linhas_da_carga_completa(banco, tmp_path, quando, posicao):
+    # Referência: a carga sem interrupção
+    conn = banco()
+    criar_sombra(conn)
+    diario = Diario(SOMBRA, ASSINATURA, pasta=str(tmp_path / 'completa'))
+    diario.reiniciar()
+    carregar(conn, diario)
+    esperado, rejeitadas_esperadas = conteudo(conn), diario.rejeitadas.ler()
+
+    # Morre no 8º lote (700..800, o da linha ruim 720), depois do preparar
+    pasta = str(tmp_path / 'interrompida')
+    criar_sombra(conn)
+    diario = DiarioQueMorre(SOMBRA, ASSINATURA, pasta=pasta, lote=8, quando=quando)
+    diario.reiniciar()
+    with pytest.raises(Morte):
+        carregar(conn, diario)
+    # A conexão morre junto: sem commit, o lote aberto é desfeito
+    conn.close()
+
+    conn = banco()
+    diario = Diario(SOMBRA, ASSINATURA, pasta=pasta)
+    na_sombra = linhas_na_tabela(conn, SOMBRA)
+    assert diario.retomar(na_sombra) == posicao
+    resultado = carregar(conn, diario)
+
+    # Só as linhas que faltavam, e o resultado é o da carga completa
+    assert resultado.inseridos == 998 - na_sombra
+    assert conteudo(conn) == esperado
+    estado = diario.ler()
+    assert (estado['posicao'], estado['inseridos'], estado['falhas'], estado['pendente']) == (TOTAL, 998, 2, None)
+    # Nenhuma rejeitada em dobro nem esquecida
+    assert [(r['posicao'], r['linha']) for r in diario.rejeitadas.ler()] == \
+        [(r['posicao'], r['linha']) for r in rejeitadas_esperadas]
+
+
+def test_diario_da_carga_sem_retomar_recomeca(banco, tmp_path):
+    conn = banco()
+    diario = Diario('LOJAS', ASSINATURA, pasta=str(tmp_path))
+    diario.reiniciar()
+    diario.confirmar(300, 300, 0)
+
+    diario, inicio = diario_da_carga(conn, 'LOJAS', False, pasta_diario=str(tmp_path), seed=42, linhas=TOTAL,
+                                     chaves=list(range(TOTAL)))
+
+    assert inicio == 0
+    assert diario.ler()['posicao'] == 0
+
+
+def test_diario_da_carga_retoma_e_valida_o_que_ja_entrou(banco, tmp_path):
+    conn = banco()
+    criar_sombra(conn)
+    interrompido = Diario('LOJAS', ASSINATURA, pasta=str(tmp_path))
+    interrompido.reiniciar()
+    carregar_com_checkpoint(conn, INSERT, ((i, f"Loja {i}") for i in range(300)), interrompido, tabela=SOMBRA,
+                            tamanho_lote=100, log=lambda *_: None)
+    interrompido.rejeitadas.gravar(150, (1_500, 'Rejeitada'), ValueError('teste'))
+    validador = Validador('LOJAS', niveis=())
+    avisos = []
+
+    diario, inicio = diario_da_carga(conn, 'LOJAS', True, validador, ['CHAVE_LOJA', 'NOME'],
+                                     pasta_diario=str(tmp_path), log=avisos.append, seed=42, linhas=TOTAL,
+                                     chaves=list(range(TOTAL)))
+
+    assert (inicio, diario.inseridos) == (300, 300)
+    assert avisos == ['♻️ Retomando na linha 301: 300 já estão em LOJAS_NOVA']
+    # As 300 da sombra e a rejeitada já passaram pela validação
+    assert validador.relatorio.linhas == 301
+
+
+@pytest.mark.parametrize('sombra', [False, True])
+def test_diario_da_carga_recomeca_se_nao_da_para_retomar(banco, tmp_path, sombra):
+    conn = banco()
+    if sombra:
+        criar_sombra(conn)
+    avisos = []
+
+    # Sem sombra, ou com sombra e sem diário
+    diario, inicio = diario_da_carga(conn, 'LOJAS', True, pasta_diario=str(tmp_path), log=avisos.append, seed=42)
+
+    assert inicio == 0
+    assert diario.ler()['posicao'] == 0
+    assert avisos[0].startswith('⚠️ Não dá para retomar')
@@ -0,0 +1,46 @@
+import pytest
+
+from carga.ritmo import ControleDeRitmo, RelogioSimulado, simular
+
+LINHAS = 200_000
+ALVO = 0.25
+
+
+def acima_do_alvo(ritmo):
+    """Fração dos lotes que passaram da latência alvo."""
+    return sum(segundos > ALVO for _, segundos, _, _ in ritmo.historico) / len(ritmo.historico)
+
+
+def test_ritmo_adaptativo_reduz_lotes_acima_do_alvo():
+    fixo, ritmo_fixo = simular(LINHAS, tamanho_lote=5000)
+    adaptativo, ritmo_adaptativo = simular(LINHAS, latencia_alvo=ALVO, tamanho_lote=5000)
+
+    assert fixo.inseridos == adaptativo.inseridos == LINHAS
+    # Lote fixo: o pico do banco empurra uma boa parte dos lotes acima do alvo
+    assert acima_do_alvo(ritmo_fixo) > 0.2
+    assert acima_do_alvo(ritmo_adaptativo) < acima_do_alvo(ritmo_fixo) / 4
+    assert ritmo_adaptativo.tamanho_minimo <= min(linhas for linhas, _, _, _ in ritmo_adaptativo.historico)
+
+
+@pytest.mark.parametrize('latencia_alvo', [None, ALVO])
+def test_teto_de_linhas_por_segundo(latencia_alvo):
+    livre, _ = simular(LINHAS, latencia_alvo=latencia_alvo, tamanho_lote=5000)
+    teto = livre.linhas_por_segundo / 2
+    resultado, ritmo = simular(LINHAS, latencia_alvo=latencia_alvo, max_linhas_s=teto, tamanho_lote=5000)
+
+    assert resultado.inseridos == LINHAS
+    # No relógio simulado, a vazão média fica no teto (metade da vazão sem ele)
+    assert resultado.linhas_por_segundo <= teto * 1.01
+    assert resultado.linhas_por_segundo >= teto * 0.9
+    if latencia_alvo:
+        assert acima_do_alvo(ritmo) < 0.1
+
+
+def test_sem_alvo_nem_teto_so_registra():
+    relogio = RelogioSimulado()
+    ritmo = ControleDeRitmo(tamanho_inicial=5000, relogio=relogio, dormir=relogio.dormir)
+
+    for _ in range(5):
+        assert ritmo.registrar(5000, 2.0) == pytest.approx(0.0)
+    assert ritmo.tamanho == 5000
+    assert len(ritmo.historico) == 5
@@ -0,0 +1,74 @@
+from datetime import date
+
+import pytest
+
+from carga.bulk import CarregadorEmLote
+from carga.chaves import chaves_loja
+from carga.producao import gerar_contas_colunar
+from carga.stream import MedicaoMemoria, TetoDeMemoriaExcedido, linhas_em_chunks, particoes_em_chunks
+
+# Teto do pico alocado durante a carga; com 10 mil linhas por bloco ele fica em ~2 MB
+TETO_BYTES = 16 * 1024 ** 2
+
+
+class ConexaoNula:
+    """Descarta as linhas: só a geração e os lotes ocupam memória."""
+
+    def cursor(self):
+        return self
+
+    def executemany(self, sql, linhas):
+        pass
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def pico_da_carga(n):
+    chaves = chaves_loja(n, seed=42)
+    with MedicaoMemoria(teto_bytes=TETO_BYTES) as medicao:
+        resultado = CarregadorEmLote(ConexaoNula(), 'INSERT', tamanho_lote=1000, log=None).carregar(
+            linhas_em_chunks(gerar_contas_colunar, chaves))
+    assert resultado.inseridos == n
+    return medicao.pico_bytes
+
+
+def test_pico_de_memoria_nao_cresce_com_as_linhas():
+    # Aquecimento: imports e caches do pandas não entram na comparação
+    pico_da_carga(20_000)
+    pequeno = pico_da_carga(20_000)
+    grande = pico_da_carga(300_000)
+
+    # 15x mais linhas, praticamente o mesmo pico: só um bloco por vez em memória
+    assert grande < pequeno * 1.5 + 1024 ** 2
+
+
+def test_materializar_as_linhas_estoura_o_teto():
+    chaves = chaves_loja(300_000, seed=42)
+    with pytest.raises(TetoDeMemoriaExcedido):
+        with MedicaoMemoria(teto_bytes=TETO_BYTES):
+            list(linhas_em_chunks(gerar_contas_colunar, chaves))
+
+
+def test_linhas_nao_dependem_de_workers_nem_do_intervalo():
+    chaves = chaves_loja(25_000, seed=42)
+    hoje = date(2026, 1, 31)
+    completa = list(linhas_em_chunks(gerar_contas_colunar, chaves, hoje=hoje))
+
+    assert list(linhas_em_chunks(gerar_contas_colunar, chaves, workers=2, hoje=hoje)) == completa
+    parcial = linhas_em_chunks(gerar_contas_colunar, chaves, inicio=12_345, fim=21_000, hoje=hoje)
+    assert list(parcial) == completa[12_345:21_000]
+
+
+def test_particoes_juntas_dao_a_carga_sem_particoes():
+    chaves = chaves_loja(2_500, seed=42)
+    hoje = date(2024, 1, 31)
+    completa = list(linhas_em_chunks(gerar_contas_colunar, chaves, tamanho_chunk=300, hoje=hoje))
+
+    for partes in (1, 3, 4):
+        particoes = particoes_em_chunks(gerar_contas_colunar, chaves, partes, tamanho_chunk=300, hoje=hoje)
+        assert len(particoes) == partes
+        assert [linha for particao in particoes for linha in particao] == completa
@@ -1,83 +1,128 @@
-import pandas as pd
-import random
-import uuid
-from faker import Faker
-import pyodbc
-
-# Inicialização
-fake = Faker('pt_BR')
-Faker.seed(42)
-random.seed(42)
-
-num_linhas = 50
-supervisor_id = '8ABD1646-FEC3-4AD3-B130-5D4A961365DB'
-
-situacoes = ['pendente', 'prospectada', 'tratada']
-mercados = ['SIM', 'NÃO']
-presencas = ['SIM', 'NÃO']
-diretorias = ['DR São Paulo', 'DR Rio de Janeiro', 'DR Sul', 'DR Nordeste']
-gerencias = ['GR Norte', 'GR Sul', 'GR Central']
-agencias = [f'{i:04d}' for i in range(1, 51)]
-gerentes = [fake.name() for _ in range(10)]
-
-# Geração de dados
-dados = []
-
-for _ in range(num_linhas):
-    dados.append((
-        str(uuid.uuid4()).upper(),
-        supervisor_id,
-        fake.cnpj(),
-        f"{random.choice(mercados)} {fake.first_name()}",
-        f"{fake.city()}/{fake.state_abbr()}", # Usando cidade real do Brasil
-        random.choice(agencias),
-        random.choice(mercados),
-        random.choice(presencas),
-        random.choice(situacoes),
-        random.choice(diretorias),
-        random.choice(gerencias),
-        f"PA {random.randint(1, 999):03d}",
-        random.choice(gerentes)
-    ))
-
-# Nomes das colunas
-colunas = [
-    "id", "supervisor_id", "CNPJ", "NOME_LOJA", "LOCALIZACAO",
-    "AGENCIA", "MERCADO", "PRACA_PRESENCA", "situacao",
-    "DIRETORIA_REGIONAL", "GERENCIA_REGIONAL", "PA", "GERENTE_PJ"
-]
-
-# Conexão com SQL Server
-server = 'DESKTOP-G4V6794'
-database = 'TESTE'
-username = 'sa'
-password = 'expresso'
-
-conn_str = f"""
-    DRIVER={{ODBC Driver 17 for SQL Server}};
-    SERVER={server};
-    DATABASE={database};
-    UID={username};
-    PWD={password};
-    TrustServerCertificate=yes;
-"""
-
-# Inserção
-conn = pyodbc.connect(conn_str)
-cursor = conn.cursor()
-
-sql = f"""
-    INSERT INTO HOTLIST (
-        {', '.join(colunas)}
-    )
-    VALUES ({', '.join(['?' for _ in colunas])})
-"""
-
-for registro in dados:
-    cursor.execute(sql, registro)
-
-conn.commit()
-cursor.close()
-conn.close()
-
-print("✅ Dados gerados e inseridos com sucesso na tabela TESTETESTE..HOTLIST!")
+import numpy as np
+import random
+import uuid
+from faker import Faker
+import os
+import sys
+
+# Pacotes compartilhados (carga, db) ficam em src/backend/python
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'backend', 'python'))
+import db
+from carga import carregar_em_lotes
+from carga.arquivos import linhas_de_arquivos, pasta_de_arquivos
+from carga.distribuicao import distribuicoes_configuradas, maior_fatia
+from carga.escala import chaves_de_contas, ids_usuarios, linhas_padrao, lojas_sorteadas
+from carga.instrumentacao import fase, instrumentado
+from carga.usuarios import usuarios_da_carga
+
+# Inicialização: Faker e random próprios do script (no orquestrador, outros scripts rodam em outras threads)
+SEED = 42
+fake = Faker('pt_BR')
+fake.seed_instance(SEED)
+
+# Quantidade padrão de linhas (pode ser alterada pelo orquestrador: --rows, ou pela escala: CARGA_ESCALA)
+LINHAS_PADRAO = 50
+
+# python hotlist.py --de-arquivos PASTA  → carrega o que foi exportado por carga.arquivos
+PASTA_ARQUIVOS = pasta_de_arquivos()
+
+situacoes = ['pendente', 'prospectada', 'tratada']
+mercados = ['SIM', 'NÃO']
+presencas = ['SIM', 'NÃO']
+diretorias = ['DR São Paulo', 'DR Rio de Janeiro', 'DR Sul', 'DR Nordeste']
+gerencias = ['GR Norte', 'GR Sul', 'GR Central']
+agencias = [f'{i:04d}' for i in range(1, 51)]
+gerentes = [fake.name() for _ in range(10)]
+
+
+# Nomes das colunas
+COLUNAS = [
+    "id", "supervisor_id", "CNPJ", "NOME_LOJA", "LOCALIZACAO",
+    "AGENCIA", "MERCADO", "PRACA_PRESENCA", "situacao",
+    "DIRETORIA_REGIONAL", "GERENCIA_REGIONAL", "PA", "GERENTE_PJ"
+]
+
+
+# Geração de dados
+def gerar_linhas(num_linhas, chaves_contas=None, usuarios=None, seed=SEED):
+    """Gera as linhas sob demanda; o carregador consome em lotes."""
+    aleatorio = random.Random(seed)
+    fake.seed_instance(seed)
+    # CNPJs de lojas de TB_ESTR_CONTAS (chaves_contas), sorteadas de uma vez (seed tirada do random da geração)
+    _, cnpjs = lojas_sorteadas(num_linhas, seed=aleatorio.getrandbits(32), chaves=chaves_contas)
+
+    # Linhas por supervisor, agência e situação: uniformes, ou enviesadas com CARGA_DISTRIBUICAO
+    usuarios = usuarios or ids_usuarios()
+    distribuicoes = distribuicoes_configuradas()
+    rng = np.random.default_rng(aleatorio.getrandbits(32))
+    supervisores = distribuicoes['supervisor'].sortear(rng, num_linhas, usuarios).tolist()
+    agencias_sorteadas = distribuicoes['agencia'].sortear(rng, num_linhas, agencias).tolist()
+    situacoes_sorteadas = distribuicoes['situacao'].sortear(rng, num_linhas, situacoes).tolist()
+    if not distribuicoes['supervisor'].uniforme:
+        supervisor, fatia = maior_fatia(usuarios, supervisores)
+        print(f"📈 Supervisor {supervisor} com {fatia:.1%} das linhas ({distribuicoes['supervisor']})")
+
+    for i, cnpj in enumerate(cnpjs.tolist()):
+        yield (
+            str(uuid.uuid4()).upper(),
+            usuarios[supervisores[i]],
+            cnpj,
+            f"{aleatorio.choice(mercados)} {fake.first_name()}",
+            f"{fake.city()}/{fake.state_abbr()}", # Usando cidade real do Brasil
+            agencias[agencias_sorteadas[i]],
+            aleatorio.choice(mercados),
+            aleatorio.choice(presencas),
+            situacoes[situacoes_sorteadas[i]],
+            aleatorio.choice(diretorias),
+            aleatorio.choice(gerencias),
+            f"PA {aleatorio.randint(1, 999):03d}",
+            aleatorio.choice(gerentes)
+        )
+
+
+@instrumentado('HOTLIST')
+def main(linhas=None, arquivos=None):
+    pasta_arquivos = PASTA_ARQUIVOS if arquivos is None else arquivos
+    if not pasta_arquivos:
+        # Lojas sorteadas entre as de TB_ESTR_CONTAS (as da escala se ela não existir)
+        with fase('ler_chaves'):
+            with db.conexao(db.config().banco_dw) as conn_dw:
+                chaves_contas = chaves_de_contas(conn_dw)
+
+    # Inserção
+    with fase('conectar'):
+        conn = db.conectar(db.config().banco_teste)
+    try:
+        cursor = conn.cursor()
+
+        # supervisor_id tem FK para TESTE..USERS: só supervisores cadastrados (--criar-usuarios cadastra os gerados)
+        with fase('usuarios'):
+            usuarios = usuarios_da_carga(conn)
+
+        if pasta_arquivos:
+            # Linhas exportadas antes (python -m carga.arquivos exportar), sem gerar de novo
+            dados = linhas_de_arquivos(pasta_arquivos, 'HOTLIST', COLUNAS)
+        else:
+            dados = gerar_linhas(linhas or linhas_padrao('HOTLIST', LINHAS_PADRAO), chaves_contas, usuarios)
+
+        sql = f"""
+            INSERT INTO HOTLIST (
+                {', '.join(COLUNAS)}
+            )
+            VALUES ({', '.join(['?' for _ in COLUNAS])})
+        """
+
+        with fase('carga'):
+            resultado = carregar_em_lotes(conn, sql, dados, tabela='HOTLIST')
+        print(f"⏱️ {resultado.resumo()}")
+
+        print("✅ Dados gerados e inseridos com sucesso na tabela TESTETESTE..HOTLIST!")
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        # Devolve a conexão ao pool mesmo se a geração ou a carga falhar
+        db.liberar(conn)
+
+
+if __name__ == '__main__':
+    main()